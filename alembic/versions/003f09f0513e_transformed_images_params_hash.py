@@ -0,0 +1,65 @@
+"""transformed images params hash
+
+Revision ID: 003f09f0513e
+Revises: 9af0307c14fd
+Create Date: 2026-10-18 13:41:05.218734
+
+"""
+import hashlib
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '003f09f0513e'
+down_revision: Union[str, Sequence[str], None] = '9af0307c14fd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _params_hash(transformation: str | None) -> str:
+    # те саме, що share_service.transform_params_hash (копія: міграція не імпортує app)
+    try:
+        params = json.loads(transformation) if transformation else {}
+    except ValueError:
+        params = {}
+    canonical = json.dumps(params, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('transformed_images', sa.Column('params_hash', sa.String(length=64), nullable=True))
+
+    conn = op.get_bind()
+    rows = conn.execute(sa.text("SELECT id, photo_id, transformation FROM transformed_images ORDER BY id")).all()
+    keep: dict[tuple[int, str], int] = {}
+    for row in rows:
+        params_hash = _params_hash(row.transformation)
+        kept_id = keep.setdefault((row.photo_id, params_hash), row.id)
+        if kept_id == row.id:
+            conn.execute(
+                sa.text("UPDATE transformed_images SET params_hash = :h WHERE id = :id"),
+                {"h": params_hash, "id": row.id},
+            )
+        else:
+            # дублікат: посилання переносимо на перший рядок, сам дублікат видаляємо
+            conn.execute(
+                sa.text("UPDATE public_links SET transformed_image_id = :kept WHERE transformed_image_id = :id"),
+                {"kept": kept_id, "id": row.id},
+            )
+            conn.execute(sa.text("DELETE FROM transformed_images WHERE id = :id"), {"id": row.id})
+
+    op.alter_column('transformed_images', 'params_hash', nullable=False)
+    op.create_unique_constraint(
+        'uq_transformed_images_photo_params', 'transformed_images', ['photo_id', 'params_hash']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_transformed_images_photo_params', 'transformed_images', type_='unique')
+    op.drop_column('transformed_images', 'params_hash')
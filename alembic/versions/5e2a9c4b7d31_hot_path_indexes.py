@@ -0,0 +1,41 @@
+"""hot path secondary indexes
+
+Revision ID: 5e2a9c4b7d31
+Revises: b41c7d2e9a10
+Create Date: 2026-10-18 16:48:30.118274
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e2a9c4b7d31'
+down_revision: Union[str, Sequence[str], None] = 'b41c7d2e9a10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# ratings.photo_id вже покритий uix_rating_photo_user (photo_id, user_id) — окремий індекс не потрібен
+INDEXES = (
+    ('ix_photos_created_at_id', 'photos', ['created_at', 'id']),
+    ('ix_photos_user_id_created_at', 'photos', ['user_id', 'created_at', 'id']),
+    ('ix_comments_photo_id_created_at', 'comments', ['photo_id', 'created_at']),
+    ('ix_comments_user_id_created_at', 'comments', ['user_id', 'created_at']),
+    ('ix_photo_tags_tag_id_photo_id', 'photo_tags', ['tag_id', 'photo_id']),
+    ('ix_transformed_images_photo_id_created_at', 'transformed_images', ['photo_id', 'created_at']),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
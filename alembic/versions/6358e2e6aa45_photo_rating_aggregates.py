@@ -0,0 +1,51 @@
+"""photo rating aggregates
+
+Revision ID: 6358e2e6aa45
+Revises: 3cb332afc9ca
+Create Date: 2026-10-18 10:12:41.204517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6358e2e6aa45'
+down_revision: Union[str, Sequence[str], None] = '3cb332afc9ca'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('photos', sa.Column('rating_sum', sa.Integer(), server_default=sa.text('0'), nullable=False))
+    op.add_column('photos', sa.Column('rating_count', sa.Integer(), server_default=sa.text('0'), nullable=False))
+    op.add_column('photos', sa.Column('avg_rating', sa.Float(), server_default=sa.text('0'), nullable=False))
+
+    # backfill з існуючих ratings
+    op.execute(
+        """
+        UPDATE photos AS p
+        SET rating_sum = agg.s,
+            rating_count = agg.c,
+            avg_rating = agg.s::float / agg.c
+        FROM (
+            SELECT photo_id, SUM(value) AS s, COUNT(*) AS c
+            FROM ratings
+            GROUP BY photo_id
+        ) AS agg
+        WHERE agg.photo_id = p.id
+        """
+    )
+
+    op.create_index('ix_photos_avg_rating_created_at', 'photos', ['avg_rating', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_photos_avg_rating_created_at', table_name='photos')
+    op.drop_column('photos', 'avg_rating')
+    op.drop_column('photos', 'rating_count')
+    op.drop_column('photos', 'rating_sum')
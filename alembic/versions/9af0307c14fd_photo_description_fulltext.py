@@ -0,0 +1,34 @@
+"""photo description full-text search
+
+Revision ID: 9af0307c14fd
+Revises: 6358e2e6aa45
+Create Date: 2026-10-18 11:02:17.873120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9af0307c14fd'
+down_revision: Union[str, Sequence[str], None] = '6358e2e6aa45'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # generated column: Postgres сам перераховує її на INSERT/UPDATE description
+    op.execute(
+        "ALTER TABLE photos ADD COLUMN search_vector tsvector "
+        "GENERATED ALWAYS AS (to_tsvector('simple', coalesce(description, ''))) STORED"
+    )
+    op.create_index('ix_photos_search_vector', 'photos', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_photos_search_vector', table_name='photos', postgresql_using='gin')
+    op.drop_column('photos', 'search_vector')
@@ -0,0 +1,45 @@
+"""tags usage_count
+
+Revision ID: b41c7d2e9a10
+Revises: e9fab3e2d8f5
+Create Date: 2026-10-18 16:05:12.734190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b41c7d2e9a10'
+down_revision: Union[str, Sequence[str], None] = 'e9fab3e2d8f5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('tags', sa.Column('usage_count', sa.Integer(), server_default=sa.text('0'), nullable=False))
+
+    # backfill з існуючих photo_tags
+    op.execute(
+        """
+        UPDATE tags AS t
+        SET usage_count = agg.c
+        FROM (
+            SELECT tag_id, COUNT(*) AS c
+            FROM photo_tags
+            GROUP BY tag_id
+        ) AS agg
+        WHERE agg.tag_id = t.id
+        """
+    )
+
+    op.create_index('ix_tags_usage_count_name', 'tags', ['usage_count', 'name'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tags_usage_count_name', table_name='tags')
+    op.drop_column('tags', 'usage_count')
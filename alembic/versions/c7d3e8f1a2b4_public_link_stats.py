@@ -0,0 +1,40 @@
+"""public link hit counters + public_links.transformed_image_id index
+
+Revision ID: c7d3e8f1a2b4
+Revises: 5e2a9c4b7d31
+Create Date: 2026-10-18 19:02:11.402913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d3e8f1a2b4'
+down_revision: Union[str, Sequence[str], None] = '5e2a9c4b7d31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'public_link_stats',
+        sa.Column('public_link_id', sa.Integer(), nullable=False),
+        sa.Column('views', sa.Integer(), server_default=sa.text('0'), nullable=False),
+        sa.Column('qr_views', sa.Integer(), server_default=sa.text('0'), nullable=False),
+        sa.Column('last_hit_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['public_link_id'], ['public_links.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('public_link_id'),
+    )
+    op.create_index(
+        'ix_public_links_transformed_image_id', 'public_links', ['transformed_image_id'], unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_public_links_transformed_image_id', table_name='public_links')
+    op.drop_table('public_link_stats')
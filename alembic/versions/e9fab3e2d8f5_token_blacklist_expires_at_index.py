@@ -0,0 +1,28 @@
+"""token_blacklist expires_at index
+
+Revision ID: e9fab3e2d8f5
+Revises: 003f09f0513e
+Create Date: 2026-10-18 14:22:48.610394
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e9fab3e2d8f5'
+down_revision: Union[str, Sequence[str], None] = '003f09f0513e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_token_blacklist_expires_at'), 'token_blacklist', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_token_blacklist_expires_at'), table_name='token_blacklist')
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import math
+import time
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.core.lru import LRUCache, unexpired
+from app.core.settings import Settings
+from app.models import User
+from app.repository.token_repository import TokenBlacklistRepository
+from app.repository.users_repository import UserRepository
+
+
+class BloomFilter:
+    """
+    Звичайний bloom filter: false positive можливий, false negative — ні.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001) -> None:
+        capacity = max(capacity, 1)
+        self.size = max(64, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:], "big") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class RevokedTokenFilter:
+    """
+    Bloom filter of non-expired blacklisted JTIs, reloaded from DB every REVOKED_FILTER_REFRESH_SECONDS.
+
+    Негативна відповідь = токен точно не відкликаний (з точністю до останнього refresh),
+    тому БД питаємо лише при позитивному hit. Logout у цьому процесі додає jti одразу;
+    logout в іншому воркері стає видимим після наступного refresh.
+    """
+
+    def __init__(self) -> None:
+        self._bloom: BloomFilter | None = None
+        self._loaded_at = -math.inf
+        self._lock = asyncio.Lock()
+
+    def add(self, jti: str) -> None:
+        if self._bloom is not None:
+            self._bloom.add(jti)
+
+    def reset(self) -> None:
+        self._bloom = None
+        self._loaded_at = -math.inf
+
+    async def _refresh(self, session: AsyncSession, settings: Settings) -> BloomFilter:
+        async with self._lock:
+            if self._bloom is not None and time.monotonic() - self._loaded_at < settings.REVOKED_FILTER_REFRESH_SECONDS:
+                return self._bloom
+            jtis = await TokenBlacklistRepository(session).list_active_jtis(datetime.now(timezone.utc))
+            # запас під logout-и до наступного refresh
+            bloom = BloomFilter(capacity=max(2 * len(jtis), 1024))
+            for jti in jtis:
+                bloom.add(jti)
+            self._bloom, self._loaded_at = bloom, time.monotonic()
+            return bloom
+
+    async def is_revoked(self, session: AsyncSession, jti: str, settings: Settings) -> bool:
+        bloom = self._bloom
+        if bloom is None or time.monotonic() - self._loaded_at >= settings.REVOKED_FILTER_REFRESH_SECONDS:
+            bloom = await self._refresh(session, settings)
+        if jti not in bloom:
+            return False
+        return await TokenBlacklistRepository(session).is_revoked(jti)
+
+
+class UserCache:
+    """
+    Short-TTL cache of user rows for the auth path.
+    Зберігаємо знімок колонок, а не ORM-об'єкт: об'єкт прив'язаний до сесії запиту.
+    """
+
+    def __init__(self, maxsize: int = 10_000) -> None:
+        self._cache: LRUCache[int, tuple[float, dict[str, Any]]] = LRUCache(maxsize=maxsize)
+
+    def get(self, user_id: int) -> dict[str, Any] | None:
+        entry = self._cache.get(user_id, is_valid=unexpired)
+        return entry[1] if entry is not None else None
+
+    def set(self, user: User, ttl: float) -> None:
+        state = inspect(user)
+        keys = [attr.key for attr in state.mapper.column_attrs]
+        # частково expired об'єкт (напр. після UPDATE в цій же сесії) не кешуємо:
+        # дочитування атрибутів — це IO
+        if state.unloaded.intersection(keys):
+            return
+        snapshot = {key: state.dict[key] for key in keys}
+        self._cache.set(user.id, (time.monotonic() + ttl, snapshot))
+
+    def invalidate(self, user_id: int) -> None:
+        self._cache.pop(user_id)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> dict[str, int]:
+        return self._cache.stats()
+
+
+# один екземпляр на процес
+user_cache = UserCache()
+revoked_filter = RevokedTokenFilter()
+
+
+def invalidate_user(user_id: int) -> None:
+    """
+    Call after ban/unban, role change or profile update of user_id.
+    """
+    user_cache.invalidate(user_id)
+
+
+async def get_auth_user(session: AsyncSession, user_id: int, settings: Settings) -> User | None:
+    """
+    User for an authenticated request: з кешу без запиту до БД, або з БД (і в кеш).
+    Кешований знімок приєднується до сесії через merge(load=False) — теж без запиту.
+    """
+    snapshot = user_cache.get(user_id)
+    if snapshot is not None:
+        user = User(**snapshot)
+        make_transient_to_detached(user)
+        return await session.merge(user, load=False)
+
+    user = await UserRepository(session).get_by_id(user_id)
+    if user is not None:
+        user_cache.set(user, settings.AUTH_USER_CACHE_TTL_SECONDS)
+    return user
@@ -4,19 +4,19 @@ from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.auth.cache import get_auth_user, revoked_filter
 from app.auth.security import decode_token
 from app.dependency.dependencies import get_session, get_settings
-from app.repository.token_repository import TokenBlacklistRepository
-from app.repository.users_repository import UserRepository
 from app.core.settings import Settings
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    session: AsyncSession = Depends(get_session),
-    settings: Settings = Depends(get_settings),
-):
+
+async def user_from_token(token: str, session: AsyncSession, settings: Settings):
+    """
+    Спільний шлях для API та UI: decode -> revocation filter -> user cache.
+    У типовому випадку (токен не відкликаний, user у кеші) — жодного запиту до БД.
+    """
     try:
         payload = decode_token(token=token, settings=settings)
     except ValueError:
@@ -27,16 +27,24 @@ async def get_current_user(
     if not jti or not sub:
         raise HTTPException(status_code=401, detail="Invalid token")
 
-    if await TokenBlacklistRepository(session).is_revoked(jti):
+    if await revoked_filter.is_revoked(session, jti, settings):
         raise HTTPException(status_code=401, detail="Token revoked")
 
-    user = await UserRepository(session).get_by_id(int(sub))
+    user = await get_auth_user(session, int(sub), settings)
     if not user or not user.is_active:
         raise HTTPException(status_code=401, detail="User inactive or not found")
 
     return user
 
 
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    session: AsyncSession = Depends(get_session),
+    settings: Settings = Depends(get_settings),
+):
+    return await user_from_token(token, session, settings)
+
+
 def require_roles(*roles: str):
     async def dep(user=Depends(get_current_user)):
         user_role = getattr(user.role, "value", user.role)
@@ -4,6 +4,7 @@ from datetime import datetime, timezone
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.auth.cache import revoked_filter
 from app.auth.security import decode_token, hash_password, create_access_token, verify_password
 from app.models import User, UserRole
 from app.models.token_blacklist import TokenBlacklist
@@ -87,4 +88,5 @@ class AuthService:
             await self.session.commit()
         except Exception:
             await self.session.rollback()
-            raise
\ No newline at end of file
+            raise
+        revoked_filter.add(jti)
\ No newline at end of file
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.repository.token_repository import TokenBlacklistRepository
+
+logger = logging.getLogger("photoshare.sweeper")
+
+
+@dataclass
+class SweeperStats:
+    runs: int = 0
+    deleted_total: int = 0
+    last_deleted: int = 0
+    last_duration_ms: float = 0.0
+    last_run_at: datetime | None = None
+    table_rows: int | None = None
+    errors: int = 0
+
+    def as_dict(self) -> dict:
+        data = asdict(self)
+        data["last_run_at"] = self.last_run_at.isoformat() if self.last_run_at else None
+        # throughput останнього проходу (рядків/с)
+        data["last_rows_per_second"] = (
+            round(self.last_deleted / (self.last_duration_ms / 1000), 1) if self.last_duration_ms else 0.0
+        )
+        return data
+
+
+sweeper_stats = SweeperStats()
+
+
+async def sweep_expired_tokens(session: AsyncSession, *, batch_size: int) -> int:
+    """
+    Deletes every expired token_blacklist row, batch_size rows per transaction.
+    Прострочений jti вже не пройде decode_token(), тож рядок більше не потрібен.
+    """
+    repo = TokenBlacklistRepository(session)
+    now = datetime.now(timezone.utc)
+    started = time.perf_counter()
+    deleted = 0
+    while True:
+        n = await repo.delete_expired(now, limit=batch_size)
+        await session.commit()
+        deleted += n
+        if n < batch_size:
+            break
+
+    sweeper_stats.runs += 1
+    sweeper_stats.deleted_total += deleted
+    sweeper_stats.last_deleted = deleted
+    sweeper_stats.last_duration_ms = round((time.perf_counter() - started) * 1000, 2)
+    sweeper_stats.last_run_at = now
+    sweeper_stats.table_rows = await repo.count()
+    await session.commit()
+    return deleted
+
+
+async def run_token_sweeper(
+    sessionmaker: async_sessionmaker[AsyncSession],
+    *,
+    interval_seconds: float,
+    batch_size: int,
+) -> None:
+    """
+    Background loop for the app lifespan; зупиняється через task.cancel().
+    """
+    while True:
+        try:
+            async with sessionmaker() as session:
+                deleted = await sweep_expired_tokens(session, batch_size=batch_size)
+            if deleted:
+                logger.info("token_blacklist sweep: deleted %d expired rows", deleted)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            sweeper_stats.errors += 1
+            logger.exception("token_blacklist sweep failed")
+        await asyncio.sleep(interval_seconds)
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI
 from sqlalchemy import text
@@ -9,13 +10,17 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from starlette.responses import RedirectResponse
 
+from app.auth.sweeper import run_token_sweeper
+from app.core.errors import install_error_pipeline
+from app.core.metrics import MetricsMiddleware
+from app.core.middleware import QueryStatsMiddleware, ReadYourWritesMiddleware, UploadSizeLimitMiddleware
+from app.database.db import get_sessionmaker
 from app.dependency.dependencies import get_settings, get_session
 from app.routers.router import build_api_router
+from app.service.cloudinary_service import close_http_client
+from app.service.image_transform import shutdown_transform_pool
+from app.service.link_hits import run_link_hits_flusher
 from app.ui_routers.ui_router import build_ui_router
-from fastapi import Request, HTTPException
-from fastapi.exception_handlers import http_exception_handler as fastapi_http_exception_handler
-from fastapi.exception_handlers import request_validation_exception_handler
-from fastapi.exceptions import RequestValidationError
 
 def setup_logging() -> None:
     """
@@ -54,10 +59,45 @@ async def lifespan(app: FastAPI):
         # якщо виришимо падати при старті — піднімаємо виняток
         raise
 
+    # --- background: чистка прострочених token_blacklist ---
+    sweeper = None
+    if settings.TOKEN_SWEEP_INTERVAL_SECONDS > 0:
+        sweeper = asyncio.create_task(
+            run_token_sweeper(
+                get_sessionmaker(),
+                interval_seconds=settings.TOKEN_SWEEP_INTERVAL_SECONDS,
+                batch_size=settings.TOKEN_SWEEP_BATCH_SIZE,
+            ),
+            name="token-blacklist-sweeper",
+        )
+
+    # --- background: flush буферизованих hit-лічильників публічних посилань ---
+    hits_flusher = None
+    if settings.LINK_HITS_FLUSH_INTERVAL_SECONDS > 0:
+        hits_flusher = asyncio.create_task(
+            run_link_hits_flusher(
+                get_sessionmaker(),
+                interval_seconds=settings.LINK_HITS_FLUSH_INTERVAL_SECONDS,
+                batch_size=settings.LINK_HITS_FLUSH_BATCH_SIZE,
+            ),
+            name="link-hits-flusher",
+        )
+
     yield
 
     # --- shutdown ---
     logger.info("Shutting down %s ...", settings.APP_NAME)
+    if sweeper is not None:
+        sweeper.cancel()
+        with suppress(asyncio.CancelledError):
+            await sweeper
+    if hits_flusher is not None:
+        # flusher на cancel дописує залишок буфера
+        hits_flusher.cancel()
+        with suppress(asyncio.CancelledError):
+            await hits_flusher
+    await close_http_client()
+    shutdown_transform_pool()
 
 
 def create_app() -> FastAPI:
@@ -75,6 +115,18 @@ def create_app() -> FastAPI:
     templates = Jinja2Templates(directory="app/web/templates")
     app.state.templates = templates
 
+    # помилки: HTML-сторінки для UIRoute, компактний JSON для API (найвнутрішній middleware)
+    install_error_pipeline(app, templates)
+    # великі upload-и відсікаємо до читання тіла
+    app.add_middleware(UploadSizeLimitMiddleware, max_bytes=settings.MAX_UPLOAD_BYTES)
+    # з реплікою: після власної мутації клієнт кілька секунд читає з primary
+    if settings.DB_REPLICA_URL:
+        app.add_middleware(ReadYourWritesMiddleware, pin_seconds=settings.READ_YOUR_WRITES_SECONDS)
+    # зовнішній шар: кількість SQL і час БД на запит -> Server-Timing + лог
+    app.add_middleware(QueryStatsMiddleware)
+    # latency histogram / in-flight по маршрутах -> /metrics
+    app.add_middleware(MetricsMiddleware)
+
     # Роутери
     app.include_router(build_api_router())
     app.include_router(build_ui_router())
@@ -83,48 +135,6 @@ def create_app() -> FastAPI:
     async def favicon():
         return RedirectResponse(url="/static/favicon.ico", status_code=307)
 
-    @app.exception_handler(HTTPException)
-    async def http_exception_handler(request: Request, exc: HTTPException):
-        # Для API/Swagger лишаємо стандартну JSON-відповідь
-        if request.url.path.startswith(("/docs", "/openapi", "/health")):
-            return await fastapi_http_exception_handler(request, exc)
-
-        # Для UI віддаємо HTML-шаблони
-        if exc.status_code in (403, 404):
-            return app.state.templates.TemplateResponse(
-                request,
-                f"errors/{exc.status_code}.html",
-                {"detail": exc.detail},
-                status_code=exc.status_code,
-            )
-
-        # Інші HTTP помилки — стандартно
-        return await fastapi_http_exception_handler(request, exc)
-
-    @app.exception_handler(RequestValidationError)
-    async def validation_exception_handler(request: Request, exc: RequestValidationError):
-        # Валідація для API — як зазвичай
-        if request.url.path.startswith(("/docs", "/openapi", "/health")):
-            return await request_validation_exception_handler(request, exc)
-
-        # Для UI можна показати 403 або окремий шаблон 422 (як захочеш)
-        return app.state.templates.TemplateResponse(
-            request,
-            "errors/403.html",
-            {"detail": "Validation error"},
-            status_code=403,
-        )
-
-    @app.exception_handler(Exception)
-    async def unhandled_exception_handler(request: Request, exc: Exception):
-        if request.url.path.startswith(("/docs", "/openapi", "/health")):
-            raise exc  # щоб API не “ховав” 500
-        return app.state.templates.TemplateResponse(
-            request,
-            "errors/500.html",
-            status_code=500,
-        )
-
     # lifespan підключаємо після створення app:
     # FastAPI приймає lifespan тільки в конструктор, тому робимо так:
     app.router.lifespan_context = lifespan  # type: ignore[assignment]
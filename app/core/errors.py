@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import logging
+
+from fastapi import FastAPI, Request
+from fastapi.exception_handlers import http_exception_handler, request_validation_exception_handler
+from fastapi.exceptions import RequestValidationError
+from fastapi.routing import APIRoute
+from fastapi.templating import Jinja2Templates
+from starlette.exceptions import HTTPException as StarletteHTTPException
+from starlette.responses import HTMLResponse, JSONResponse, Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.lru import LRUCache
+
+logger = logging.getLogger("photoshare.errors")
+
+
+class UIRoute(APIRoute):
+    """
+    Route class of the HTML (UI) routers: їхні помилки рендеряться сторінкою, решта — компактний JSON.
+    FastAPI зберігає клас маршруту при include_router, тому рішення не залежить від префікса URL.
+    """
+
+
+def is_ui_request(scope: Scope) -> bool:
+    route = scope.get("route")
+    if route is not None:
+        return isinstance(route, UIRoute)
+    # маршрут не знайдено (404/405 від router-а) — content negotiation по Accept
+    for name, value in scope.get("headers", ()):
+        if name == b"accept":
+            return b"text/html" in value
+    return False
+
+
+class ErrorPages:
+    """
+    Error templates compiled once at startup; готовий HTML кешується по (status, detail, root_path).
+    """
+
+    TEMPLATES = {403: "errors/403.html", 404: "errors/404.html", 500: "errors/500.html"}
+
+    def __init__(self, templates: Jinja2Templates, app: FastAPI, *, cache_size: int = 256) -> None:
+        self.app = app
+        self._compiled = {code: templates.env.get_template(name) for code, name in self.TEMPLATES.items()}
+        self._rendered: LRUCache[tuple[int, str, str], bytes] = LRUCache(maxsize=cache_size)
+
+    def has_page(self, status_code: int) -> bool:
+        return status_code in self._compiled
+
+    def render(self, status_code: int, detail: str | None, root_path: str = "") -> bytes:
+        key = (status_code, detail or "", root_path)
+        body = self._rendered.get(key)
+        if body is None:
+            # сторінки помилок не залежать від запиту, крім root_path для static URL-ів
+            def url_for(name: str, /, **path_params) -> str:
+                return root_path + str(self.app.url_path_for(name, **path_params))
+
+            body = self._compiled[status_code].render(detail=detail, url_for=url_for).encode("utf-8")
+            self._rendered.set(key, body)
+        return body
+
+    def response(self, status_code: int, detail: str | None, scope: Scope) -> HTMLResponse:
+        return HTMLResponse(self.render(status_code, detail, scope.get("root_path", "")), status_code=status_code)
+
+
+class ErrorPipelineMiddleware:
+    """
+    Replaces the catch-all Exception handler: необроблений виняток -> 500 сторінка для UI
+    або {"detail": ...} для API. Виняток логується тут і далі не прокидається.
+    """
+
+    def __init__(self, app: ASGIApp, *, pages: ErrorPages) -> None:
+        self.app = app
+        self.pages = pages
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            logger.exception("Unhandled error: %s %s", scope["method"], scope["path"])
+            if response_started:
+                raise
+            if is_ui_request(scope):
+                response: Response = self.pages.response(500, None, scope)
+            else:
+                response = JSONResponse({"detail": "Internal Server Error"}, status_code=500)
+            await response(scope, receive, send)
+
+
+def install_error_pipeline(app: FastAPI, templates: Jinja2Templates) -> None:
+    pages = ErrorPages(templates, app)
+
+    async def on_http_exception(request: Request, exc: StarletteHTTPException) -> Response:
+        if is_ui_request(request.scope) and pages.has_page(exc.status_code):
+            return pages.response(exc.status_code, str(exc.detail), request.scope)
+        return await http_exception_handler(request, exc)
+
+    async def on_validation_error(request: Request, exc: RequestValidationError) -> Response:
+        if is_ui_request(request.scope):
+            return pages.response(403, "Validation error", request.scope)
+        return await request_validation_exception_handler(request, exc)
+
+    app.add_exception_handler(StarletteHTTPException, on_http_exception)
+    app.add_exception_handler(RequestValidationError, on_validation_error)
+    app.add_middleware(ErrorPipelineMiddleware, pages=pages)
@@ -23,3 +23,19 @@ class CloudinaryTransformError(ServiceError):
 
 class ConflictError(ServiceError):
     pass
+
+
+class InvalidCursorError(ServiceError):
+    """Raised when a pagination cursor is malformed or doesn't match the query."""
+
+
+class StorageError(ServiceError):
+    """Raised when the image storage backend (Cloudinary etc.) fails or times out."""
+
+
+class UploadTooLargeError(ServiceError):
+    """Raised when an uploaded file exceeds MAX_UPLOAD_BYTES."""
+
+
+class ImageTransformError(ServiceError):
+    """Raised when transform params are invalid or the local engine can't render the image."""
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from app.models.user import User
+
+
+PHOTO_INCLUDES = ("tags", "rating", "owner")
+
+
+def parse_include(raw: str | None) -> frozenset[str]:
+    """
+    "tags,rating" -> frozenset({"tags", "rating"}). Unknown names -> ValueError.
+    """
+    if not raw:
+        return frozenset()
+    names = frozenset(part.strip() for part in raw.split(",") if part.strip())
+    unknown = names.difference(PHOTO_INCLUDES)
+    if unknown:
+        raise ValueError(
+            f"Unknown include: {', '.join(sorted(unknown))}. Allowed: {', '.join(PHOTO_INCLUDES)}"
+        )
+    return names
+
+
+@dataclass
+class PhotoIncludes:
+    """
+    Batch-loaded extras for a page of photos (див. PhotoService.load_includes).
+    """
+    tags: dict[int, list[str]] | None = None
+    owners: dict[int, User] | None = None
+    rating: bool = False
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+class LRUCache(Generic[K, V]):
+    """
+    Bounded in-process LRU з лічильниками hit/miss.
+    Не thread-safe: розрахований на один event loop (весь доступ — з корутин).
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[K, V] = OrderedDict()
+
+    def get(self, key: K, default: V | None = None, *, is_valid: Callable[[V], bool] | None = None) -> V | None:
+        """
+        is_valid(value) == False (напр. TTL минув) — запис викидається і рахується як miss, не hit.
+        """
+        value = self._data.get(key, _MISSING)
+        if value is not _MISSING and is_valid is not None and not is_valid(value):
+            del self._data[key]
+            value = _MISSING
+        if value is _MISSING:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: K) -> V | None:
+        return self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def items(self) -> list[tuple[K, V]]:
+        # знімок: безпечно pop-ати під час ітерації
+        return list(self._data.items())
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def stats(self) -> dict[str, int]:
+        return {"size": len(self._data), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+
+def unexpired(entry: tuple[float, Any]) -> bool:
+    # is_valid для записів (expires_at за time.monotonic(), value)
+    return time.monotonic() < entry[0]
@@ -0,0 +1,246 @@
+"""
+Мінімальні Prometheus-метрики без залежностей: Counter / Gauge / Histogram і text exposition 0.0.4.
+Значення per process — кожен воркер віддає свої, агрегує Prometheus.
+"""
+
+from __future__ import annotations
+
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from functools import wraps
+from typing import Callable, Iterable
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+LabelValues = tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric(ABC):
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help = help_text
+        self.labelnames = labelnames
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+    @abstractmethod
+    def render(self) -> list[str]:
+        ...
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> None:
+        super().__init__(name, help_text, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, labels: LabelValues = (), amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def set(self, labels: LabelValues, value: float) -> None:
+        # для collector-ів, що віддзеркалюють зовнішній монотонний лічильник (LRUCache.hits)
+        self._values[labels] = value
+
+    def value(self, labels: LabelValues = ()) -> float:
+        return self._values.get(labels, 0)
+
+    def render(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in self._values.items()
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, labels: LabelValues = (), amount: float = 1) -> None:
+        self.inc(labels, -amount)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [counts per bucket (не кумулятивні) + overflow, sum, count]
+        self._series: dict[LabelValues, list] = {}
+
+    def observe(self, labels: LabelValues, value: float) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def count(self, labels: LabelValues = ()) -> int:
+        series = self._series.get(labels)
+        return series[2] if series else 0
+
+    def render(self) -> list[str]:
+        lines = []
+        for labels, (counts, total, count) in self._series.items():
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, float("inf")), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Registered metrics + collectors, що оновлюють gauge-і в момент scrape (pool, кеші).
+    """
+
+    def __init__(self) -> None:
+        self._metrics: list[_Metric] = []
+        self._collectors: list[Callable[[], None]] = []
+
+    def register(self, metric: _Metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self.register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+        return self.register(Gauge(name, help_text, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, help_text, labelnames, buckets))
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        for collector in self._collectors:
+            collector()
+        lines: list[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.header())
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_requests_total = registry.counter(
+    "photoshare_http_requests_total", "HTTP requests by route and status.", ("method", "route", "status"),
+)
+http_request_duration = registry.histogram(
+    "photoshare_http_request_duration_seconds", "HTTP request latency by route.", ("method", "route"),
+)
+http_requests_in_flight = registry.gauge(
+    "photoshare_http_requests_in_flight", "HTTP requests currently being served.",
+)
+storage_call_duration = registry.histogram(
+    "photoshare_storage_call_duration_seconds", "Storage backend call latency.", ("backend", "operation"),
+)
+storage_call_errors = registry.counter(
+    "photoshare_storage_call_errors_total", "Storage backend calls that raised.", ("backend", "operation"),
+)
+
+
+def observe_storage_call(operation: str):
+    """
+    Decorator for async StorageBackend methods: latency + errors з label backend=ім'я класу.
+    """
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            labels = (type(self).__name__, operation)
+            started = time.perf_counter()
+            try:
+                return await func(self, *args, **kwargs)
+            except Exception:
+                storage_call_errors.inc(labels)
+                raise
+            finally:
+                storage_call_duration.observe(labels, time.perf_counter() - started)
+        return wrapper
+    return decorator
+
+
+def _route_label(scope: Scope) -> str:
+    # шаблон маршруту ("/photos/{photo_id}"), а не сирий path — інакше кардинальність необмежена
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    if path:
+        return path
+    # Mount (static) шаблону не має, але виставляє root_path
+    return scope.get("root_path") or "<unmatched>"
+
+
+class MetricsMiddleware:
+    """
+    Per-route latency histogram, request counter and in-flight gauge.
+    На запит — два perf_counter() і кілька dict-операцій.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        started = time.perf_counter()
+        http_requests_in_flight.inc()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_requests_in_flight.dec()
+            route = _route_label(scope)
+            http_request_duration.observe((scope["method"], route), time.perf_counter() - started)
+            http_requests_total.inc((scope["method"], route, str(status_code)))
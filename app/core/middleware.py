@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import logging
+from http.cookies import SimpleCookie
+
+from starlette.datastructures import MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.database.db import prefer_primary
+from app.database.query_stats import track_queries
+
+logger = logging.getLogger("photoshare.db")
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Rejects multipart requests whose Content-Length already exceeds the limit,
+    before the body is read and spooled. Chunked uploads (без Content-Length)
+    обмежуються пізніше, в spool_upload().
+    """
+
+    # запас на multipart boundary та текстові поля форми
+    FORM_OVERHEAD = 64 * 1024
+
+    def __init__(self, app: ASGIApp, *, max_bytes: int) -> None:
+        self.app = app
+        self.max_body = max_bytes + self.FORM_OVERHEAD
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["method"] in ("POST", "PUT"):
+            headers = dict(scope["headers"])
+            content_type = headers.get(b"content-type", b"")
+            content_length = headers.get(b"content-length")
+            if content_type.startswith(b"multipart/") and content_length and content_length.isdigit():
+                if int(content_length) > self.max_body:
+                    response = JSONResponse({"detail": "File too large"}, status_code=413)
+                    await response(scope, receive, send)
+                    return
+
+        await self.app(scope, receive, send)
+
+
+class ReadYourWritesMiddleware:
+    """
+    Routes reads to the primary for pin_seconds after a client's own successful mutation.
+
+    Pin — cookie, а не пам'ять процесу: працює з будь-яким воркером.
+    Мутації (не GET/HEAD/OPTIONS) завжди йдуть на primary.
+    """
+
+    COOKIE_NAME = "rw_pin"
+    SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+    def __init__(self, app: ASGIApp, *, pin_seconds: int) -> None:
+        self.app = app
+        self.pin_seconds = pin_seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        is_write = scope["method"] not in self.SAFE_METHODS
+        token = prefer_primary.set(is_write or self._is_pinned(scope))
+
+        async def send_wrapper(message: Message) -> None:
+            if is_write and message["type"] == "http.response.start" and message["status"] < 400:
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "set-cookie",
+                    f"{self.COOKIE_NAME}=1; Max-Age={self.pin_seconds}; Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            prefer_primary.reset(token)
+
+    def _is_pinned(self, scope: Scope) -> bool:
+        for name, value in scope["headers"]:
+            if name == b"cookie":
+                cookie = SimpleCookie()
+                cookie.load(value.decode("latin-1"))
+                if self.COOKIE_NAME in cookie:
+                    return True
+        return False
+
+
+class QueryStatsMiddleware:
+    """
+    Counts SQL statements and DB time per request (див. app.database.query_stats).
+    Результат — заголовок Server-Timing і рядок лога photoshare.db після відповіді.
+    Запити, виконані вже після http.response.start (streaming), в заголовок не потрапляють.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        with track_queries() as stats:
+            async def send_wrapper(message: Message) -> None:
+                nonlocal status_code
+                if message["type"] == "http.response.start":
+                    status_code = message["status"]
+                    MutableHeaders(scope=message).append("server-timing", stats.server_timing())
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                logger.info(
+                    "%s %s status=%s queries=%d db_ms=%.1f slow=%d",
+                    scope["method"], scope["path"], status_code, stats.count, stats.db_ms, stats.slow,
+                    extra={
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "status": status_code,
+                        "queries": stats.count,
+                        "db_ms": round(stats.db_ms, 1),
+                        "slow_queries": stats.slow,
+                    },
+                )
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+
+from app.core.exceptions import InvalidCursorError
+
+
+RATING_SORTS = {"top", "low"}
+# relevance залежить від q, тому для неї лише offset-пагінація
+KEYSET_SORTS = {"newest", "oldest"} | RATING_SORTS
+
+
+@dataclass(frozen=True)
+class PhotoCursor:
+    """
+    Позиція в keyset-пагінації фото.
+    Ключ: (created_at, id), для sort=top|low — (avg_rating, created_at, id).
+    """
+    sort: str
+    created_at: datetime
+    id: int
+    avg_rating: float | None = None
+
+
+def encode_cursor(cursor: PhotoCursor) -> str:
+    payload = {
+        "s": cursor.sort,
+        "c": cursor.created_at.isoformat(),
+        "i": cursor.id,
+    }
+    if cursor.avg_rating is not None:
+        payload["r"] = cursor.avg_rating
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, *, sort: str) -> PhotoCursor:
+    """
+    Opaque token -> PhotoCursor.
+    Cursor прив'язаний до sort: з іншим sort він не має сенсу.
+    """
+    if sort not in KEYSET_SORTS:
+        raise InvalidCursorError(f"Cursor pagination is not supported for sort={sort}")
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        cursor = PhotoCursor(
+            sort=str(payload["s"]),
+            created_at=datetime.fromisoformat(payload["c"]),
+            id=int(payload["i"]),
+            avg_rating=float(payload["r"]) if "r" in payload else None,
+        )
+    except (ValueError, KeyError, TypeError) as exc:
+        raise InvalidCursorError("Invalid cursor") from exc
+
+    if cursor.sort != sort:
+        raise InvalidCursorError("Cursor does not match sort order")
+    if sort in RATING_SORTS and cursor.avg_rating is None:
+        raise InvalidCursorError("Invalid cursor")
+    return cursor
+
+
+def next_photo_cursor(items: list, *, sort: str, limit: int) -> str | None:
+    """
+    Cursor для наступної сторінки або None, якщо сторінка неповна (далі нічого немає).
+    """
+    if sort not in KEYSET_SORTS or not items or len(items) < limit:
+        return None
+    last = items[-1]
+    avg_rating = None
+    if sort in RATING_SORTS:
+        avg_rating = float(last.avg_rating or 0.0)
+    return encode_cursor(
+        PhotoCursor(sort=sort, created_at=last.created_at, id=last.id, avg_rating=avg_rating)
+    )
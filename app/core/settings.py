@@ -10,16 +10,63 @@ class Settings(BaseSettings):
 	DB_PASSWORD: str
 	DB_NAME: str
 	DB_DRIVER: str = "postgresql+asyncpg"
+	# Pool — на один воркер; сумарно workers * (POOL_SIZE + MAX_OVERFLOW) <= max_connections
+	DB_POOL_SIZE: int = 5
+	DB_MAX_OVERFLOW: int = 10
+	DB_POOL_TIMEOUT_SECONDS: float = 30.0
+	DB_POOL_RECYCLE_SECONDS: int = 1800
+	DB_POOL_PRE_PING: bool = True
+	DB_STATEMENT_CACHE_SIZE: int = 100
+	# server-side statement_timeout, 0 — без ліміту
+	DB_STATEMENT_TIMEOUT_MS: int = 0
+	# Read replica (повний async URL); None — усі читання на primary
+	DB_REPLICA_URL: str | None = None
+	# скільки секунд після власної мутації читання клієнта йдуть на primary
+	READ_YOUR_WRITES_SECONDS: int = 5
+	# запити, довші за поріг, логуються зі statement і параметрами (0 — вимкнено)
+	SLOW_QUERY_MS: float = 200.0
 
 	SECRET_KEY: str
 	ALGORITHM: str
 	ACCESS_TOKEN_EXPIRE_MINUTES: int
+	# Auth fast path: кеш користувачів і bloom-фільтр відкликаних jti (per process)
+	AUTH_USER_CACHE_TTL_SECONDS: float = 30.0
+	REVOKED_FILTER_REFRESH_SECONDS: float = 30.0
+	# Sweeper прострочених token_blacklist рядків (0 — вимкнено)
+	TOKEN_SWEEP_INTERVAL_SECONDS: float = 300.0
+	TOKEN_SWEEP_BATCH_SIZE: int = 1000
+
+	# TTL in-memory кешу хмари тегів на головній (0 — без кешу)
+	TAG_CLOUD_CACHE_TTL_SECONDS: float = 60.0
+	# /public/{uuid}: кеш uuid -> URL (per process); негативний — для невідомих uuid
+	PUBLIC_LINK_CACHE_TTL_SECONDS: float = 300.0
+	PUBLIC_LINK_NEGATIVE_TTL_SECONDS: float = 30.0
+	# hit-лічильники /public/{uuid} і /qr: буфер у пам'яті, flush пачками (0 — flush вимкнено)
+	LINK_HITS_FLUSH_INTERVAL_SECONDS: float = 10.0
+	LINK_HITS_FLUSH_BATCH_SIZE: int = 500
 
 	# Cloudinary
 	CLOUDINARY_NAME: str
 	CLOUDINARY_API_KEY: str
 	CLOUDINARY_API_SECRET: str
 	CLOUDINARY_URL: str
+	CLOUDINARY_TIMEOUT_SECONDS: float = 30.0
+	CLOUDINARY_MAX_CONCURRENCY: int = 8
+
+	# Uploads: файл стрімиться чанками, у пам'яті не більше UPLOAD_CHUNK_SIZE
+	MAX_UPLOAD_BYTES: int = 20 * 1024 * 1024
+	UPLOAD_CHUNK_SIZE: int = 64 * 1024
+
+	# Storage: "cloudinary" | "local" (диск, віддається через /media) | "fake" (in-memory, для офлайн-навантаження)
+	STORAGE_BACKEND: str = "cloudinary"
+	FAKE_STORAGE_LATENCY_MS: int = 0
+	LOCAL_STORAGE_DIR: str = "media"
+	MEDIA_URL_PREFIX: str = "/media"
+	# Local transform engine: 0 -> os.cpu_count() воркерів
+	TRANSFORM_WORKERS: int = 0
+	TRANSFORM_CACHE_DIR: str = "media_cache"
+	# межа диску для рендерів; найстаріші файли видаляються (0 — без межі)
+	TRANSFORM_CACHE_MAX_MB: int = 1024
 	
 	model_config = SettingsConfigDict(
 		env_file=".env",
@@ -1,7 +1,13 @@
 
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import exc
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.core.settings import Settings
+from app.database.query_stats import install_query_hooks
 
 def _get_database_url() -> str:
     database_url = Settings().database_url
@@ -10,17 +16,97 @@ def _get_database_url() -> str:
     return database_url
 
 
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool, що рахує checkout-и, час очікування з'єднання і timeouts.
+    Час = від запиту з'єднання до отримання (включно з pre-ping і створенням нового).
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total_ms = 0.0
+        self.wait_max_ms = 0.0
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited = (time.perf_counter() - started) * 1000
+            self.checkouts += 1
+            self.wait_total_ms += waited
+            self.wait_max_ms = max(self.wait_max_ms, waited)
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size(),
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": self.overflow(),
+            "max_overflow": self._max_overflow,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_avg_ms": round(self.wait_total_ms / self.checkouts, 3) if self.checkouts else 0.0,
+            "wait_max_ms": round(self.wait_max_ms, 3),
+        }
+
+
+def _engine_options(settings: Settings) -> dict:
+    if not settings.DB_DRIVER.startswith("postgresql"):
+        return {}
+
+    connect_args: dict = {
+        # asyncpg кешує prepared statements на рівні з'єднання
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+    }
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        connect_args["server_settings"] = {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}
+
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "connect_args": connect_args,
+    }
+
+
 _engine = None
 _sessionmaker = None
+_read_engine = None
+_read_sessionmaker = None
+
+# True -> читання цього запиту йдуть на primary (мутація або read-your-writes pin)
+prefer_primary: ContextVar[bool] = ContextVar("prefer_primary", default=False)
 
 
 def get_engine():
     global _engine
     if _engine is None:
-        _engine = create_async_engine(_get_database_url(), echo=False)
+        settings = Settings()
+        _engine = create_async_engine(
+            _get_database_url(),
+            echo=False,
+            **_engine_options(settings),
+        )
+        install_query_hooks(_engine.sync_engine, slow_query_ms=settings.SLOW_QUERY_MS)
     return _engine
 
 
+def get_pool_stats() -> dict:
+    pool = get_engine().pool
+    if isinstance(pool, InstrumentedQueuePool):
+        return pool.stats()
+    return {"pool": type(pool).__name__, "status": pool.status()}
+
+
 def get_sessionmaker():
     global _sessionmaker
     if _sessionmaker is None:
@@ -32,7 +118,46 @@ def get_sessionmaker():
     return _sessionmaker
 
 
+def get_read_engine():
+    """
+    Replica engine (DB_REPLICA_URL) або primary, якщо репліка не налаштована.
+    """
+    global _read_engine
+    if _read_engine is None:
+        settings = Settings()
+        if settings.DB_REPLICA_URL:
+            _read_engine = create_async_engine(
+                settings.DB_REPLICA_URL,
+                echo=False,
+                **_engine_options(settings),
+            )
+            install_query_hooks(_read_engine.sync_engine, slow_query_ms=settings.SLOW_QUERY_MS)
+        else:
+            _read_engine = get_engine()
+    return _read_engine
+
+
+def get_read_sessionmaker():
+    global _read_sessionmaker
+    if _read_sessionmaker is None:
+        _read_sessionmaker = async_sessionmaker(
+            get_read_engine(),
+            expire_on_commit=False,
+            class_=AsyncSession,
+        )
+    return _read_sessionmaker
+
+
 async def get_async_session():
     sessionmaker = get_sessionmaker()
     async with sessionmaker() as session:
         yield session
+
+
+async def get_async_read_session():
+    """
+    Session for read-only paths. Йде на репліку, крім запитів, закріплених за primary.
+    """
+    sessionmaker = get_sessionmaker() if prefer_primary.get() else get_read_sessionmaker()
+    async with sessionmaker() as session:
+        yield session
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import logging
+import time
+import weakref
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger("photoshare.db")
+
+
+@dataclass
+class QueryStats:
+    """
+    SQL statements and DB time for one unit of work (зазвичай — один HTTP-запит).
+    """
+    count: int = 0
+    db_ms: float = 0.0
+    slow: int = 0
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.db_ms:.1f};desc="{self.count} queries"'
+
+
+# None — поза track_queries(): hooks нічого не рахують
+current_query_stats: ContextVar[QueryStats | None] = ContextVar("current_query_stats", default=None)
+
+_instrumented: weakref.WeakSet[Engine] = weakref.WeakSet()
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    stats = QueryStats()
+    token = current_query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        current_query_stats.reset(token)
+
+
+def install_query_hooks(engine: Engine, *, slow_query_ms: float = 0.0) -> None:
+    """
+    Registers before/after_cursor_execute hooks on a sync engine (AsyncEngine.sync_engine).
+    slow_query_ms > 0: statement і параметри повільніших запитів логуються як WARNING.
+    Повторний виклик для того ж engine нічого не робить.
+    """
+    if engine in _instrumented:
+        return
+    _instrumented.add(engine)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, _cursor, _statement, _parameters, _context, _executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, _cursor, statement, parameters, _context, _executemany):
+        elapsed_ms = (time.perf_counter() - conn.info["query_started"].pop()) * 1000
+
+        stats = current_query_stats.get()
+        if stats is not None:
+            stats.count += 1
+            stats.db_ms += elapsed_ms
+
+        if slow_query_ms and elapsed_ms >= slow_query_ms:
+            if stats is not None:
+                stats.slow += 1
+            logger.warning(
+                "slow query %.1fms: %s | params=%r",
+                elapsed_ms, statement, parameters,
+                extra={"db_ms": round(elapsed_ms, 1), "statement": statement, "parameters": parameters},
+            )
+
+    @event.listens_for(engine, "handle_error")
+    def _error(ctx):
+        # after_cursor_execute для запиту з помилкою не викликається
+        started = ctx.connection.info.get("query_started") if ctx.connection is not None else None
+        if started:
+            started.pop()
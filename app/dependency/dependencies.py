@@ -6,7 +6,7 @@ from typing import AsyncIterator
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database.db import get_async_session
+from app.database.db import get_async_read_session, get_async_session
 from app.repository.comment_repository import CommentRepository
 from app.repository.photos_repository import PhotoRepository
 from app.repository.public_links_repository import PublicLinkRepository
@@ -23,8 +23,10 @@ from app.service.tagging_service import TaggingService
 from app.service.rating_service import RatingService
 from app.service.comment_service import CommentService
 from app.service.share_service import ShareService
+from app.service.photo_detail_service import PhotoDetailService
 from app.service.qr_service import QrService
-from app.service.cloudinary_service import CloudinaryService
+from app.service.storage import LocalStorageService, StorageBackend, build_storage_backend
+from app.service.image_transform import LocalTransformEngine
 
 # auth canonical
 from app.auth.service import AuthService
@@ -43,6 +45,11 @@ async def get_session() -> AsyncIterator[AsyncSession]:
     async for s in get_async_session():
         yield s
 
+async def get_read_session() -> AsyncIterator[AsyncSession]:
+    # репліка (якщо є) — лише для read-only шляхів, див. *_read_service нижче
+    async for s in get_async_read_session():
+        yield s
+
 # --- Repositories --------------------------------------------------------------
 
 def users_repo(session: AsyncSession = Depends(get_session)) -> UserRepository:
@@ -70,11 +77,25 @@ def token_blacklist_repo(session: AsyncSession = Depends(get_session)) -> TokenB
     return TokenBlacklistRepository(session)
 
 
-# --- Infra services (Cloudinary / QR) -----------------------------------------
+# --- Infra services (Storage / QR) --------------------------------------------
 
-def cloudinary_service(settings: Settings = Depends(get_settings)) -> CloudinaryService:
-    # ВАЖЛИВО: CloudinaryService має працювати від settings (api_key/secret/cloud_name тощо)
-    return CloudinaryService(settings)
+@lru_cache(maxsize=1)
+def _shared_storage_backend() -> StorageBackend:
+    return build_storage_backend(get_settings())
+
+def storage_backend() -> StorageBackend:
+    # бекенд обирається через STORAGE_BACKEND: cloudinary | local | fake.
+    # Один екземпляр на процес: без cloudinary.config() і нових об'єктів на кожен запит
+    return _shared_storage_backend()
+
+def transform_engine(
+    storage: StorageBackend = Depends(storage_backend),
+    settings: Settings = Depends(get_settings),
+) -> LocalTransformEngine | None:
+    # трансформації рендеримо самі лише для local; Cloudinary робить це на своєму CDN
+    if not isinstance(storage, LocalStorageService):
+        return None
+    return LocalTransformEngine(storage, settings)
 
 def qr_service() -> QrService:
     return QrService()
@@ -90,7 +111,7 @@ def user_service(
 def photo_service(
     session: AsyncSession = Depends(get_session),
     repo: PhotoRepository = Depends(photos_repo),
-    cloud: CloudinaryService = Depends(cloudinary_service),
+    cloud: StorageBackend = Depends(storage_backend),
     tag_repo: TagRepository = Depends(tags_repo),
 ) -> PhotoService:
     return PhotoService(session=session, photos_repo=repo, cloudinary_client=cloud, tags_repo=tag_repo)
@@ -121,8 +142,9 @@ def share_service(
     photos: PhotoRepository = Depends(photos_repo),
     transformed: TransformedImageRepository = Depends(transformed_images_repo),
     links: PublicLinkRepository = Depends(public_links_repo),
-    cloud: CloudinaryService = Depends(cloudinary_service),
+    cloud: StorageBackend = Depends(storage_backend),
     qr_maker: QrService = Depends(qr_service),
+    settings: Settings = Depends(get_settings),
 ) -> ShareService:
     return ShareService(
         session=session,
@@ -131,6 +153,8 @@ def share_service(
         public_links_repo=links,
         cloudinary=cloud,
         qr_maker=qr_maker,
+        link_cache_ttl=settings.PUBLIC_LINK_CACHE_TTL_SECONDS,
+        link_negative_ttl=settings.PUBLIC_LINK_NEGATIVE_TTL_SECONDS,
     )
 
 # --- Auth (canonical: app/auth/* only) ----------------------------------------
@@ -141,4 +165,42 @@ def auth_service(
     blacklist: TokenBlacklistRepository = Depends(token_blacklist_repo),
     settings: Settings = Depends(get_settings)
 ) -> AuthService:
-    return AuthService(session=session, users=users, blacklist=blacklist, settings=settings)
\ No newline at end of file
+    return AuthService(session=session, users=users, blacklist=blacklist, settings=settings)
+
+# --- Read-only services (replica) ---------------------------------------------
+# Ті самі сервіси, але на read-сесії: лише для GET-шляхів без запису.
+
+def photo_read_service(
+    session: AsyncSession = Depends(get_read_session),
+    cloud: StorageBackend = Depends(storage_backend),
+) -> PhotoService:
+    return PhotoService(
+        session=session,
+        photos_repo=PhotoRepository(session),
+        cloudinary_client=cloud,
+        tags_repo=TagRepository(session),
+        users_repo=UserRepository(session),
+    )
+
+def tagging_read_service(
+    session: AsyncSession = Depends(get_read_session),
+    settings: Settings = Depends(get_settings),
+) -> TaggingService:
+    return TaggingService(
+        session=session,
+        photos_repo=PhotoRepository(session),
+        tags_repo=TagRepository(session),
+        cloud_cache_ttl=settings.TAG_CLOUD_CACHE_TTL_SECONDS,
+    )
+
+def user_read_service(session: AsyncSession = Depends(get_read_session)) -> UserService:
+    return UserService(session=session, photos_repo=PhotoRepository(session), users_repo=UserRepository(session))
+
+def rating_read_service(session: AsyncSession = Depends(get_read_session)) -> RatingService:
+    return RatingService(session=session, ratings_repo=RatingRepository(session), photos_repo=PhotoRepository(session))
+
+def comment_read_service(session: AsyncSession = Depends(get_read_session)) -> CommentService:
+    return CommentService(session=session, comment_repo=CommentRepository(session), photos_repo=PhotoRepository(session))
+
+def photo_detail_read_service(session: AsyncSession = Depends(get_read_session)) -> PhotoDetailService:
+    return PhotoDetailService(session=session, photos_repo=PhotoRepository(session), comments_repo=CommentRepository(session))
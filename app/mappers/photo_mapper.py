@@ -1,20 +1,47 @@
+from typing import Any, Iterable
+
+from app.core.lru import LRUCache
 from app.models.photo import Photo
-from app.schemas.photo_schema import PhotoRead
-from app.service.cloudinary_service import CloudinaryService
+from app.schemas.photo_schema import PhotoOwner, PhotoRatingSummary, PhotoRead
+from app.core.includes import PhotoIncludes
+from app.service.storage import StorageBackend
+
+
+# (тип бекенду, public_id, frozen params) -> URL.
+# URL детермінований для public_id + params, тому інвалідація не потрібна.
+_url_cache: LRUCache[tuple[type, str, tuple], str] = LRUCache(maxsize=10_000)
+
+
+def build_photo_url(
+    cloudinary: StorageBackend,
+    public_id: str,
+    params: dict[str, Any] | None = None,
+) -> str:
+    """
+    Memoized cloudinary.build_transformed_url (URL-signing в SDK не безкоштовний).
+    """
+    params = params or {}
+    key = (type(cloudinary), public_id, tuple(sorted(params.items())))
+    url = _url_cache.get(key)
+    if url is None:
+        url = cloudinary.build_transformed_url(public_id=public_id, params=params)
+        _url_cache.set(key, url)
+    return url
+
+
+def url_cache_stats() -> dict[str, int]:
+    return _url_cache.stats()
 
 
 def map_photo_to_read(
     photo: Photo,
-    cloudinary: CloudinaryService,
+    cloudinary: StorageBackend,
 ) -> PhotoRead:
     """
     Map ORM Photo -> API PhotoRead.
     Public representation with derived photo_url.
     """
-    photo_url = cloudinary.build_transformed_url(
-        public_id=photo.cloudinary_public_id,
-        params={},
-    )
+    photo_url = build_photo_url(cloudinary, photo.cloudinary_public_id)
 
     return PhotoRead(
         id=photo.id,
@@ -24,4 +51,44 @@ def map_photo_to_read(
         photo_url=photo_url,
         created_at=photo.created_at,
         updated_at=photo.updated_at,
-    )
\ No newline at end of file
+    )
+
+
+def _owner(owners: dict | None, user_id: int) -> PhotoOwner | None:
+    user = owners.get(user_id) if owners is not None else None
+    return PhotoOwner(id=user.id, username=user.username) if user is not None else None
+
+
+def map_photos_to_read(
+    photos: Iterable[Photo],
+    cloudinary: StorageBackend,
+    includes: PhotoIncludes | None = None,
+) -> list[PhotoRead]:
+    """
+    Map a whole page at once: кожен public_id резолвиться в URL один раз на сторінку.
+    includes — вже завантажені PhotoService.load_includes extras (tags/rating/owner).
+    """
+    photos = list(photos)
+    includes = includes or PhotoIncludes()
+    urls = {p.cloudinary_public_id: None for p in photos}
+    for public_id in urls:
+        urls[public_id] = build_photo_url(cloudinary, public_id)
+
+    return [
+        PhotoRead(
+            id=p.id,
+            user_id=p.user_id,
+            photo_unique_url=p.photo_unique_url,
+            description=p.description,
+            photo_url=urls[p.cloudinary_public_id],
+            created_at=p.created_at,
+            updated_at=p.updated_at,
+            tags=includes.tags.get(p.id, []) if includes.tags is not None else None,
+            rating=PhotoRatingSummary(
+                avg_rating=round(p.avg_rating, 2) if p.rating_count else None,
+                ratings_count=p.rating_count or 0,
+            ) if includes.rating else None,
+            owner=_owner(includes.owners, p.user_id),
+        )
+        for p in photos
+    ]
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.models.base import Base
 from app.models.mixins import CreatedAtMixin, UpdatedAtMixin
@@ -8,6 +8,11 @@ from app.models.mixins import CreatedAtMixin, UpdatedAtMixin
 
 class Comment(Base, CreatedAtMixin, UpdatedAtMixin):
     __tablename__ = "comments"
+    __table_args__ = (
+        # list_for_photo / list_for_user: WHERE ... ORDER BY created_at DESC
+        Index("ix_comments_photo_id_created_at", "photo_id", "created_at"),
+        Index("ix_comments_user_id_created_at", "user_id", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
 
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from typing import List
-from sqlalchemy import ForeignKey
+from sqlalchemy import DDL, ForeignKey, Float, Index, Integer, event, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.ext.associationproxy import association_proxy
 from app.models.mixins import CreatedAtMixin, UpdatedAtMixin
@@ -11,6 +11,14 @@ from app.models.base import Base
 
 class Photo(Base, CreatedAtMixin, UpdatedAtMixin):
     __tablename__ = "photos"
+    __table_args__ = (
+        # sort=top|low та min_rating без GROUP BY по ratings
+        Index("ix_photos_avg_rating_created_at", "avg_rating", "created_at", "id"),
+        # sort=newest|oldest без фільтрів
+        Index("ix_photos_created_at_id", "created_at", "id"),
+        # list_by_user (ORDER BY created_at DESC, id DESC) і count_by_user
+        Index("ix_photos_user_id_created_at", "user_id", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
 
@@ -20,6 +28,11 @@ class Photo(Base, CreatedAtMixin, UpdatedAtMixin):
     cloudinary_public_id: Mapped[str] = mapped_column(nullable=True)
     description: Mapped[str | None] = mapped_column(nullable=True)
 
+    # денормалізовані агрегати рейтингу, оновлюються в RatingService
+    rating_sum: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default=text("0"))
+    rating_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default=text("0"))
+    avg_rating: Mapped[float] = mapped_column(Float, nullable=False, default=0.0, server_default=text("0"))
+
     # one-to-many
     ratings: Mapped[list["Rating"]] = relationship(
         "Rating",
@@ -52,4 +65,38 @@ class Photo(Base, CreatedAtMixin, UpdatedAtMixin):
         cascade="all, delete-orphan",
         passive_deletes=True,
     )
-    tags: List["Tag"] = association_proxy("photo_tags", "tag")
\ No newline at end of file
+    tags: List["Tag"] = association_proxy("photo_tags", "tag")
+
+
+# --- Full-text search по description -----------------------------------------
+# Postgres: generated tsvector-колонка + GIN індекс (те саме, що в міграції).
+# SQLite (тести/локально): external-content FTS5 таблиця, синхронізується тригерами.
+# В ORM колонку не мапимо — SQLite її не підтримує; запити див. PhotoRepository.
+
+_PG_FTS_DDL = (
+    "ALTER TABLE photos ADD COLUMN search_vector tsvector "
+    "GENERATED ALWAYS AS (to_tsvector('simple', coalesce(description, ''))) STORED",
+    "CREATE INDEX ix_photos_search_vector ON photos USING gin (search_vector)",
+)
+
+_SQLITE_FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS photos_fts "
+    "USING fts5(description, content='photos', content_rowid='id')",
+    "CREATE TRIGGER photos_fts_ai AFTER INSERT ON photos BEGIN "
+    "INSERT INTO photos_fts(rowid, description) VALUES (new.id, new.description); END",
+    "CREATE TRIGGER photos_fts_ad AFTER DELETE ON photos BEGIN "
+    "INSERT INTO photos_fts(photos_fts, rowid, description) VALUES ('delete', old.id, old.description); END",
+    "CREATE TRIGGER photos_fts_au AFTER UPDATE OF description ON photos BEGIN "
+    "INSERT INTO photos_fts(photos_fts, rowid, description) VALUES ('delete', old.id, old.description); "
+    "INSERT INTO photos_fts(rowid, description) VALUES (new.id, new.description); END",
+)
+
+for _stmt in _PG_FTS_DDL:
+    event.listen(Photo.__table__, "after_create", DDL(_stmt).execute_if(dialect="postgresql"))
+for _stmt in _SQLITE_FTS_DDL:
+    event.listen(Photo.__table__, "after_create", DDL(_stmt).execute_if(dialect="sqlite"))
+event.listen(
+    Photo.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS photos_fts").execute_if(dialect="sqlite"),
+)
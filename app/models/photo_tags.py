@@ -1,5 +1,5 @@
 from __future__ import annotations
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
@@ -7,6 +7,10 @@ from app.models.base import Base
 
 class PhotoTag(Base):
     __tablename__ = "photo_tags"
+    # PK (photo_id, tag_id) не допомагає пошуку за тегом (tag_id -> photo_id)
+    __table_args__ = (
+        Index("ix_photo_tags_tag_id_photo_id", "tag_id", "photo_id"),
+    )
 
     photo_id: Mapped[int] = mapped_column(
         ForeignKey("photos.id", ondelete="CASCADE"),
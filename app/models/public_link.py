@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from sqlalchemy import ForeignKey, String
+from sqlalchemy import ForeignKey, Index, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.models.base import Base
 from app.models.mixins import CreatedAtMixin
@@ -8,6 +8,10 @@ from app.models.mixins import CreatedAtMixin
 
 class PublicLink(Base, CreatedAtMixin):
     __tablename__ = "public_links"
+    # посилання фото (статистика для власника): JOIN transformed_images -> public_links
+    __table_args__ = (
+        Index("ix_public_links_transformed_image_id", "transformed_image_id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
 
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Integer, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class PublicLinkStats(Base):
+    """
+    Hit counters of a public link. Окрема таблиця: рядок public_links читає resolver,
+    а лічильники оновлюються пачками раз на інтервал (див. app/service/link_hits.py).
+    """
+    __tablename__ = "public_link_stats"
+
+    public_link_id: Mapped[int] = mapped_column(
+        ForeignKey("public_links.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    views: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default=text("0"))
+    qr_views: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default=text("0"))
+    last_hit_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
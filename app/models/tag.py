@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from sqlalchemy import String
+from sqlalchemy import Index, Integer, String, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.ext.associationproxy import association_proxy
 from app.models.photo_tags import PhotoTag
@@ -9,6 +9,10 @@ from app.models.base import Base
 
 class Tag(Base):
     __tablename__ = "tags"
+    __table_args__ = (
+        # tag cloud: ORDER BY usage_count DESC, name без GROUP BY по photo_tags
+        Index("ix_tags_usage_count_name", "usage_count", "name"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
 
@@ -18,6 +22,9 @@ class Tag(Base):
         nullable=False
     )
 
+    # денормалізована кількість фото з цим тегом, оновлюється в TagRepository
+    usage_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default=text("0"))
+
     # many-to-many
     photo_tags: Mapped[list[PhotoTag]] = relationship(
         "PhotoTag",
@@ -12,5 +12,6 @@ class TokenBlacklist(Base):
     id: Mapped[int] = mapped_column(primary_key=True)
     jti: Mapped[str] = mapped_column(String(64), unique=True, index=True, nullable=False)
     user_id: Mapped[int] = mapped_column(nullable=False)  # FK optional (можна додати)
-    expires_at: Mapped[object] = mapped_column(DateTime(timezone=True), nullable=False)
+    # index: sweeper видаляє прострочені пачками по expires_at
+    expires_at: Mapped[object] = mapped_column(DateTime(timezone=True), index=True, nullable=False)
     created_at: Mapped[object] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
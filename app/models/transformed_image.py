@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from sqlalchemy import ForeignKey, String, Text
+from sqlalchemy import ForeignKey, Index, String, Text, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.models.base import Base
 from app.models.mixins import CreatedAtMixin
@@ -8,6 +8,12 @@ from app.models.mixins import CreatedAtMixin
 
 class TransformedImage(Base, CreatedAtMixin):
     __tablename__ = "transformed_images"
+    # одна трансформація на (фото, canonical params) — повторні share/preview її перевикористовують
+    __table_args__ = (
+        UniqueConstraint("photo_id", "params_hash", name="uq_transformed_images_photo_params"),
+        # list_for_photo: WHERE photo_id ORDER BY created_at DESC
+        Index("ix_transformed_images_photo_id_created_at", "photo_id", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
 
@@ -17,6 +23,8 @@ class TransformedImage(Base, CreatedAtMixin):
     )
 
     transformation: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # sha256 від canonical JSON transformation
+    params_hash: Mapped[str] = mapped_column(String(64), nullable=False)
     image_url: Mapped[str] = mapped_column(String(500), nullable=False)
 
     # Відносини
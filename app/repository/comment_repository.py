@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import contains_eager, selectinload
 
 from app.models import User
 from app.models.comment import Comment
@@ -21,7 +21,7 @@ class CommentRepository(BaseRepository):
                 Comment.photo_id == photo_id,
                 User.is_active.is_(True),  # фільтр бану
             )
-            .options(selectinload(Comment.user))  # підвантажили автора
+            .options(contains_eager(Comment.user))  # автор з того ж JOIN, без окремого запиту
             .order_by(Comment.created_at.desc())
             .limit(limit)
             .offset(offset)
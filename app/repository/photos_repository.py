@@ -1,13 +1,73 @@
 from __future__ import annotations
 
 from datetime import datetime
-from sqlalchemy import select, update, delete, func, and_
-from app.models import PhotoTag, Tag, Rating
+from sqlalchemy import select, update, delete, func, and_, or_, case, column, literal_column, table, text
+from sqlalchemy.orm import joinedload
+
+from app.core.pagination import PhotoCursor
+from app.models import PhotoTag, Tag
 from app.models.photo import Photo
 from app.repository.base_repository import BaseRepository
 
 
+def _after_created(after: PhotoCursor, *, ascending: bool = False):
+    # (created_at, id) < (c, i) для desc, > для asc
+    if ascending:
+        return or_(
+            Photo.created_at > after.created_at,
+            and_(Photo.created_at == after.created_at, Photo.id > after.id),
+        )
+    return or_(
+        Photo.created_at < after.created_at,
+        and_(Photo.created_at == after.created_at, Photo.id < after.id),
+    )
+
+
+def _after_rating(after: PhotoCursor, *, ascending: bool):
+    # avg_rating у напрямку sort, далі (created_at, id) завжди desc
+    avg_rating = Photo.avg_rating
+    beyond = avg_rating > after.avg_rating if ascending else avg_rating < after.avg_rating
+    return or_(beyond, and_(avg_rating == after.avg_rating, _after_created(after)))
+
+
+# вище цього — total для пошуку без фільтрів береться з оцінки планувальника
+APPROX_COUNT_THRESHOLD = 100_000
+
+# FTS5 external-content таблиця (створюється DDL-подіями в app/models/photo.py)
+_photos_fts = table("photos_fts", column("rowid"), column("description"), column("rank"))
+
+
+def _fts5_query(q: str) -> str:
+    # кожне слово як фраза в лапках: користувацький ввід не ламає синтаксис FTS5;
+    # * — пошук за префіксом, як колись ILIKE: "sun" знаходить "sunset"
+    return " ".join('"' + token.replace('"', '""') + '"*' for token in q.split())
+
+
+def _tsquery_text(q: str) -> str:
+    # те саме для Postgres to_tsquery: 'слово':* через &, лапки/backslash екрановані
+    return " & ".join(
+        "'" + token.replace("\\", "\\\\").replace("'", "''") + "':*" for token in q.split()
+    )
+
+
 class PhotoRepository(BaseRepository):
+    def _apply_fulltext(self, stmt, q: str):
+        """
+        Adds full-text match on description. Returns (stmt, order-by clause for relevance).
+        Postgres: tsvector + GIN; SQLite: FTS5.
+        """
+        if self.session.get_bind().dialect.name == "sqlite":
+            stmt = (stmt
+                    .join(_photos_fts, _photos_fts.c.rowid == Photo.id)
+                    .where(_photos_fts.c.description.op("MATCH")(_fts5_query(q))))
+            # bm25: менше — краще
+            return stmt, _photos_fts.c.rank.asc()
+
+        search_vector = literal_column("photos.search_vector")
+        ts_query = func.to_tsquery("simple", _tsquery_text(q))
+        stmt = stmt.where(search_vector.op("@@")(ts_query))
+        return stmt, func.ts_rank(search_vector, ts_query).desc()
+
     async def add(self, photo: Photo) -> Photo:
         self.session.add(photo)
         return photo
@@ -15,16 +75,41 @@ class PhotoRepository(BaseRepository):
     async def get_by_id(self, photo_id: int) -> Photo | None:
         return await self.session.get(Photo, photo_id)
 
+    async def get_with_tags(self, photo_id: int) -> Photo | None:
+        """
+        Photo + its tags in one query (LEFT JOIN photo_tags/tags).
+        populate_existing: фото могло вже бути в identity map без завантажених тегів.
+        """
+        res = await self.session.execute(
+            select(Photo)
+            .where(Photo.id == photo_id)
+            .options(joinedload(Photo.photo_tags).joinedload(PhotoTag.tag))
+            .execution_options(populate_existing=True)
+        )
+        return res.unique().scalar_one_or_none()
+
     async def get_by_unique_url(self, unique_url: str) -> Photo | None:
         res = await self.session.execute(
             select(Photo).where(Photo.photo_unique_url == unique_url)
         )
         return res.scalar_one_or_none()
 
-    async def list_by_user(self, user_id: int, limit: int = 50, offset: int = 0) -> list[Photo]:
-        stmt = (select(Photo)
-                .where(Photo.user_id == user_id)
-                .order_by(Photo.created_at.desc())
+    async def list_by_user(
+            self,
+            user_id: int,
+            limit: int = 50,
+            offset: int = 0,
+            *,
+            after: PhotoCursor | None = None,
+    ) -> list[Photo]:
+        stmt = select(Photo).where(Photo.user_id == user_id)
+        if after is not None:
+            # keyset: offset ігноруємо
+            stmt = stmt.where(_after_created(after))
+            offset = 0
+
+        stmt = (stmt
+                .order_by(Photo.created_at.desc(), Photo.id.desc())
                 .limit(limit).offset(offset))
 
         res = await self.session.execute(stmt)
@@ -51,26 +136,24 @@ class PhotoRepository(BaseRepository):
         )
         return res.scalar_one_or_none() is not None
 
-    async def search(
+    def _apply_search_filters(
             self,
+            stmt,
             *,
             q: str | None = None,
             tag: str | None = None,
             min_rating: float | None = None,
             date_from: datetime | None = None,
             date_to: datetime | None = None,
-            sort: str = "newest",
-            limit: int = 50,
-            offset: int = 0,
-    ) -> list[Photo]:
+    ):
         """
-        Search photos by:
-        - keyword in description (ILIKE)
-        - tag name
-        - min avg rating
-        - created_at range
+        Single place where search filters are built: used by search(),
+        search_with_total() and count_search(), so they can't drift apart.
+        Returns (stmt, relevance order-by clause or None).
         """
-        stmt = select(Photo)
+        relevance = None
+        if q and q.strip():
+            stmt, relevance = self._apply_fulltext(stmt, q.strip())
 
         # join tags if needed
         if tag:
@@ -79,17 +162,12 @@ class PhotoRepository(BaseRepository):
                 .join(Tag, Tag.id == PhotoTag.tag_id)
             )
 
-        # ratings join for avg
-        if min_rating is not None or sort in {"top", "low"}:
-            stmt = stmt.outerjoin(Rating, Rating.photo_id == Photo.id)
-
         conditions = []
-        if q:
-            like = f"%{q.strip()}%"
-            conditions.append(Photo.description.ilike(like))
         if tag:
             norm_tag = tag.strip().lower()
             conditions.append(Tag.name == norm_tag)
+        if min_rating is not None:
+            conditions.append(Photo.avg_rating >= float(min_rating))
         if date_from:
             conditions.append(Photo.created_at >= date_from)
         if date_to:
@@ -97,37 +175,72 @@ class PhotoRepository(BaseRepository):
 
         if conditions:
             stmt = stmt.where(and_(*conditions))
+        return stmt, relevance
+
+    def _search_stmt(
+            self,
+            stmt,
+            *,
+            sort: str,
+            limit: int,
+            offset: int,
+            after: PhotoCursor | None,
+            filters: dict,
+    ):
+        stmt, relevance = self._apply_search_filters(stmt, **filters)
 
-        # group/having for avg rating filter
-        if min_rating is not None or sort in {"top", "low"}:
-            avg_rating = func.coalesce(func.avg(Rating.value), 0.0)
-            stmt = stmt.group_by(Photo.id)
-            if min_rating is not None:
-                stmt = stmt.having(avg_rating >= float(min_rating))
-
-            # sorting by avg
-            if sort == "top":
-                stmt = stmt.order_by(avg_rating.desc(), Photo.created_at.desc())
-            elif sort == "low":
-                stmt = stmt.order_by(avg_rating.asc(), Photo.created_at.desc())
-            elif sort == "oldest":
-                stmt = stmt.order_by(Photo.created_at.asc())
+        if after is not None:
+            if sort in {"top", "low"}:
+                stmt = stmt.where(_after_rating(after, ascending=(sort == "low")))
             else:
-                stmt = stmt.order_by(Photo.created_at.desc())
+                stmt = stmt.where(_after_created(after, ascending=(sort == "oldest")))
+            offset = 0
+
+        # avg_rating денормалізований у photos — сортування по індексу, без GROUP BY
+        if sort == "relevance" and relevance is not None:
+            stmt = stmt.order_by(relevance, Photo.created_at.desc(), Photo.id.desc())
+        elif sort == "top":
+            stmt = stmt.order_by(Photo.avg_rating.desc(), Photo.created_at.desc(), Photo.id.desc())
+        elif sort == "low":
+            stmt = stmt.order_by(Photo.avg_rating.asc(), Photo.created_at.desc(), Photo.id.desc())
+        elif sort == "oldest":
+            stmt = stmt.order_by(Photo.created_at.asc(), Photo.id.asc())
         else:
-            # no ratings join
-            if sort == "oldest":
-                stmt = stmt.order_by(Photo.created_at.asc())
-            else:
-                stmt = stmt.order_by(Photo.created_at.desc())
+            stmt = stmt.order_by(Photo.created_at.desc(), Photo.id.desc())
+
+        return stmt.limit(limit).offset(offset)
 
-        # important: distinct to avoid duplicates when joining tags
-        stmt = stmt.order_by(Photo.created_at.desc()).limit(limit).offset(offset)
+    async def search(
+            self,
+            *,
+            q: str | None = None,
+            tag: str | None = None,
+            min_rating: float | None = None,
+            date_from: datetime | None = None,
+            date_to: datetime | None = None,
+            sort: str = "newest",
+            limit: int = 50,
+            offset: int = 0,
+            after: PhotoCursor | None = None,
+    ) -> list[Photo]:
+        """
+        Search photos by:
+        - keywords in description (full-text)
+        - tag name
+        - min avg rating
+        - created_at range
 
+        sort: newest | oldest | top | low | relevance (relevance має сенс тільки з q).
+        If `after` is given, uses keyset pagination (offset is ignored).
+        """
+        filters = dict(q=q, tag=tag, min_rating=min_rating, date_from=date_from, date_to=date_to)
+        stmt = self._search_stmt(
+            select(Photo), sort=sort, limit=limit, offset=offset, after=after, filters=filters,
+        )
         res = await self.session.execute(stmt)
         return list(res.scalars().unique().all())
 
-    async def count_search(
+    async def search_with_total(
             self,
             *,
             q: str | None = None,
@@ -135,59 +248,96 @@ class PhotoRepository(BaseRepository):
             min_rating: float | None = None,
             date_from: datetime | None = None,
             date_to: datetime | None = None,
-    ) -> int:
+            sort: str = "newest",
+            limit: int = 50,
+            offset: int = 0,
+            after: PhotoCursor | None = None,
+    ) -> tuple[list[Photo], int | None]:
         """
-        Total count for search() with same filters.
+        Page + total in one round-trip via count(*) OVER ().
+
+        - unfiltered search over a big table: total = pg_class.reltuples estimate
+          (>= APPROX_COUNT_THRESHOLD), без підрахунку взагалі;
+        - keyset page (after): total = None — вікно рахувало б тільки "залишок",
+          а клієнт вже має total з першої сторінки.
         """
-        stmt = select(func.count(func.distinct(Photo.id))).select_from(Photo)
+        filters = dict(q=q, tag=tag, min_rating=min_rating, date_from=date_from, date_to=date_to)
+        page = dict(sort=sort, limit=limit, offset=offset, after=after, filters=filters)
 
-        if tag:
-            stmt = (
-                stmt.join(PhotoTag, PhotoTag.photo_id == Photo.id)
-                .join(Tag, Tag.id == PhotoTag.tag_id)
-            )
+        if after is not None:
+            res = await self.session.execute(self._search_stmt(select(Photo), **page))
+            return list(res.scalars().unique().all()), None
 
-        if min_rating is not None:
-            stmt = stmt.outerjoin(Rating, Rating.photo_id == Photo.id)
+        if not any((q and q.strip(), tag, min_rating is not None, date_from, date_to)):
+            estimate = await self._estimated_total()
+            if estimate is not None and estimate >= APPROX_COUNT_THRESHOLD:
+                res = await self.session.execute(self._search_stmt(select(Photo), **page))
+                return list(res.scalars().unique().all()), estimate
 
-        conditions = []
-        if q:
-            like = f"%{q.strip()}%"
-            conditions.append(Photo.description.ilike(like))
-        if tag:
-            norm_tag = tag.strip().lower()
-            conditions.append(Tag.name == norm_tag)
-        if date_from:
-            conditions.append(Photo.created_at >= date_from)
-        if date_to:
-            conditions.append(Photo.created_at <= date_to)
+        stmt = self._search_stmt(
+            select(Photo, func.count().over().label("total")), **page,
+        )
+        rows = (await self.session.execute(stmt)).all()
+        if rows:
+            return [row[0] for row in rows], int(rows[0][1])
+        if offset == 0:
+            return [], 0
+        # сторінка за межами результату — вікно не повернуло жодного рядка
+        return [], await self.count_search(**filters)
 
-        if conditions:
-            stmt = stmt.where(and_(*conditions))
+    async def _estimated_total(self) -> int | None:
+        """
+        Planner's row estimate for photos (Postgres only, O(1)).
+        """
+        if self.session.get_bind().dialect.name != "postgresql":
+            return None
+        res = await self.session.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'photos'::regclass")
+        )
+        estimate = res.scalar_one_or_none()
+        # -1: таблицю ще не аналізували
+        if estimate is None or estimate < 0:
+            return None
+        return int(estimate)
 
-        if min_rating is not None:
-            # для having/group_by робимо надійний підзапит по photo.id
-            avg_rating = func.coalesce(func.avg(Rating.value), 0.0)
+    async def count_search(
+            self,
+            *,
+            q: str | None = None,
+            tag: str | None = None,
+            min_rating: float | None = None,
+            date_from: datetime | None = None,
+            date_to: datetime | None = None,
+    ) -> int:
+        """
+        Total count for search() with same filters.
+        """
+        stmt, _ = self._apply_search_filters(
+            select(func.count(func.distinct(Photo.id))).select_from(Photo),
+            q=q, tag=tag, min_rating=min_rating, date_from=date_from, date_to=date_to,
+        )
+        res = await self.session.execute(stmt)
+        return int(res.scalar_one())
 
-            base = (
-                select(Photo.id)
-                .select_from(Photo)
-            )
-            if tag:
-                base = (
-                    base.join(PhotoTag, PhotoTag.photo_id == Photo.id)
-                    .join(Tag, Tag.id == PhotoTag.tag_id)
+    async def apply_rating_delta(self, photo_id: int, *, value_delta: int, count_delta: int) -> Photo | None:
+        """
+        Atomically shifts denormalized rating aggregates on photos.
+        Runs in the caller's transaction, together with the ratings write.
+        """
+        new_sum = Photo.rating_sum + value_delta
+        new_count = Photo.rating_count + count_delta
+        stmt = (update(Photo)
+                .where(Photo.id == photo_id)
+                .values(
+                    rating_sum=new_sum,
+                    rating_count=new_count,
+                    avg_rating=case(
+                        (new_count > 0, new_sum * 1.0 / new_count),
+                        else_=0.0,
+                    ),
                 )
-            base = base.outerjoin(Rating, Rating.photo_id == Photo.id)
-
-            if conditions:
-                base = base.where(and_(*conditions))
-
-            base = base.group_by(Photo.id).having(avg_rating >= float(min_rating))
-
-            subq = base.subquery()
-            res = await self.session.execute(select(func.count()).select_from(subq))
-            return int(res.scalar_one())
-
+                .returning(Photo)
+                # оновлює вже завантажений у сесії Photo замість expire (lazy load в async не можна)
+                .execution_options(synchronize_session=False, populate_existing=True))
         res = await self.session.execute(stmt)
-        return int(res.scalar_one())
\ No newline at end of file
+        return res.scalar_one_or_none()
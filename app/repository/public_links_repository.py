@@ -1,10 +1,23 @@
 from __future__ import annotations
 
-from sqlalchemy import select
+from datetime import datetime
+from typing import NamedTuple
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Row
+
 from app.models.public_link import PublicLink
+from app.models.public_link_stats import PublicLinkStats
+from app.models.transformed_image import TransformedImage
 from app.repository.base_repository import BaseRepository
 
 
+class PublicLinkTarget(NamedTuple):
+    url: str
+    photo_id: int
+
+
 class PublicLinkRepository(BaseRepository):
     async def add(self, link: PublicLink) -> PublicLink:
         self.session.add(link)
@@ -15,4 +28,68 @@ class PublicLinkRepository(BaseRepository):
         res = await self.session.execute(
             select(PublicLink).where(PublicLink.uuid == uuid)
         )
-        return res.scalar_one_or_none()
\ No newline at end of file
+        return res.scalar_one_or_none()
+
+    async def get_target(self, uuid: str) -> PublicLinkTarget | None:
+        """
+        One query: uuid -> URL of the transformed image (без завантаження ORM-об'єктів).
+        """
+        res = await self.session.execute(
+            select(TransformedImage.image_url, TransformedImage.photo_id)
+            .join(PublicLink, PublicLink.transformed_image_id == TransformedImage.id)
+            .where(PublicLink.uuid == uuid)
+        )
+        row = res.first()
+        return PublicLinkTarget(row.image_url, row.photo_id) if row else None
+
+    def _insert(self):
+        return postgresql.insert if self.session.get_bind().dialect.name == "postgresql" else sqlite.insert
+
+    async def add_hits(self, hits: dict[str, tuple[int, int]], at: datetime) -> int:
+        """
+        uuid -> (views, qr_views), додається до public_link_stats одним upsert-ом.
+        Видалені за цей час посилання пропускаються. Returns number of links updated.
+        """
+        res = await self.session.execute(
+            select(PublicLink.uuid, PublicLink.id).where(PublicLink.uuid.in_(list(hits)))
+        )
+        ids = dict(res.all())
+        rows = [
+            {"public_link_id": ids[uuid], "views": views, "qr_views": qr_views, "last_hit_at": at}
+            for uuid, (views, qr_views) in hits.items()
+            if uuid in ids
+        ]
+        if not rows:
+            return 0
+
+        stmt = self._insert()(PublicLinkStats).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[PublicLinkStats.public_link_id],
+            set_={
+                "views": PublicLinkStats.views + stmt.excluded.views,
+                "qr_views": PublicLinkStats.qr_views + stmt.excluded.qr_views,
+                "last_hit_at": stmt.excluded.last_hit_at,
+            },
+        )
+        await self.session.execute(stmt)
+        return len(rows)
+
+    async def list_stats_for_photo(self, photo_id: int) -> list[Row]:
+        """
+        Share links of photo_id, newest first, з лічильниками (0 — переглядів ще не було).
+        """
+        res = await self.session.execute(
+            select(
+                PublicLink.uuid,
+                PublicLink.created_at,
+                TransformedImage.transformation,
+                func.coalesce(PublicLinkStats.views, 0).label("views"),
+                func.coalesce(PublicLinkStats.qr_views, 0).label("qr_views"),
+                PublicLinkStats.last_hit_at,
+            )
+            .join(TransformedImage, PublicLink.transformed_image_id == TransformedImage.id)
+            .outerjoin(PublicLinkStats, PublicLinkStats.public_link_id == PublicLink.id)
+            .where(TransformedImage.photo_id == photo_id)
+            .order_by(PublicLink.created_at.desc(), PublicLink.id.desc())
+        )
+        return list(res.all())
@@ -1,6 +1,10 @@
 from __future__ import annotations
 
-from sqlalchemy import select, delete, func
+from collections import Counter
+from typing import Mapping
+
+from sqlalchemy import case, delete, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
 from app.models.tag import Tag
 from app.models.photo_tags import PhotoTag
 from app.repository.base_repository import BaseRepository
@@ -11,6 +15,20 @@ def _normalize_tag(name: str) -> str:
     return name.strip().lower()
 
 
+def _normalize_tags(names: list[str]) -> list[str]:
+    norm = [_normalize_tag(n) for n in names if n and n.strip()]
+    return list(dict.fromkeys(norm))  # unique preserve order
+
+
+def _chunks(items: list, size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+# межа на кількість bind-параметрів у одному statement (asyncpg — 32767)
+_CHUNK_SIZE = 1000
+
+
 class TagRepository(BaseRepository):
     async def list_all(self, limit: int = 100, offset: int = 0) -> list[Tag]:
         res = await self.session.execute(
@@ -22,62 +40,120 @@ class TagRepository(BaseRepository):
         return await self.session.get(Tag, tag_id)
 
     async def get_by_names(self, names: list[str]) -> list[Tag]:
-        norm = [_normalize_tag(n) for n in names if n and n.strip()]
-        norm = list(dict.fromkeys(norm))  # unique preserve order
+        norm = _normalize_tags(names)
         if not norm:
             return []
 
         res = await self.session.execute(select(Tag).where(Tag.name.in_(norm)))
         return list(res.scalars().unique().all())
 
+    def _insert(self):
+        return postgresql.insert if self.session.get_bind().dialect.name == "postgresql" else sqlite.insert
+
+    async def ensure_tag_ids(self, names: list[str]) -> dict[str, int]:
+        """
+        normalized name -> tag id, creating missing tags.
+        SELECT існуючих, потім INSERT ... ON CONFLICT DO NOTHING RETURNING лише для відсутніх;
+        тег, створений паралельним запитом між ними, дочитується ще одним SELECT.
+        """
+        norm = _normalize_tags(names)
+        ids: dict[str, int] = {}
+        for chunk in _chunks(norm, _CHUNK_SIZE):
+            res = await self.session.execute(select(Tag.name, Tag.id).where(Tag.name.in_(chunk)))
+            ids.update(res.tuples().all())
+
+            missing = [n for n in chunk if n not in ids]
+            if not missing:
+                continue
+            res = await self.session.execute(
+                self._insert()(Tag)
+                .values([{"name": n, "usage_count": 0} for n in missing])
+                .on_conflict_do_nothing(index_elements=["name"])
+                .returning(Tag.name, Tag.id)
+            )
+            ids.update(res.tuples().all())
+
+            raced = [n for n in missing if n not in ids]
+            if raced:
+                res = await self.session.execute(select(Tag.name, Tag.id).where(Tag.name.in_(raced)))
+                ids.update(res.tuples().all())
+        return ids
+
     async def get_or_create_by_names(self, names: list[str]) -> list[Tag]:
         """
         Returns Tag objects for provided names. Creates missing tags.
         Does NOT create links to photos.
         """
-        norm = [_normalize_tag(n) for n in names if n and n.strip()]
-        norm = list(dict.fromkeys(norm))
-        if not norm:
+        ids = await self.ensure_tag_ids(names)
+        if not ids:
             return []
-
-        existing = await self.get_by_names(norm)
-        existing_map = {t.name: t for t in existing}
-
-        missing = [n for n in norm if n not in existing_map]
-        for name in missing:
-            tag = Tag(name=name)
-            self.session.add(tag)
-
-        if missing:
-            await self.session.flush()  # so new tags get ids
-            # re-read all to have consistent objects
-            res = await self.session.execute(select(Tag).where(Tag.name.in_(norm)))
-            return list(res.scalars().all())
-
-        return existing
+        res = await self.session.execute(select(Tag).where(Tag.id.in_(ids.values())))
+        return list(res.scalars().all())
 
     async def set_tags_for_photo(self, photo_id: int, tag_names: list[str], *, max_tags: int = 5) -> list[str]:
         """
         Overwrites tags for the given photo (set semantics).
         Returns normalized tag names actually attached.
         """
-        norm = [_normalize_tag(n) for n in tag_names if n and n.strip()]
-        norm = list(dict.fromkeys(norm))[:max_tags]
-
-        # clear old links
-        await self.session.execute(delete(PhotoTag).where(PhotoTag.photo_id == photo_id))
-
-        if not norm:
-            return []
-
-        tags = await self.get_or_create_by_names(norm)
-
-        # attach
-        for tag in tags:
-            self.session.add(PhotoTag(photo_id=photo_id, tag_id=tag.id))
+        result = await self.set_tags_for_photos({photo_id: tag_names}, max_tags=max_tags)
+        return result[photo_id]
+
+    async def set_tags_for_photos(
+        self,
+        tags_by_photo: Mapping[int, list[str]],
+        *,
+        max_tags: int = 5,
+    ) -> dict[int, list[str]]:
+        """
+        Bulk variant (set semantics per photo): кількість statements не залежить від кількості фото
+        в межах _CHUNK_SIZE. Лінки оновлюються по різниці — видаляються лише зайві
+        (DELETE ... RETURNING), вставляються лише нові (INSERT ... ON CONFLICT DO NOTHING RETURNING);
+        по поверненим tag_id одним UPDATE коригується Tag.usage_count.
+        """
+        wanted = {pid: _normalize_tags(names)[:max_tags] for pid, names in tags_by_photo.items()}
+        tag_ids = await self.ensure_tag_ids([n for names in wanted.values() for n in names])
+
+        delta: Counter[int] = Counter()
+        for chunk in _chunks(list(wanted), _CHUNK_SIZE):
+            pairs = [(pid, tag_ids[name]) for pid in chunk for name in wanted[pid]]
+
+            stmt = delete(PhotoTag).where(PhotoTag.photo_id.in_(chunk))
+            if pairs:
+                stmt = stmt.where(tuple_(PhotoTag.photo_id, PhotoTag.tag_id).not_in(pairs))
+            res = await self.session.execute(stmt.returning(PhotoTag.tag_id))
+            delta.subtract(res.scalars().all())
+
+            if pairs:
+                res = await self.session.execute(
+                    self._insert()(PhotoTag)
+                    .values([{"photo_id": pid, "tag_id": tid} for pid, tid in pairs])
+                    .on_conflict_do_nothing(index_elements=["photo_id", "tag_id"])
+                    .returning(PhotoTag.tag_id)
+                )
+                delta.update(res.scalars().all())
+
+        await self._apply_usage_delta(delta)
+        return wanted
+
+    async def release_tags_of_photo(self, photo_id: int) -> None:
+        """
+        Call before deleting a photo: photo_tags підуть по ON DELETE CASCADE, а лічильники — ні.
+        """
+        await self.session.execute(
+            update(Tag)
+            .where(Tag.id.in_(select(PhotoTag.tag_id).where(PhotoTag.photo_id == photo_id)))
+            .values(usage_count=Tag.usage_count - 1)
+        )
 
-        await self.session.flush()
-        return [t.name for t in tags]
+    async def _apply_usage_delta(self, delta: Counter[int]) -> None:
+        changed = {tag_id: d for tag_id, d in delta.items() if d}
+        if not changed:
+            return
+        await self.session.execute(
+            update(Tag)
+            .where(Tag.id.in_(changed))
+            .values(usage_count=Tag.usage_count + case(changed, value=Tag.id, else_=0))
+        )
 
     async def list_tag_names_for_photo(self, photo_id: int) -> list[str]:
         res = await self.session.execute(
@@ -88,18 +164,34 @@ class TagRepository(BaseRepository):
         )
         return [row[0] for row in res.all()]
 
+    async def list_tag_names_for_photos(self, photo_ids: list[int]) -> dict[int, list[str]]:
+        """
+        Batch variant of list_tag_names_for_photo: один IN (...) запит на всю сторінку.
+        """
+        result: dict[int, list[str]] = {pid: [] for pid in photo_ids}
+        if not photo_ids:
+            return result
+
+        res = await self.session.execute(
+            select(PhotoTag.photo_id, Tag.name)
+            .join(Tag, Tag.id == PhotoTag.tag_id)
+            .where(PhotoTag.photo_id.in_(photo_ids))
+            .order_by(PhotoTag.photo_id, Tag.name.asc())
+        )
+        for photo_id, name in res.all():
+            result[photo_id].append(name)
+        return result
+
     async def list_cloud(self, *, limit: int = 50, offset: int = 0) -> list[tuple[str, int]]:
         """
         Returns list of (tag_name, photo_count), sorted by photo_count desc then name asc.
         Includes only tags that are attached to at least one photo.
+        Читає денормалізований usage_count (індекс ix_tags_usage_count_name), без GROUP BY.
         """
-        stmt = (select(Tag.name,func.count(PhotoTag.photo_id)
-                     .label("cnt"),)
-                .select_from(Tag)
-                .join(PhotoTag, PhotoTag.tag_id == Tag.id)
-                .group_by(Tag.id, Tag.name)
-                .order_by(func.count(PhotoTag.photo_id).desc(), Tag.name.asc())
+        stmt = (select(Tag.name, Tag.usage_count)
+                .where(Tag.usage_count > 0)
+                .order_by(Tag.usage_count.desc(), Tag.name.asc())
                 .limit(limit)
                 .offset(offset))
         res = await self.session.execute(stmt)
-        return [(row[0], int(row[1])) for row in res.all()]
\ No newline at end of file
+        return [(row[0], int(row[1])) for row in res.all()]
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from sqlalchemy import select
+from datetime import datetime
+
+from sqlalchemy import delete, func, select
 
 from app.models.token_blacklist import TokenBlacklist
 from app.repository.base_repository import BaseRepository
@@ -15,4 +17,28 @@ class TokenBlacklistRepository(BaseRepository):
 
     async def is_revoked(self, jti: str) -> bool:
         res = await self.session.execute(select(TokenBlacklist.id).where(TokenBlacklist.jti == jti))
-        return bool(res.scalar_one_or_none())
\ No newline at end of file
+        return bool(res.scalar_one_or_none())
+
+    async def list_active_jtis(self, now: datetime) -> list[str]:
+        res = await self.session.execute(select(TokenBlacklist.jti).where(TokenBlacklist.expires_at > now))
+        return list(res.scalars().all())
+
+    async def delete_expired(self, now: datetime, *, limit: int) -> int:
+        """
+        Deletes up to limit expired rows (oldest first) — коротка транзакція, без довгих блокувань.
+        """
+        batch = (
+            select(TokenBlacklist.id)
+            .where(TokenBlacklist.expires_at <= now)
+            .order_by(TokenBlacklist.expires_at)
+            .limit(limit)
+            .scalar_subquery()
+        )
+        res = await self.session.execute(
+            delete(TokenBlacklist).where(TokenBlacklist.id.in_(batch)).returning(TokenBlacklist.id)
+        )
+        return len(res.all())
+
+    async def count(self) -> int:
+        res = await self.session.execute(select(func.count()).select_from(TokenBlacklist))
+        return res.scalar_one()
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 from sqlalchemy import select, delete
+from sqlalchemy.dialects import postgresql, sqlite
+from app.core.exceptions import NotFoundError
 from app.models.transformed_image import TransformedImage
 from app.repository.base_repository import BaseRepository
 
@@ -17,15 +19,56 @@ class TransformedImageRepository(BaseRepository):
         *,
         photo_id: int,
         image_url: str,
+        params_hash: str,
         transformation: str | None = None,
     ) -> TransformedImage:
         obj = TransformedImage(
             photo_id=photo_id,
             image_url=image_url,
+            params_hash=params_hash,
             transformation=transformation,
         )
         return await self.add(obj)
 
+    async def get_by_params(self, photo_id: int, params_hash: str) -> TransformedImage | None:
+        res = await self.session.execute(
+            select(TransformedImage).where(
+                TransformedImage.photo_id == photo_id,
+                TransformedImage.params_hash == params_hash,
+            )
+        )
+        return res.scalar_one_or_none()
+
+    async def get_or_create(
+        self,
+        *,
+        photo_id: int,
+        params_hash: str,
+        image_url: str,
+        transformation: str | None = None,
+    ) -> TransformedImage:
+        """
+        INSERT ... ON CONFLICT (photo_id, params_hash) DO NOTHING, потім SELECT.
+        Безпечно при паралельних share однієї трансформації: рядок завжди один.
+        """
+        insert = postgresql.insert if self.session.get_bind().dialect.name == "postgresql" else sqlite.insert
+        stmt = (
+            insert(TransformedImage)
+            .values(
+                photo_id=photo_id,
+                params_hash=params_hash,
+                image_url=image_url,
+                transformation=transformation,
+            )
+            .on_conflict_do_nothing(index_elements=["photo_id", "params_hash"])
+        )
+        await self.session.execute(stmt)
+        obj = await self.get_by_params(photo_id, params_hash)
+        if obj is None:
+            # конфліктний рядок зник між INSERT і SELECT — лише разом з фото (CASCADE)
+            raise NotFoundError("Photo not found")
+        return obj
+
     async def get_by_id(self, transformed_image_id: int) -> TransformedImage | None:
         return await self.session.get(TransformedImage, transformed_image_id)
 
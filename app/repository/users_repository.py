@@ -9,6 +9,12 @@ class UserRepository(BaseRepository):
     async def get_by_id(self, user_id: int) -> User | None:
         return await self.session.get(User, user_id)
 
+    async def get_many(self, user_ids: list[int]) -> dict[int, User]:
+        if not user_ids:
+            return {}
+        res = await self.session.execute(select(User).where(User.id.in_(set(user_ids))))
+        return {u.id: u for u in res.scalars().all()}
+
     async def get_first_user_id(self) -> int | None:
         res = await self.session.execute(
             select(User.id).order_by(User.id.asc()).limit(1)
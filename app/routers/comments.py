@@ -3,7 +3,7 @@ from __future__ import annotations
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 
 from app.auth.dependencies import get_current_user
-from app.dependency.dependencies import comment_service as get_comment_service
+from app.dependency.dependencies import comment_service as get_comment_service, comment_read_service
 from app.schemas.comments_schema import CommentCreateSchema, CommentUpdateSchema, CommentReadSchema
 from app.service.comment_service import CommentService
 
@@ -16,7 +16,7 @@ async def list_comments_for_photo(
     photo_id: int,
     limit: int = Query(default=50, ge=1, le=200),
     offset: int = Query(default=0, ge=0),
-    svc: CommentService = Depends(get_comment_service),
+    svc: CommentService = Depends(comment_read_service),
 ):
     comments = await svc.list_for_photo(photo_id=photo_id, limit=limit, offset=offset)
     return [CommentReadSchema.model_validate(c, from_attributes=True) for c in comments]
@@ -5,7 +5,8 @@ from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
-from app.database.db import get_async_session as get_session  # якщо поки так
+from app.auth.sweeper import sweeper_stats
+from app.database.db import get_async_session as get_session, get_pool_stats  # якщо поки так
 
 router = APIRouter(tags=["Health"])
 
@@ -15,3 +16,15 @@ async def health(session: AsyncSession = Depends(get_session)):
     # DB check
     await session.execute(text("SELECT 1"))
     return {"status": "ok", "db": "ok"}
+
+
+@router.get("/health/token-blacklist", status_code=status.HTTP_200_OK)
+async def token_blacklist_stats():
+    # метрики sweeper-а цього процесу (table_rows — з останнього проходу)
+    return sweeper_stats.as_dict()
+
+
+@router.get("/health/db-pool", status_code=status.HTTP_200_OK)
+async def db_pool_stats():
+    # стан pool-у цього воркера: checked_out/overflow близько до ліміту = насичення
+    return get_pool_stats()
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import FileResponse
+
+from app.core.exceptions import ImageTransformError, NotFoundError
+from app.dependency.dependencies import transform_engine
+from app.service.image_transform import LocalTransformEngine
+from app.service.storage import sniff_file
+
+router = APIRouter(prefix="/media", tags=["Media"])
+
+
+@router.get("/{public_id:path}", include_in_schema=False)
+async def get_media(
+    public_id: str,
+    request: Request,
+    engine: LocalTransformEngine | None = Depends(transform_engine),
+):
+    # /media існує лише для local-бекенду; Cloudinary віддає файли зі свого CDN
+    if engine is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
+
+    # query string = transform params + sig (див. LocalStorageService.build_transformed_url).
+    # Довільні params не рендеримо: кожна нова комбінація — це CPU і файл у кеші
+    params = dict(request.query_params)
+    sig = params.pop("sig", None)
+    if params and not engine.storage.verify_transform(public_id, params, sig):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid transform signature")
+
+    try:
+        path = await engine.render(public_id, params)
+    except NotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except ImageTransformError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    media_type = await asyncio.to_thread(sniff_file, path)
+
+    # і оригінал, і рендер під цим URL ніколи не змінюються — можна кешувати назавжди.
+    # FileResponse сам віддає ETag/Last-Modified, Range і sendfile, якщо сервер його підтримує.
+    return FileResponse(
+        path,
+        media_type=media_type,
+        headers={"Cache-Control": "public, max-age=31536000, immutable"},
+    )
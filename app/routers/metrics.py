@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.auth.cache import user_cache
+from app.core.metrics import registry
+from app.database.db import get_pool_stats
+from app.mappers.photo_mapper import url_cache_stats
+from app.service.link_hits import link_hits
+from app.service.share_service import public_link_cache
+from app.service.tagging_service import tag_cloud_cache_stats
+
+router = APIRouter(tags=["Health"])
+
+# --- scrape-time metrics ------------------------------------------------------
+
+_db_pool = registry.gauge("photoshare_db_pool", "DB pool state of this worker (див. /health/db-pool).", ("stat",))
+_cache_hits = registry.counter("photoshare_cache_hits_total", "In-process cache hits.", ("cache",))
+_cache_misses = registry.counter("photoshare_cache_misses_total", "In-process cache misses.", ("cache",))
+_cache_hit_ratio = registry.gauge("photoshare_cache_hit_ratio", "hits / (hits + misses).", ("cache",))
+_cache_size = registry.gauge("photoshare_cache_size", "Entries currently cached.", ("cache",))
+_link_hits_pending = registry.gauge("photoshare_link_hits_pending", "Public links with hits not yet flushed to DB.")
+_link_hits_dropped = registry.counter(
+    "photoshare_link_hits_dropped_total", "Public link hits dropped because the buffer was full.",
+)
+
+_CACHES = {
+    "auth_user": user_cache.stats,
+    "photo_url": url_cache_stats,
+    "tag_cloud": tag_cloud_cache_stats,
+    "public_link": public_link_cache.stats,
+}
+
+
+def _collect_db_pool() -> None:
+    for stat, value in get_pool_stats().items():
+        # для не-Queue pool (sqlite у тестах) stats — рядок статусу, його пропускаємо
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            _db_pool.set((stat,), value)
+
+
+def _collect_caches() -> None:
+    for name, stats in _CACHES.items():
+        data = stats()
+        lookups = data["hits"] + data["misses"]
+        _cache_hits.set((name,), data["hits"])
+        _cache_misses.set((name,), data["misses"])
+        _cache_hit_ratio.set((name,), round(data["hits"] / lookups, 4) if lookups else 0.0)
+        _cache_size.set((name,), data["size"])
+
+
+def _collect_link_hits() -> None:
+    _link_hits_pending.set((), len(link_hits))
+    _link_hits_dropped.set((), link_hits.dropped)
+
+
+registry.add_collector(_collect_db_pool)
+registry.add_collector(_collect_caches)
+registry.add_collector(_collect_link_hits)
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
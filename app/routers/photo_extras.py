@@ -1,19 +1,25 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from fastapi.responses import RedirectResponse
 
 from app.auth.dependencies import get_current_user
 from app.dependency.dependencies import (
     tagging_service as get_tagging_service,
-    rating_service as get_rating_service,
-    share_service as get_share_service, photo_service, cloudinary_service,
+    rating_service as get_rating_service, rating_read_service,
+    share_service as get_share_service, photo_service,
 )
 from app.core.exceptions import NotFoundError, PermissionDeniedError
 from app.schemas.rating_schema import RatingResponse, RatingSetRequest
-from app.schemas.share_schema import ShareCreateRequest, ShareCreateResponse, TransformRequest
+from app.schemas.share_schema import (
+    ShareCreateRequest,
+    ShareCreateResponse,
+    ShareLinkStats,
+    ShareStatsResponse,
+    TransformRequest,
+)
 from app.schemas.tag_schema import PhotoTagsReadResponse, PhotoTagsSetRequest
-from app.service.cloudinary_service import build_transform_params, CloudinaryService
+from app.service.cloudinary_service import build_transform_params
 from app.service.photos_service import PhotoService
 
 from app.service.tagging_service import TaggingService
@@ -72,6 +78,24 @@ async def create_share_link(
         raise HTTPException(status_code=403, detail=str(exc)) from exc
 
 
+@router.get("/photos/{photo_id}/share/stats", response_model=ShareStatsResponse)
+async def get_share_stats(
+    photo_id: int,
+    current_user=Depends(get_current_user),
+    svc: ShareService = Depends(get_share_service),
+) -> ShareStatsResponse:
+    try:
+        rows = await svc.get_share_stats(photo_id=photo_id, current_user=current_user)
+        return ShareStatsResponse(
+            photo_id=photo_id,
+            links=[ShareLinkStats.model_validate(row) for row in rows],
+        )
+    except NotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    except PermissionDeniedError as exc:
+        raise HTTPException(status_code=403, detail=str(exc)) from exc
+
+
 @router.get("/public/{uuid}")
 async def open_public(
     uuid: str,
@@ -84,27 +108,44 @@ async def open_public(
         raise HTTPException(status_code=404, detail=str(exc)) from exc
 
 
-@router.get("/public/{uuid}/qr")
+# PNG для uuid не змінюється, але кожен показ має дійти сюди, щоб порахуватись у qr_views:
+# клієнти/CDN тримають копію і лише ревалідують її по ETag (304 теж рахується)
+QR_CACHE_CONTROL = "public, no-cache"
+
+
+@router.get(
+    "/public/{uuid}/qr",
+    response_class=Response,
+    responses={200: {"content": {"image/png": {}}}},
+)
 async def get_public_qr(
     uuid: str,
+    request: Request,
     svc: ShareService = Depends(get_share_service),
 ):
     try:
-        b64 = await svc.make_public_qr(uuid=uuid)
-        return {"png_base64": b64}
+        qr = await svc.get_public_qr(uuid=uuid)
     except NotFoundError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
 
+    if qr.png is None:
+        return RedirectResponse(url=qr.redirect_url, status_code=status.HTTP_307_TEMPORARY_REDIRECT)
+
+    headers = {"ETag": f'"qr-{uuid}"', "Cache-Control": QR_CACHE_CONTROL}
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=qr.png, media_type="image/png", headers=headers)
+
 
 # Rating
 @router.get("/photos/{photo_id}/rating", response_model=RatingResponse)
 async def get_photo_rating(
     photo_id: int,
-    svc: RatingService = Depends(get_rating_service),
+    svc: RatingService = Depends(rating_read_service),
 ) -> RatingResponse:
     try:
         stats = await svc.get_stats(photo_id=photo_id)
-        return RatingResponse(avg=stats["avg"], count=stats["count"])
+        return RatingResponse(photo_id=photo_id, avg_rating=stats["avg"], ratings_count=stats["count"])
     except NotFoundError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
 
@@ -119,7 +160,7 @@ async def set_photo_rating(
     try:
         await svc.set_rating(photo_id=photo_id, value=body.value, current_user=current_user)
         stats = await svc.get_stats(photo_id=photo_id)
-        return RatingResponse(avg=stats["avg"], count=stats["count"])
+        return RatingResponse(photo_id=photo_id, avg_rating=stats["avg"], ratings_count=stats["count"])
     except NotFoundError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
     except PermissionDeniedError as exc:
@@ -133,12 +174,12 @@ async def transform_photo(
     body: TransformRequest,
     current_user=Depends(get_current_user),
     photos: PhotoService = Depends(photo_service),
-    cloud: CloudinaryService = Depends(cloudinary_service),
+    share: ShareService = Depends(get_share_service),
 ):
     photo = await photos.get_photo(photo_id)  # ORM з cloudinary_public_id
     if photo.user_id != current_user.id:
         raise HTTPException(403, "Only owner can transform preview")
 
     params = build_transform_params(body)
-    url = cloud.build_transformed_url(public_id=photo.cloudinary_public_id, params=params)
-    return {"url": url, "params": params}
+    transformed = await share.get_transformed(photo, params)
+    return {"url": transformed.image_url, "params": params}
@@ -3,55 +3,115 @@ from __future__ import annotations
 import secrets
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, Response, status, File, Form, Query
+from fastapi import APIRouter, Depends, HTTPException, Response, status, File, Form, Query, UploadFile
 
 from app.auth.dependencies import get_current_user
-from app.core.exceptions import NotFoundError, PermissionDeniedError
+from app.core.exceptions import NotFoundError, PermissionDeniedError, InvalidCursorError, UploadTooLargeError
+from app.core.includes import parse_include
+from app.core.pagination import next_photo_cursor
+from app.core.settings import Settings
 from app.models.user import User
 from app.schemas.photo_schema import PhotoRead, PhotoListResponse, PhotoUpdateDescriptionRequest
 from app.service.photos_service import PhotoService
-from app.dependency.dependencies import photo_service
-from app.mappers.photo_mapper import map_photo_to_read
+from app.dependency.dependencies import photo_service, photo_read_service, get_settings
+from app.mappers.photo_mapper import map_photo_to_read, map_photos_to_read
+from app.service.upload_spool import spool_upload
 
 
 router = APIRouter(prefix="/photos", tags=["photos"])
 
 
+def list_includes(
+    include: str | None = Query(default=None, description="Comma-separated: tags,rating,owner"),
+) -> frozenset[str]:
+    try:
+        return parse_include(include)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+
 @router.post("", response_model=PhotoRead, status_code=status.HTTP_201_CREATED)
 async def upload_photo(
-    file: bytes = File(...),
+    file: UploadFile = File(...),
     description: str | None = Form(default=None),
     tags: str | None = Form(default=None),
     current_user: User = Depends(get_current_user),
     photos: PhotoService = Depends(photo_service),
+    settings: Settings = Depends(get_settings),
 ) -> PhotoRead:
     """
     Upload a new photo (multipart/form-data).
     description: optional
-    tags: optional comma-separated string (ignored for now; service doesn't support tags yet)
+    tags: optional comma-separated string (up to 5)
+
+    Файл не матеріалізується як bytes: перевіряємо розмір/md5 по чанках і стрімимо в storage.
     """
+    try:
+        spooled = await spool_upload(
+            file, max_bytes=settings.MAX_UPLOAD_BYTES, chunk_size=settings.UPLOAD_CHUNK_SIZE,
+        )
+    except UploadTooLargeError as exc:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(exc)) from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
     # Сервіс очікує, що ми згенеруємо унікальний slug/URL і передамо його в create_photo()
     photo_unique_url = secrets.token_urlsafe(16)
+    tag_names = [t.strip() for t in tags.split(",") if t.strip()][:5] if tags else None
 
     try:
         created = await photos.create_photo(
             user_id=current_user.id,
-            file=file,
+            file=spooled.file,
             photo_unique_url=photo_unique_url,
             description=description,
-            tags=tags,
+            tags=tag_names,
+            content_md5=spooled.content_md5,
         )
-        return PhotoRead.model_validate(created)
+        return map_photo_to_read(created, photos.cloudinary)
     except Exception as exc:
         # Якщо треба, можна деталізувати (наприклад, 400 для невалідного файлу).
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)) from exc
 
 
+# /search має йти перед /{photo_id}, інакше "search" матчиться як photo_id
+@router.get("/search", response_model=PhotoListResponse)
+async def search_photos(
+    q: str | None = Query(default=None),
+    tag: str | None = Query(default=None),
+    min_rating: float | None = Query(default=None, ge=1, le=5),
+    date_from: datetime | None = Query(default=None),
+    date_to: datetime | None = Query(default=None),
+    sort: str = Query(default="newest", pattern="^(newest|oldest|top|low|relevance)$"),
+    limit: int = Query(default=50, ge=1, le=200),
+    offset: int = Query(default=0, ge=0),
+    cursor: str | None = Query(default=None),
+    include: frozenset[str] = Depends(list_includes),
+    photos: PhotoService = Depends(photo_read_service),
+):
+    try:
+        items, total = await photos.search_photos(
+            q=q, tag=tag, min_rating=min_rating,
+            date_from=date_from, date_to=date_to,
+            sort=sort, limit=limit, offset=offset, cursor=cursor,
+        )
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    includes = await photos.load_includes(items, include)
+    return PhotoListResponse(
+        items=map_photos_to_read(items, photos.cloudinary, includes),
+        total=total,
+        limit=limit,
+        offset=offset,
+        next_cursor=next_photo_cursor(items, sort=sort, limit=limit),
+    )
+
+
 @router.get("/{photo_id}", response_model=PhotoRead)
 async def get_photo_by_id(
     photo_id: int,
     current_user: User = Depends(get_current_user),
-    photos: PhotoService = Depends(photo_service),
+    photos: PhotoService = Depends(photo_read_service),
 ) -> PhotoRead:
     """
     Private access to a photo by DB id:
@@ -70,7 +130,7 @@ async def get_photo_by_id(
 @router.get("/by-unique/{photo_unique_url}", response_model=PhotoRead)
 async def get_photo_by_unique_url(
     photo_unique_url: str,
-    photos: PhotoService = Depends(photo_service),
+    photos: PhotoService = Depends(photo_read_service),
 ) -> PhotoRead:
     """
     Public access by unique URL (share link).
@@ -88,13 +148,19 @@ async def get_photo_by_unique_url(
 async def list_my_photos(
     limit: int = Query(default=50, ge=1, le=200),
     offset: int = Query(default=0, ge=0),
+    cursor: str | None = Query(default=None),
+    include: frozenset[str] = Depends(list_includes),
     current_user: User = Depends(get_current_user),
-    photos: PhotoService = Depends(photo_service),
+    photos: PhotoService = Depends(photo_read_service),
 ) -> PhotoListResponse:
-    items = await photos.list_by_user(current_user.id, limit=limit, offset=offset)
-    items = [map_photo_to_read(photo, photos.cloudinary) for photo in items]
+    try:
+        items = await photos.list_by_user(current_user.id, limit=limit, offset=offset, cursor=cursor)
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    next_cursor = next_photo_cursor(items, sort="newest", limit=limit)
+    items = map_photos_to_read(items, photos.cloudinary, await photos.load_includes(items, include))
     total = await photos.count_by_user(current_user.id)
-    return PhotoListResponse(items=items, total=total, limit=limit, offset=offset)
+    return PhotoListResponse(items=items, total=total, limit=limit, offset=offset, next_cursor=next_cursor)
 
 
 @router.get("/user/{user_id}/list", response_model=PhotoListResponse)
@@ -102,13 +168,19 @@ async def list_user_photos(
     user_id: int,
     limit: int = Query(default=50, ge=1, le=200),
     offset: int = Query(default=0, ge=0),
-    photos: PhotoService = Depends(photo_service),
+    cursor: str | None = Query(default=None),
+    include: frozenset[str] = Depends(list_includes),
+    photos: PhotoService = Depends(photo_read_service),
 ) -> PhotoListResponse:
     # Публічний список фото користувача для профілю (UI).
-    items = await photos.list_by_user(user_id, limit=limit, offset=offset)
-    items = [map_photo_to_read(photo, photos.cloudinary) for photo in items]
+    try:
+        items = await photos.list_by_user(user_id, limit=limit, offset=offset, cursor=cursor)
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    next_cursor = next_photo_cursor(items, sort="newest", limit=limit)
+    items = map_photos_to_read(items, photos.cloudinary, await photos.load_includes(items, include))
     total = await photos.count_by_user(user_id)
-    return PhotoListResponse(items=items, total=total, limit=limit, offset=offset)
+    return PhotoListResponse(items=items, total=total, limit=limit, offset=offset, next_cursor=next_cursor)
 
 
 @router.put("/{photo_id}/description", response_model=PhotoRead)
@@ -141,28 +213,3 @@ async def delete_photo(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
     except PermissionDeniedError as exc:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(exc)) from exc
-
-
-@router.get("/search", response_model=PhotoListResponse)
-async def search_photos(
-    q: str | None = Query(default=None),
-    tag: str | None = Query(default=None),
-    min_rating: float | None = Query(default=None, ge=1, le=5),
-    date_from: datetime | None = Query(default=None),
-    date_to: datetime | None = Query(default=None),
-    sort: str = Query(default="newest", pattern="^(newest|oldest|top|low)$"),
-    limit: int = Query(default=50, ge=1, le=200),
-    offset: int = Query(default=0, ge=0),
-    photos: PhotoService = Depends(photo_service),
-):
-    items, total = await photos.search_photos(
-        q=q, tag=tag, min_rating=min_rating,
-        date_from=date_from, date_to=date_to,
-        sort=sort, limit=limit, offset=offset,
-    )
-    return PhotoListResponse(
-        items=[PhotoRead.model_validate(p, from_attributes=True) for p in items],
-        total=total,
-        limit=limit,
-        offset=offset,
-    )
\ No newline at end of file
@@ -3,7 +3,7 @@ from __future__ import annotations
 from fastapi import APIRouter, Depends, HTTPException, status
 
 from app.auth.dependencies import get_current_user
-from app.dependency.dependencies import rating_service
+from app.dependency.dependencies import rating_service, rating_read_service
 from app.schemas.rating_schema import (
     RatingSetRequest,
     RatingResponse
@@ -20,7 +20,7 @@ router = APIRouter(prefix="/ratings", tags=["Ratings"])
 )
 async def get_rating_stats(
     photo_id: int,
-    svc: RatingService = Depends(rating_service),
+    svc: RatingService = Depends(rating_read_service),
 ):
     return await svc.get_rating_stats(photo_id)
 
@@ -8,6 +8,8 @@ from app.routers.photo_extras import router as photo_extras_router
 from app.routers.health import router as health_router
 from app.routers.tags import router as tags_router
 from app.routers.ratings import router as ratings_router
+from app.routers.media import router as media_router
+from app.routers.metrics import router as metrics_router
 
 
 def build_api_router() -> APIRouter:
@@ -22,5 +24,7 @@ def build_api_router() -> APIRouter:
     api.include_router(auth_router)
     api.include_router(health_router)
     api.include_router(ratings_router)
+    api.include_router(media_router)
+    api.include_router(metrics_router)
 
     return api
\ No newline at end of file
@@ -3,7 +3,7 @@ from __future__ import annotations
 from fastapi import APIRouter, Depends, status
 
 from app.auth.dependencies import get_current_user, require_admin
-from app.dependency.dependencies import user_service as get_user_service
+from app.dependency.dependencies import user_service as get_user_service, user_read_service
 from app.models import UserRole
 from app.service.users_service import UserService
 from app.schemas.user_profile_shema import (
@@ -42,7 +42,7 @@ async def update_me(
 @router.get("/{username}", response_model=UserPublicProfile)
 async def get_public_profile(
     username: str,
-    svc: UserService = Depends(get_user_service),
+    svc: UserService = Depends(user_read_service),
 ):
     """
     Public profile by unique username.
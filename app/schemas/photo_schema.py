@@ -16,6 +16,16 @@ class PhotoUpdateDescriptionRequest(BaseModel):
     description: str | None = Field(default=None, max_length=500)
 
 
+class PhotoOwner(BaseModel):
+    id: int
+    username: str
+
+
+class PhotoRatingSummary(BaseModel):
+    avg_rating: float | None
+    ratings_count: int
+
+
 class PhotoRead(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -32,6 +42,11 @@ class PhotoRead(BaseModel):
     created_at: datetime
     updated_at: datetime
 
+    # заповнюються лише для списків з ?include=tags,rating,owner
+    tags: list[str] | None = None
+    rating: PhotoRatingSummary | None = None
+    owner: PhotoOwner | None = None
+
 
 class PhotoListResponse(BaseModel):
     """
@@ -42,3 +57,6 @@ class PhotoListResponse(BaseModel):
     total: int | None = None
     limit: int | None = None
     offset: int| None = None
+    # keyset-пагінація: передати як ?cursor=... для наступної сторінки
+    # (на сторінках за cursor total = None — він вже відомий з першої сторінки)
+    next_cursor: str | None = None
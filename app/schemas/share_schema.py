@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from pydantic import BaseModel, Field
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict, Field
 from enum import Enum
 
 
@@ -12,6 +14,22 @@ class ShareCreateResponse(BaseModel):
     uuid: str
 
 
+class ShareLinkStats(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    uuid: str
+    created_at: datetime
+    transformation: str | None = None
+    views: int
+    qr_views: int
+    last_hit_at: datetime | None = None
+
+
+class ShareStatsResponse(BaseModel):
+    photo_id: int
+    links: list[ShareLinkStats]
+
+
 class TransformPreset(str, Enum):
     thumb = "thumb"
     fit = "fit"
@@ -1,12 +1,17 @@
 from __future__ import annotations
 
+import asyncio
+import time
+import uuid
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, BinaryIO
 
 import cloudinary
-import cloudinary.uploader
 import cloudinary.utils
+import httpx
 
+from app.core.exceptions import StorageError
+from app.core.metrics import observe_storage_call
 from app.core.settings import Settings
 from app.schemas.share_schema import TransformRequest
 
@@ -19,42 +24,130 @@ class CloudinaryPreset:
     effect: str | None = None
     angle: int | None = None
 
+
+# --- Shared HTTP pool ---------------------------------------------------------
+# Один keep-alive пул на процес: TLS-handshake до api.cloudinary.com не на кожен upload.
+# Закривається в lifespan (close_http_client).
+
+_http_client: httpx.AsyncClient | None = None
+_upload_slots: asyncio.Semaphore | None = None
+
+
+def get_http_client(settings: Settings) -> httpx.AsyncClient:
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(settings.CLOUDINARY_TIMEOUT_SECONDS, connect=5.0),
+            limits=httpx.Limits(
+                max_connections=settings.CLOUDINARY_MAX_CONCURRENCY,
+                max_keepalive_connections=settings.CLOUDINARY_MAX_CONCURRENCY,
+            ),
+        )
+    return _http_client
+
+
+def get_upload_slots(settings: Settings) -> asyncio.Semaphore:
+    global _upload_slots
+    if _upload_slots is None:
+        _upload_slots = asyncio.Semaphore(settings.CLOUDINARY_MAX_CONCURRENCY)
+    return _upload_slots
+
+
+async def close_http_client() -> None:
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
 class CloudinaryService:
     """
-    Thin wrapper around Cloudinary SDK.
+    Thin async client for Cloudinary Upload API.
     Keeps config in one place and exposes app-level operations.
+
+    Upload/destroy йдуть через спільний httpx-пул і не блокують event loop;
+    кількість одночасних запитів обмежена семафором, кожен — з таймаутом.
+    URL-и будуються локально через SDK (без мережі).
     """
 
-    def __init__(self, settings: Settings) -> None:
+    def __init__(
+        self,
+        settings: Settings,
+        http: httpx.AsyncClient | None = None,
+        slots: asyncio.Semaphore | None = None,
+    ) -> None:
         cloudinary.config(
             cloud_name=settings.CLOUDINARY_NAME,
             api_key=settings.CLOUDINARY_API_KEY,
             api_secret=settings.CLOUDINARY_API_SECRET,
             secure=True,
         )
+        self.cloud_name = settings.CLOUDINARY_NAME
+        self.api_key = settings.CLOUDINARY_API_KEY
+        self.api_secret = settings.CLOUDINARY_API_SECRET
+        self.settings = settings
+        self._http = http
+        self.slots = slots or get_upload_slots(settings)
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        # сервіс живе весь процес, а пул закривається в lifespan — беремо актуальний
+        return self._http or get_http_client(self.settings)
 
-    def upload_photo(self, file: bytes, folder: str = "photoshare") -> dict[str, Any]:
+    def _signed(self, params: dict[str, Any]) -> dict[str, Any]:
+        params = {**params, "timestamp": int(time.time())}
+        signature = cloudinary.utils.api_sign_request(params, self.api_secret)
+        return {**params, "api_key": self.api_key, "signature": signature}
+
+    async def _post(self, action: str, data: dict[str, Any], files: dict | None = None) -> dict[str, Any]:
+        url = cloudinary.utils.cloudinary_api_url(action, cloud_name=self.cloud_name, resource_type="image")
+        async with self.slots:
+            try:
+                resp = await self.http.post(url, data=data, files=files)
+            except httpx.TimeoutException as exc:
+                raise StorageError(f"Cloudinary {action} timed out") from exc
+            except httpx.HTTPError as exc:
+                raise StorageError(f"Cloudinary {action} failed: {exc}") from exc
+
+        if resp.status_code >= 400:
+            raise StorageError(f"Cloudinary {action} failed: {resp.status_code} {resp.text}")
+        return resp.json()
+
+    @observe_storage_call("upload")
+    async def upload_photo(
+        self,
+        file: bytes | BinaryIO,
+        folder: str = "photoshare",
+        *,
+        content_md5: str | None = None,
+    ) -> dict[str, Any]:
         """
         Upload file-like object or bytes to Cloudinary.
+        File-like objects are streamed by httpx in chunks, not read into memory.
+        If content_md5 is given, it is checked against Cloudinary's etag.
         Returns: {"url": "...", "public_id": "..."}
         """
-        result = cloudinary.uploader.upload(
-            file,
-            folder=folder,
-            resource_type="image",
+        result = await self._post(
+            "upload",
+            data=self._signed({"folder": folder}),
+            files={"file": ("upload", file)},
         )
+        if content_md5 and result.get("etag") and result["etag"] != content_md5:
+            await self.delete_photo(result["public_id"])
+            raise StorageError("Cloudinary upload checksum mismatch")
         return {
             "url": result["secure_url"],
             "public_id": result["public_id"],
         }
 
-    def delete_photo(self, public_id: str) -> None:
+    @observe_storage_call("delete")
+    async def delete_photo(self, public_id: str) -> None:
         """
         Best-effort delete; treat 'not found' as OK.
         """
-        result = cloudinary.uploader.destroy(public_id, resource_type="image")
+        result = await self._post("destroy", data=self._signed({"public_id": public_id}))
         if result.get("result") not in {"ok", "not found"}:
-            raise RuntimeError(f"Cloudinary delete failed: {result}")
+            raise StorageError(f"Cloudinary delete failed: {result}")
 
     def build_transformed_url(self, public_id: str, params: dict[str, Any]) -> str:
         """
@@ -64,6 +157,44 @@ class CloudinaryService:
         url, _ = cloudinary.utils.cloudinary_url(public_id, transformation=[params] if params else None)
         return url
 
+
+class FakeCloudinaryService:
+    """
+    Offline drop-in for CloudinaryService (STORAGE_BACKEND=fake).
+    Тримає файли в пам'яті, імітує мережеву затримку — для навантажувальних тестів без мережі.
+    """
+
+    # спільне на процес: сервіс створюється на кожен запит
+    _store: dict[str, bytes] = {}
+
+    def __init__(self, settings: Settings) -> None:
+        self.latency = settings.FAKE_STORAGE_LATENCY_MS / 1000
+        self.slots = get_upload_slots(settings)
+
+    @observe_storage_call("upload")
+    async def upload_photo(
+        self,
+        file: bytes | BinaryIO,
+        folder: str = "photoshare",
+        *,
+        content_md5: str | None = None,
+    ) -> dict[str, Any]:
+        public_id = f"{folder}/{uuid.uuid4().hex}"
+        async with self.slots:
+            await asyncio.sleep(self.latency)
+            self._store[public_id] = file if isinstance(file, bytes) else file.read()
+        return {"url": self.build_transformed_url(public_id, {}), "public_id": public_id}
+
+    @observe_storage_call("delete")
+    async def delete_photo(self, public_id: str) -> None:
+        async with self.slots:
+            await asyncio.sleep(self.latency)
+            self._store.pop(public_id, None)
+
+    def build_transformed_url(self, public_id: str, params: dict[str, Any]) -> str:
+        suffix = ",".join(f"{k}_{v}" for k, v in sorted(params.items()))
+        return f"https://fake.local/{suffix + '/' if suffix else ''}{public_id}"
+
 def build_transform_params(req: TransformRequest) -> dict[str, Any]:
     """
     Convert API TransformRequest into Cloudinary transformation dict.
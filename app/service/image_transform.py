@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from app.core.exceptions import ImageTransformError, NotFoundError
+from app.core.settings import Settings
+from app.service.storage import LocalStorageService, map_file
+
+
+logger = logging.getLogger("photoshare.transform")
+
+# ті самі ключі, що й у build_transform_params() (Cloudinary-нотація)
+_INT_PARAMS = {"width", "height", "angle"}
+_STR_PARAMS = {"crop", "effect", "quality"}
+_CROPS = {"thumb", "fit", "fill", "scale", "limit"}
+MAX_DIMENSION = 2000
+
+
+def canonical_params(params: dict[str, Any]) -> dict[str, Any]:
+    """
+    Validates and normalizes transform params (values from a query string are str).
+    Однакова трансформація завжди дає однаковий dict -> однаковий cache key.
+    """
+    out: dict[str, Any] = {}
+    for key, value in params.items():
+        if key in _INT_PARAMS:
+            try:
+                out[key] = int(value)
+            except (TypeError, ValueError) as exc:
+                raise ImageTransformError(f"Invalid {key}: {value!r}") from exc
+        elif key in _STR_PARAMS:
+            out[key] = str(value)
+        else:
+            raise ImageTransformError(f"Unsupported transform param: {key}")
+
+    for key in ("width", "height"):
+        if key in out and not 1 <= out[key] <= MAX_DIMENSION:
+            raise ImageTransformError(f"{key} must be between 1 and {MAX_DIMENSION}")
+    if "crop" in out and out["crop"] not in _CROPS:
+        raise ImageTransformError(f"Unsupported crop: {out['crop']}")
+    if "angle" in out:
+        out["angle"] %= 360
+    _parse_effect(out.get("effect"))
+    _parse_quality(out.get("quality"))
+    return dict(sorted(out.items()))
+
+
+def _parse_effect(effect: str | None) -> tuple[str | None, int | None]:
+    if effect is None:
+        return None, None
+    name, _, arg = effect.partition(":")
+    if name in ("grayscale", "sepia") and not arg:
+        return name, None
+    if name == "blur":
+        try:
+            strength = int(arg) if arg else 100
+        except ValueError as exc:
+            raise ImageTransformError(f"Invalid blur: {arg!r}") from exc
+        if not 1 <= strength <= 2000:
+            raise ImageTransformError("blur must be between 1 and 2000")
+        return name, strength
+    raise ImageTransformError(f"Unsupported effect: {effect}")
+
+
+def _parse_quality(quality: str | None) -> int:
+    if quality is None or quality.startswith("auto"):
+        return 85
+    try:
+        value = int(quality)
+    except ValueError as exc:
+        raise ImageTransformError(f"Invalid quality: {quality!r}") from exc
+    if not 1 <= value <= 100:
+        raise ImageTransformError("quality must be between 1 and 100")
+    return value
+
+
+def cache_key(public_id: str, params: dict[str, Any]) -> str:
+    # public_id (uuid) ніколи не перевикористовується і оригінал під ним не змінюється,
+    # тож (public_id, canonical params) однозначно визначає вміст результату
+    raw = json.dumps([public_id, params], separators=(",", ":"), sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def render_to_file(src: str, dst: str, params: dict[str, Any]) -> None:
+    """
+    Worker-side: apply Cloudinary-style params to src and write the result to dst.
+    Виконується в окремому процесі, тому лише прості аргументи (шляхи + dict).
+    """
+    from PIL import Image, ImageFilter, ImageOps
+
+    # оригінал читаємо через mmap: декодер бере сторінки з page cache, без read() у heap воркера
+    with map_file(src) as mapped, Image.open(mapped) as img:
+        img = ImageOps.exif_transpose(img)
+        fmt = "PNG" if img.mode in ("RGBA", "LA", "P") and "A" in img.getbands() else "JPEG"
+        img = img.convert("RGBA" if fmt == "PNG" else "RGB")
+
+        width, height = params.get("width"), params.get("height")
+        crop = params.get("crop")
+        if width or height:
+            w = width or round(img.width * height / img.height)
+            h = height or round(img.height * width / img.width)
+            if crop in ("thumb", "fill"):
+                img = ImageOps.fit(img, (w, h), method=Image.Resampling.LANCZOS)
+            elif crop == "limit":
+                img.thumbnail((w, h), Image.Resampling.LANCZOS)
+            elif crop == "scale":
+                img = img.resize((w, h), Image.Resampling.LANCZOS)
+            else:
+                # fit (і default Cloudinary без crop): вписати зі збереженням пропорцій
+                img = ImageOps.contain(img, (w, h), method=Image.Resampling.LANCZOS)
+
+        effect, strength = _parse_effect(params.get("effect"))
+        if effect in ("grayscale", "sepia"):
+            gray = ImageOps.grayscale(img)
+            if effect == "grayscale":
+                toned = gray.convert("RGB")
+            else:
+                toned = ImageOps.colorize(gray, black="#2e1f0f", white="#fff4e0", mid="#a8865a")
+            if img.mode == "RGBA":
+                toned.putalpha(img.getchannel("A"))
+            img = toned
+        elif effect == "blur":
+            # Cloudinary blur 1..2000 -> Gaussian radius ~ 0..40px
+            img = img.filter(ImageFilter.GaussianBlur(radius=strength / 50))
+
+        angle = params.get("angle")
+        if angle:
+            # Cloudinary повертає за годинниковою стрілкою, Pillow — проти
+            img = img.rotate(-angle, expand=True, resample=Image.Resampling.BICUBIC)
+
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(dst), prefix=".render-")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                if fmt == "JPEG":
+                    img.save(out, "JPEG", quality=_parse_quality(params.get("quality")), optimize=True)
+                else:
+                    img.save(out, "PNG", optimize=True)
+            os.replace(tmp, dst)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+
+def prune_cache(cache_dir: Path, max_bytes: int) -> int:
+    """
+    Deletes the oldest renders (by mtime) until the cache takes at most 90% of max_bytes.
+    Returns number of files removed. Видалений рендер просто буде зроблено заново.
+    """
+    files = []
+    total = 0
+    for path in cache_dir.glob("*/*"):
+        if path.name.startswith(".render-"):
+            continue
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            continue
+        files.append((st.st_mtime, st.st_size, path))
+        total += st.st_size
+    if total <= max_bytes:
+        return 0
+
+    removed = 0
+    target = max_bytes * 0.9
+    for _, size, path in sorted(files):
+        if total <= target:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+        removed += 1
+    return removed
+
+
+# --- process pool (один на процес застосунку) ----------------------------------
+
+_pool: ProcessPoolExecutor | None = None
+
+
+def get_transform_pool(settings: Settings) -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=settings.TRANSFORM_WORKERS or os.cpu_count())
+    return _pool
+
+
+def shutdown_transform_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+class LocalTransformEngine:
+    """
+    In-process replacement for Cloudinary transformations (STORAGE_BACKEND=local).
+
+    Результати кешуються на диску за content-addressed ключем, рендер іде в process pool,
+    тож пропускна здатність росте з кількістю ядер, а event loop не блокується.
+    """
+
+    # однакові паралельні запити чекають один рендер (in-flight per process)
+    _inflight: dict[str, asyncio.Future] = {}
+    # межу диску перевіряємо раз на PRUNE_EVERY рендерів, а не на кожен
+    PRUNE_EVERY = 64
+    _renders_since_prune = 0
+
+    def __init__(self, storage: LocalStorageService, settings: Settings, executor: Executor | None = None) -> None:
+        self.storage = storage
+        self.cache_dir = Path(settings.TRANSFORM_CACHE_DIR).resolve()
+        self.max_cache_bytes = settings.TRANSFORM_CACHE_MAX_MB * 1024 * 1024
+        self.executor = executor or get_transform_pool(settings)
+
+    def cache_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / key
+
+    async def render(self, public_id: str, params: dict[str, Any]) -> Path:
+        """
+        Returns a path to the transformed image, rendering it on cache miss.
+        """
+        params = canonical_params(params)
+        src = self.storage.path_for(public_id)
+        if not src.is_file():
+            raise NotFoundError("File not found")
+        if not params:
+            return src
+
+        key = cache_key(public_id, params)
+        dst = self.cache_path(key)
+        if dst.is_file():
+            return dst
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            # False — рендер лідера перервано (напр. клієнт відключився): пробуємо самі
+            if await asyncio.shield(pending) is False:
+                return await self.render(public_id, params)
+            return dst
+
+        loop = asyncio.get_running_loop()
+        pending = loop.create_future()
+        self._inflight[key] = pending
+        try:
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            await loop.run_in_executor(self.executor, render_to_file, str(src), str(dst), params)
+            pending.set_result(True)
+        except Exception as exc:
+            error = exc
+            if isinstance(exc, (OSError, ValueError)):
+                # ті, хто чекає, мають отримати той самий 400, що й цей запит
+                error = ImageTransformError(f"Cannot transform image: {exc}")
+                error.__cause__ = exc
+            pending.set_exception(error)
+            # виняток забирають ті, хто чекає; цей запит отримує свій
+            pending.exception()
+            raise error
+        finally:
+            self._inflight.pop(key, None)
+            # CancelledError не Exception — інакше ті, хто чекає, висіли б вічно
+            if not pending.done():
+                pending.set_result(False)
+
+        await self._maybe_prune()
+        return dst
+
+    async def _maybe_prune(self) -> None:
+        if not self.max_cache_bytes:
+            return
+        LocalTransformEngine._renders_since_prune += 1
+        if LocalTransformEngine._renders_since_prune < self.PRUNE_EVERY:
+            return
+        LocalTransformEngine._renders_since_prune = 0
+        removed = await asyncio.to_thread(prune_cache, self.cache_dir, self.max_cache_bytes)
+        if removed:
+            logger.info("transform cache: removed %d old renders", removed)
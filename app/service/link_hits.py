@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.repository.public_links_repository import PublicLinkRepository
+
+logger = logging.getLogger("photoshare.link_hits")
+
+VIEW = 0
+QR = 1
+
+
+class LinkHitBuffer:
+    """
+    In-memory hit counters of public links (per process).
+    record() — лише dict-операція, без IO; у БД лічильники потрапляють пачками через flush_link_hits().
+    """
+
+    def __init__(self, max_links: int = 100_000) -> None:
+        self.max_links = max_links
+        # hit на новий uuid понад max_links відкидається (і рахується тут), щоб буфер не ріс без меж
+        self.dropped = 0
+        self._pending: dict[str, list[int]] = {}
+
+    def record(self, uuid: str, kind: int = VIEW) -> None:
+        if kind == QR:
+            self.add(uuid, qr_views=1)
+        else:
+            self.add(uuid, views=1)
+
+    def add(self, uuid: str, views: int = 0, qr_views: int = 0) -> None:
+        counts = self._pending.get(uuid)
+        if counts is None:
+            if len(self._pending) >= self.max_links:
+                self.dropped += views + qr_views
+                return
+            counts = self._pending[uuid] = [0, 0]
+        counts[VIEW] += views
+        counts[QR] += qr_views
+
+    def drain(self) -> dict[str, tuple[int, int]]:
+        pending, self._pending = self._pending, {}
+        return {uuid: (views, qr_views) for uuid, (views, qr_views) in pending.items()}
+
+    def restore(self, hits: dict[str, tuple[int, int]]) -> None:
+        # невдалий flush: повертаємо лічильники, наступний інтервал спробує ще раз
+        for uuid, (views, qr_views) in hits.items():
+            self.add(uuid, views, qr_views)
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+
+# один буфер на процес
+link_hits = LinkHitBuffer()
+
+
+async def flush_link_hits(session: AsyncSession, *, batch_size: int, buffer: LinkHitBuffer = link_hits) -> int:
+    """
+    Writes buffered hits as batched upserts, batch_size links per transaction.
+    Returns number of links updated.
+    """
+    hits = buffer.drain()
+    if not hits:
+        return 0
+
+    repo = PublicLinkRepository(session)
+    now = datetime.now(timezone.utc)
+    items = list(hits.items())
+    updated = 0
+    committed = 0
+    try:
+        for start in range(0, len(items), batch_size):
+            updated += await repo.add_hits(dict(items[start:start + batch_size]), now)
+            await session.commit()
+            committed = start + batch_size
+    except BaseException:
+        # і CancelledError (shutdown посеред flush): незакомічене повертаємо в буфер до rollback,
+        # тож фінальний flush у run_link_hits_flusher його побачить
+        buffer.restore(dict(items[committed:]))
+        await session.rollback()
+        raise
+    return updated
+
+
+async def run_link_hits_flusher(
+    sessionmaker: async_sessionmaker[AsyncSession],
+    *,
+    interval_seconds: float,
+    batch_size: int,
+) -> None:
+    """
+    Background loop for the app lifespan; на task.cancel() робить останній flush.
+    """
+    try:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                async with sessionmaker() as session:
+                    await flush_link_hits(session, batch_size=batch_size)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("public link hits flush failed")
+    finally:
+        if len(link_hits):
+            try:
+                async with sessionmaker() as session:
+                    await flush_link_hits(session, batch_size=batch_size)
+            except Exception:
+                logger.exception("final public link hits flush failed")
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import NotFoundError
+from app.models.comment import Comment
+from app.models.photo import Photo
+from app.models.tag import Tag
+from app.repository.comment_repository import CommentRepository
+from app.repository.photos_repository import PhotoRepository
+from app.service.rating_service import rating_stats
+
+
+@dataclass(frozen=True)
+class PhotoDetail:
+    photo: Photo
+    tags: list[Tag]
+    rating: dict
+    comments: list[Comment]
+
+
+class PhotoDetailService:
+    """
+    Everything the photo detail page needs in two queries:
+    фото + теги (один JOIN), рейтинг — з денормалізованих колонок фото,
+    перша сторінка коментарів разом з авторами (ще один JOIN).
+    Фото читається рівно один раз на запит.
+    """
+
+    def __init__(self, session: AsyncSession, photos_repo: PhotoRepository, comments_repo: CommentRepository):
+        self.session = session
+        self.photos = photos_repo
+        self.comments = comments_repo
+
+    async def load(self, photo_id: int, *, comments_limit: int = 50) -> PhotoDetail:
+        photo = await self.photos.get_with_tags(photo_id)
+        if photo is None:
+            raise NotFoundError("Photo not found")
+
+        comments = await self.comments.list_for_photo(photo_id=photo_id, limit=comments_limit, offset=0)
+        tags = sorted((pt.tag for pt in photo.photo_tags), key=lambda t: t.name)
+        return PhotoDetail(photo=photo, tags=tags, rating=rating_stats(photo), comments=comments)
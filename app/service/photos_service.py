@@ -1,38 +1,51 @@
 from __future__ import annotations
 
 from datetime import datetime
+from typing import BinaryIO
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import NotFoundError, PermissionDeniedError
+from app.core.includes import PhotoIncludes
+from app.core.pagination import decode_cursor
 from app.models.photo import Photo
 from app.models.roles import UserRole
 from app.models.user import User
 from app.repository.photos_repository import PhotoRepository
 from app.repository.tags_repository import TagRepository
-from app.service.cloudinary_service import CloudinaryService
+from app.repository.users_repository import UserRepository
+from app.service.share_service import invalidate_public_links
+from app.service.storage import StorageBackend
+from app.service.tagging_service import invalidate_tag_cloud
 
 
 class PhotoService:
     def __init__(self, session: AsyncSession,
                  photos_repo: PhotoRepository,
-                 cloudinary_client: CloudinaryService,
-                 tags_repo: TagRepository,):
+                 cloudinary_client: StorageBackend,
+                 tags_repo: TagRepository,
+                 users_repo: UserRepository | None = None,):
         self.session = session
         self.photos = photos_repo
         self.cloudinary = cloudinary_client
         self.tags = tags_repo
+        self.users = users_repo or UserRepository(session)
 
     async def create_photo(
             self,
             *,
             user_id: int,
-            file: bytes,
+            file: bytes | BinaryIO,
             photo_unique_url: str,
             description: str | None = None,
             tags: list[str] | None = None,
+            content_md5: str | None = None,
     ) -> Photo:
-        # upload to cloudinary first
-        upload = self.cloudinary.upload_photo(file)
+        """
+        file — bytes або file-like (SpooledUpload.file): file-like стрімиться в storage чанками.
+        """
+        # upload to storage first
+        upload = await self.cloudinary.upload_photo(file, content_md5=content_md5)
         public_id = upload["public_id"]
 
         # persist in DB
@@ -43,22 +56,24 @@ class PhotoService:
             description=description,
         )
         try:
-            async with self.session.begin():
-                await self.photos.add(photo)
-                # щоб мати photo.id для tagging
-                await self.session.flush()
+            await self.photos.add(photo)
+            # щоб мати photo.id для tagging
+            await self.session.flush()
+            # optional tags, в тій самій транзакції (разом з usage_count)
+            if tags:
+                # enforce max=5 на рівні репозиторію
+                await self.tags.set_tags_for_photo(photo.id, tags, max_tags=5)
+            await self.session.commit()
         except Exception:
-            # best-effort cleanup in cloudinary to avoid orphan files
+            await self.session.rollback()
+            # best-effort cleanup in storage to avoid orphan files
             try:
-                self.cloudinary.delete_photo(upload["public_id"])
+                await self.cloudinary.delete_photo(upload["public_id"])
             except Exception:
                 pass
             raise
-
-        # optional tags
         if tags:
-            # enforce max=5 на рівні репозиторію
-            await self.tags.set_tags_for_photo(photo.id, tags, max_tags=5)
+            invalidate_tag_cloud()
 
         return photo
 
@@ -93,21 +108,50 @@ class PhotoService:
         self.ensure_owner_or_admin(current_user, photo.user_id)
 
         # delete in DB first (or cloudinary first — дискусійно)
-        async with self.session.begin():
+        try:
+            await self.tags.release_tags_of_photo(photo_id)
             ok = await self.photos.delete_by_id(photo_id)
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+        invalidate_tag_cloud()
+        invalidate_public_links(photo_id)
         if ok:
             # best-effort cloudinary cleanup
             try:
-                self.cloudinary.delete_photo(photo.cloudinary_public_id)
+                await self.cloudinary.delete_photo(photo.cloudinary_public_id)
             except Exception:
                 pass
 
-    async def list_by_user(self, user_id: int, *, limit: int = 50, offset: int = 0) -> list[Photo]:
-        return await self.photos.list_by_user(user_id=user_id, limit=limit, offset=offset)
+    async def list_by_user(
+            self,
+            user_id: int,
+            *,
+            limit: int = 50,
+            offset: int = 0,
+            cursor: str | None = None,
+    ) -> list[Photo]:
+        after = decode_cursor(cursor, sort="newest") if cursor else None
+        return await self.photos.list_by_user(user_id=user_id, limit=limit, offset=offset, after=after)
 
     async def count_by_user(self, user_id: int) -> int:
         return await self.photos.count_by_user(user_id)
 
+    async def load_includes(self, photos: list[Photo], include: frozenset[str]) -> PhotoIncludes:
+        """
+        Extras for a whole page: не більше одного запиту на кожен include, незалежно від розміру сторінки.
+        rating береться з денормалізованих колонок photos — окремого запиту не потрібно.
+        """
+        includes = PhotoIncludes(rating="rating" in include)
+        if not photos:
+            return includes
+        if "tags" in include:
+            includes.tags = await self.tags.list_tag_names_for_photos([p.id for p in photos])
+        if "owner" in include:
+            includes.owners = await self.users.get_many([p.user_id for p in photos])
+        return includes
+
     def ensure_owner_or_admin(self, current_user: User, photo_user_id: int) -> None:
         if current_user.role == UserRole.admin:
             return
@@ -125,8 +169,14 @@ class PhotoService:
             sort: str = "newest",
             limit: int = 50,
             offset: int = 0,
-    ) -> tuple[list[Photo], int]:
-        items = await self.photos.search(
+            cursor: str | None = None,
+    ) -> tuple[list[Photo], int | None]:
+        """
+        cursor — opaque token з попередньої сторінки (next_cursor); якщо є, offset ігнорується
+        і total не рахується (None).
+        """
+        after = decode_cursor(cursor, sort=sort) if cursor else None
+        return await self.photos.search_with_total(
             q=q,
             tag=tag,
             min_rating=min_rating,
@@ -135,12 +185,5 @@ class PhotoService:
             sort=sort,
             limit=limit,
             offset=offset,
+            after=after,
         )
-        total = await self.photos.count_search(
-            q=q,
-            tag=tag,
-            min_rating=min_rating,
-            date_from=date_from,
-            date_to=date_to,
-        )
-        return items, total
\ No newline at end of file
@@ -1,17 +1,31 @@
 from __future__ import annotations
 
-import base64
+import asyncio
+from concurrent.futures import Executor
 from io import BytesIO
 
 import qrcode
 
 
+def render_qr_png(data: str) -> bytes:
+    """
+    PNG bytes of a QR code for data. Module-level, щоб його можна було віддати в process pool.
+    """
+    img = qrcode.make(data)
+    buf = BytesIO()
+    img.save(buf, format="PNG")
+    return buf.getvalue()
+
+
 class QrService:
-    def make_png_base64(self, data: str) -> str:
-        """
-        Returns base64-encoded PNG (no data: prefix).
-        """
-        img = qrcode.make(data)
-        buf = BytesIO()
-        img.save(buf, format="PNG")
-        return base64.b64encode(buf.getvalue()).decode("ascii")
\ No newline at end of file
+    """
+    qrcode — чистий Python і CPU-bound, тому рендер іде в executor, а не в event loop.
+    executor=None — default thread pool циклу.
+    """
+
+    def __init__(self, executor: Executor | None = None) -> None:
+        self.executor = executor
+
+    async def render_png(self, data: str) -> bytes:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, render_qr_png, data)
@@ -3,11 +3,21 @@ from __future__ import annotations
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.exceptions import NotFoundError
 from app.models.rating import Rating
 from app.repository.ratings_repository import RatingRepository
 from app.repository.photos_repository import PhotoRepository
 
 
+def rating_stats(photo) -> dict:
+    count = photo.rating_count or 0
+    return {
+        "photo_id": photo.id,
+        "avg": round(photo.avg_rating, 2) if count else None,
+        "count": count,
+    }
+
+
 class RatingService:
     def __init__(
         self,
@@ -58,13 +68,56 @@ class RatingService:
         )
 
         try:
-            return await self.rating_repo.create(rating)
+            await self.rating_repo.create(rating)
+            # агрегати на photos — в тій самій транзакції
+            await self.photo_repo.apply_rating_delta(photo_id, value_delta=value, count_delta=1)
+            await self.session.commit()
+            return rating
 
         except IntegrityError:
             # Race condition protection
             await self.session.rollback()
             raise PermissionError("You have already rated this photo")
 
+    async def set_rating(
+        self,
+        photo_id: int,
+        value: int,
+        current_user,
+    ) -> Rating:
+        """
+        Creates or overwrites the current user's rating (UI / PUT semantics).
+
+        Rules:
+        - photo must exist
+        - user cannot rate own photo
+        """
+
+        photo = await self.photo_repo.get_by_id(photo_id)
+        if photo is None:
+            raise ValueError("Photo not found")
+
+        if photo.user_id == current_user.id:
+            raise PermissionError("You cannot rate your own photo")
+
+        existing = await self.rating_repo.get_by_photo_and_user(
+            photo_id=photo_id,
+            user_id=current_user.id,
+        )
+        if existing is None:
+            return await self.add_rating(photo_id=photo_id, user_id=current_user.id, value=value)
+
+        delta = value - existing.value
+        existing.value = value
+        try:
+            await self.session.flush()
+            await self.photo_repo.apply_rating_delta(photo_id, value_delta=delta, count_delta=0)
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+        return existing
+
     async def get_rating_stats(self, photo_id: int) -> dict:
         """
         Returns the average value and number of ratings.
@@ -76,6 +129,16 @@ class RatingService:
 
         return await self.rating_repo.get_rating_stats(photo_id)
 
+    async def get_stats(self, photo_id: int) -> dict:
+        """
+        Rating aggregate for UI/API: {"photo_id", "avg", "count"}.
+        Читає денормалізовані photos.avg_rating/rating_count — без агрегації по ratings.
+        """
+        photo = await self.photo_repo.get_by_id(photo_id)
+        if photo is None:
+            raise NotFoundError("Photo not found")
+        return rating_stats(photo)
+
     async def delete_rating(
         self,
         rating_id: int,
@@ -96,4 +159,12 @@ class RatingService:
         if rating is None:
             raise ValueError("Rating not found")
 
-        await self.rating_repo.delete(rating)
\ No newline at end of file
+        try:
+            await self.rating_repo.delete(rating)
+            await self.photo_repo.apply_rating_delta(
+                rating.photo_id, value_delta=-rating.value, count_delta=-1,
+            )
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
\ No newline at end of file
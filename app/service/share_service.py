@@ -1,32 +1,161 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
+import time
 import uuid as uuidlib
+from typing import Any, NamedTuple
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.exceptions import NotFoundError
-from app.models import PublicLink
+from app.core.exceptions import NotFoundError, PermissionDeniedError
+from app.core.lru import LRUCache, unexpired
+from app.models import Photo, PublicLink
+from app.models.roles import UserRole
 from app.repository.photos_repository import PhotoRepository
-from app.repository.public_links_repository import PublicLinkRepository
+from app.repository.public_links_repository import PublicLinkRepository, PublicLinkTarget
 from app.repository.transformed_images_repository import TransformedImageRepository
-from app.service.cloudinary_service import CloudinaryService
+from app.service.storage import LocalStorageService, StorageBackend
+from app.service.link_hits import QR, link_hits
 from app.service.qr_service import QrService
 
 
+def canonical_transformation(params: dict[str, Any]) -> str:
+    # порядок ключів не важливий: {"width":100,"crop":"fill"} == {"crop":"fill","width":100}
+    return json.dumps(params, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+
+
+def transform_params_hash(params: dict[str, Any]) -> str:
+    return hashlib.sha256(canonical_transformation(params).encode("utf-8")).hexdigest()
+
+
+class CachedTransform(NamedTuple):
+    transformed_image_id: int
+    image_url: str
+
+
+# (photo_id, params_hash) -> вже збережена трансформація.
+# id фото не перевикористовуються, а рядок живе стільки ж, скільки фото (CASCADE);
+# при видаленні фото записи (photo_id, *) викидає invalidate_public_links.
+_transformed_cache: LRUCache[tuple[int, str], CachedTransform] = LRUCache(maxsize=4096)
+
+# uuid -> PNG QR-коду (~1 KB на запис). Вміст для uuid незмінний; чи посилання ще існує,
+# get_public_qr перевіряє через public_link_cache перед цим кешем.
+_qr_cache: LRUCache[str, bytes] = LRUCache(maxsize=2048)
+
+# так qr_code_url заповнювався до того, як QR почали зберігати в storage
+_LEGACY_QR_URL = "/public/{uuid}/qr"
+
+
+class PublicLinkCache:
+    """
+    uuid -> target URL для /public/{uuid} (per process), з негативним кешем невідомих uuid.
+    Hit не торкається БД. Видалення фото інвалідуємо тут же (invalidate_photo); інші воркери
+    бачать його не пізніше TTL.
+    """
+
+    def __init__(self, maxsize: int = 50_000) -> None:
+        self._cache: LRUCache[str, tuple[float, PublicLinkTarget | None]] = LRUCache(maxsize=maxsize)
+
+    def get(self, uuid: str) -> tuple[bool, PublicLinkTarget | None]:
+        """
+        (found, target): (True, None) — закешований "не існує".
+        """
+        entry = self._cache.get(uuid, is_valid=unexpired)
+        if entry is None:
+            return False, None
+        return True, entry[1]
+
+    def set(self, uuid: str, target: PublicLinkTarget | None, ttl: float) -> None:
+        if ttl > 0:
+            self._cache.set(uuid, (time.monotonic() + ttl, target))
+
+    def invalidate(self, uuid: str) -> None:
+        self._cache.pop(uuid)
+
+    def invalidate_photo(self, photo_id: int) -> list[str]:
+        evicted = []
+        for uuid, (_, target) in self._cache.items():
+            if target is not None and target.photo_id == photo_id:
+                self._cache.pop(uuid)
+                evicted.append(uuid)
+        return evicted
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> dict[str, int]:
+        return self._cache.stats()
+
+
+public_link_cache = PublicLinkCache()
+
+
+def invalidate_public_links(photo_id: int) -> None:
+    """
+    Call after photo_id is deleted: його трансформації і публічні посилання зникли разом з ним (CASCADE).
+    """
+    for uuid in public_link_cache.invalidate_photo(photo_id):
+        _qr_cache.pop(uuid)
+    for key, _ in _transformed_cache.items():
+        if key[0] == photo_id:
+            _transformed_cache.pop(key)
+
+
+class PublicQr(NamedTuple):
+    # png — віддати як є; інакше redirect_url — збережений файл на CDN storage-бекенду
+    png: bytes | None = None
+    redirect_url: str | None = None
+
+
 class ShareService:
     def __init__(self,
                  session: AsyncSession,
                  photos_repo: PhotoRepository,
                  transformed_repo: TransformedImageRepository,
-                 cloudinary: CloudinaryService,
+                 cloudinary: StorageBackend,
                  public_links_repo: PublicLinkRepository,
-                 qr_maker: QrService):
+                 qr_maker: QrService,
+                 link_cache_ttl: float = 0.0,
+                 link_negative_ttl: float = 0.0):
         self.session = session
         self.photos = photos_repo
         self.transformed = transformed_repo
         self.public_links = public_links_repo
         self.qr = qr_maker
         self.cloudinary = cloudinary
+        self.link_cache_ttl = link_cache_ttl
+        self.link_negative_ttl = link_negative_ttl
+
+    async def get_transformed(self, photo: Photo, transform_params: dict) -> CachedTransform:
+        """
+        Returns the stored transformation of photo for these params, creating it once.
+        Повторні preview/share з тими самими params не створюють нових рядків.
+        """
+        params_hash = transform_params_hash(transform_params)
+        key = (photo.id, params_hash)
+        cached = _transformed_cache.get(key)
+        if cached is not None:
+            return cached
+
+        ti = await self.transformed.get_by_params(photo.id, params_hash)
+        if ti is None:
+            transformed_url = self.cloudinary.build_transformed_url(
+                public_id=photo.cloudinary_public_id,
+                params=transform_params,
+            )
+            ti = await self.transformed.get_or_create(
+                photo_id=photo.id,
+                params_hash=params_hash,
+                image_url=transformed_url,
+                transformation=canonical_transformation(transform_params),
+            )
+            await self.session.commit()
+
+        cached = CachedTransform(ti.id, ti.image_url)
+        _transformed_cache.set(key, cached)
+        return cached
 
     async def create_share_link(self,
                                 photo_id: int,
@@ -40,36 +169,127 @@ class ShareService:
         # if photo.user_id != current_user.id and current_user.role != UserRole.admin:
         #     raise PermissionDeniedError("Insufficient permissions")
 
-        # сформувати URL трансформованого зображення (Cloudinary)
-        transformed_url = self.cloudinary.build_transformed_url(
-            public_id=photo.cloudinary_public_id,
-            params=transform_params,
-        )
-        transformation_str = json.dumps(transform_params, ensure_ascii=False)
+        transformed = await self.get_transformed(photo, transform_params)
 
         public_uuid = str(uuidlib.uuid4())
-
-        async with self.session.begin():
-            ti = await self.transformed.create_for_photo(
-                photo_id=photo.id,
-                image_url=transformed_url,
-                transformation=transformation_str,
-            )
-
-            link = PublicLink(
-                uuid=public_uuid,
-                transformed_image_id=ti.id,
-            )
+        png, upload = await self._store_qr(public_uuid)
+        link = PublicLink(
+            uuid=public_uuid,
+            transformed_image_id=transformed.transformed_image_id,
+            qr_code_url=upload["url"],
+        )
+        try:
             await self.public_links.add(link)
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            try:
+                await self.cloudinary.delete_photo(upload["public_id"])
+            except Exception:
+                pass
+            raise
+        _qr_cache.set(public_uuid, png)
+        public_link_cache.invalidate(public_uuid)
 
         return public_uuid
 
+    async def _resolve_target(self, uuid: str) -> PublicLinkTarget:
+        found, target = public_link_cache.get(uuid)
+        if not found:
+            target = await self.public_links.get_target(uuid)
+            ttl = self.link_cache_ttl if target is not None else self.link_negative_ttl
+            public_link_cache.set(uuid, target, ttl)
+        if target is None:
+            raise NotFoundError("Public link not found")
+        return target
+
     async def resolve_public(self, *, uuid: str) -> str:
+        target = await self._resolve_target(uuid)
+        link_hits.record(uuid)
+        return target.url
+
+    async def _store_qr(self, uuid: str) -> tuple[bytes, dict[str, Any]]:
+        png = await self.qr.render_png(f"/public/{uuid}")
+        upload = await self.cloudinary.upload_photo(png, folder="qr")
+        return png, upload
+
+    async def _read_stored_qr(self, url: str) -> bytes | None:
+        # local-бекенд: файл поруч, читаємо його замість redirect на /media
+        if not isinstance(self.cloudinary, LocalStorageService):
+            return None
+        public_id = self.cloudinary.public_id_for(url)
+        if public_id is None:
+            return None
+        try:
+            return await asyncio.to_thread(self.cloudinary.read_bytes, public_id)
+        except (OSError, ValueError, NotFoundError):
+            # ValueError — mmap порожнього файлу
+            return None
+
+    async def get_public_qr(self, *, uuid: str, count_hit: bool = True) -> PublicQr:
+        """
+        QR рендериться один раз при create_share_link; тут — лише кеш, storage або redirect.
+        count_hit=False — внутрішній показ (get_owner_qr), у статистику не йде.
+        """
+        # посилання могло зникнути разом з фото: PNG-кеш цього не знає, public_link_cache — знає
+        await self._resolve_target(uuid)
+        png = _qr_cache.get(uuid)
+        if png is not None:
+            self._count_qr_hit(uuid, count_hit)
+            return PublicQr(png=png)
+
         link = await self.public_links.get_by_uuid(uuid)
         if not link:
             raise NotFoundError("Public link not found")
-        return link.transformed_image.url
 
-    async def make_public_qr(self, *, uuid: str) -> str:
-        url = f"/public/{uuid}"
-        return self.qr.make_png_base64(url)
+        if link.qr_code_url == _LEGACY_QR_URL.format(uuid=uuid):
+            # старі посилання: генеруємо і зберігаємо один раз, при першому запиті
+            png, upload = await self._store_qr(uuid)
+            link.qr_code_url = upload["url"]
+            await self.session.commit()
+        else:
+            png = await self._read_stored_qr(link.qr_code_url)
+            if png is None:
+                self._count_qr_hit(uuid, count_hit)
+                return PublicQr(redirect_url=link.qr_code_url)
+
+        _qr_cache.set(uuid, png)
+        self._count_qr_hit(uuid, count_hit)
+        return PublicQr(png=png)
+
+    async def _get_managed_photo(self, photo_id: int, current_user) -> Photo:
+        photo = await self.photos.get_by_id(photo_id)
+        if not photo:
+            raise NotFoundError("Photo not found")
+        if current_user.role != UserRole.admin and photo.user_id != current_user.id:
+            raise PermissionDeniedError("Insufficient permissions")
+        return photo
+
+    async def check_owner_link(self, *, photo_id: int, uuid: str, current_user) -> None:
+        """
+        Owner/admin of photo_id, і uuid — посилання саме на це фото (інакше NotFoundError).
+        """
+        await self._get_managed_photo(photo_id, current_user)
+        target = await self._resolve_target(uuid)
+        if target.photo_id != photo_id:
+            raise NotFoundError("Public link not found")
+
+    async def get_owner_qr(self, *, photo_id: int, uuid: str, current_user) -> PublicQr:
+        """
+        QR для сторінки власника: ті самі перевірки, що check_owner_link; показ у статистику не йде.
+        """
+        await self.check_owner_link(photo_id=photo_id, uuid=uuid, current_user=current_user)
+        return await self.get_public_qr(uuid=uuid, count_hit=False)
+
+    @staticmethod
+    def _count_qr_hit(uuid: str, count_hit: bool) -> None:
+        if count_hit:
+            link_hits.record(uuid, QR)
+
+    async def get_share_stats(self, photo_id: int, current_user) -> list:
+        """
+        Share links of the photo з лічильниками переглядів (owner/admin).
+        Лічильники відстають від реальних на інтервал flush-у (LINK_HITS_FLUSH_INTERVAL_SECONDS).
+        """
+        await self._get_managed_photo(photo_id, current_user)
+        return await self.public_links.list_stats_for_photo(photo_id)
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import hmac
+import mmap
+import os
+import tempfile
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, BinaryIO, Iterator, Protocol
+from urllib.parse import urlencode
+
+from app.core.exceptions import NotFoundError, StorageError
+from app.core.metrics import observe_storage_call
+from app.core.settings import Settings
+
+
+class StorageBackend(Protocol):
+    """
+    Everything the app needs from image storage.
+    Реалізації: CloudinaryService, FakeCloudinaryService, LocalStorageService.
+    """
+
+    async def upload_photo(
+        self,
+        file: bytes | BinaryIO,
+        folder: str = "photoshare",
+        *,
+        content_md5: str | None = None,
+    ) -> dict[str, Any]:
+        ...
+
+    async def delete_photo(self, public_id: str) -> None:
+        ...
+
+    def build_transformed_url(self, public_id: str, params: dict[str, Any]) -> str:
+        ...
+
+
+_MAGIC = (
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+)
+
+
+def sniff_media_type(head: bytes) -> str:
+    for magic, media_type in _MAGIC:
+        if head.startswith(magic):
+            return media_type
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return "application/octet-stream"
+
+
+def sniff_file(path: str | os.PathLike) -> str:
+    # блокуючий read — з async коду викликати через asyncio.to_thread
+    with open(path, "rb") as fh:
+        return sniff_media_type(fh.read(16))
+
+
+@contextmanager
+def map_file(path: str | os.PathLike) -> Iterator[mmap.mmap]:
+    """
+    Memory-mapped read-only view of a file: сторінки віддає page cache,
+    без копіювання всього файлу в heap процесу. mmap — file-like (read/seek/tell).
+    """
+    with open(path, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        yield mapped
+
+
+class LocalStorageService:
+    """
+    Local-disk storage (STORAGE_BACKEND=local): staging, benchmarks, hot images
+    без мережевої залежності.
+
+    Originals live under LOCAL_STORAGE_DIR/<public_id> and are served by /media
+    with FileResponse (sendfile, коли сервер це підтримує).
+    """
+
+    def __init__(self, settings: Settings) -> None:
+        self.root = Path(settings.LOCAL_STORAGE_DIR).resolve()
+        self.url_prefix = settings.MEDIA_URL_PREFIX.rstrip("/")
+        self.chunk_size = settings.UPLOAD_CHUNK_SIZE
+        self._signing_key = settings.SECRET_KEY.encode("utf-8")
+
+    def path_for(self, public_id: str) -> Path:
+        path = (self.root / public_id).resolve()
+        # захист від ../ у public_id
+        if not path.is_relative_to(self.root):
+            raise NotFoundError("File not found")
+        return path
+
+    def public_id_for(self, url: str) -> str | None:
+        # зворотне до build_transformed_url(public_id, {}); None — URL не з цього сховища
+        prefix = self.url_prefix + "/"
+        if not url.startswith(prefix) or "?" in url:
+            return None
+        return url[len(prefix):]
+
+    def read_bytes(self, public_id: str) -> bytes:
+        # блокуючий read через map_file — з async коду викликати через asyncio.to_thread
+        path = self.path_for(public_id)
+        if not path.is_file():
+            raise NotFoundError("File not found")
+        with map_file(path) as mapped:
+            return mapped[:]
+
+    def _write(self, file: bytes | BinaryIO, target: Path) -> str:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.md5(usedforsecurity=False)
+        fd, tmp_name = tempfile.mkstemp(dir=target.parent, prefix=".upload-")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                if isinstance(file, bytes):
+                    digest.update(file)
+                    out.write(file)
+                else:
+                    while chunk := file.read(self.chunk_size):
+                        digest.update(chunk)
+                        out.write(chunk)
+            # атомарно: читачі ніколи не бачать недописаний файл
+            os.replace(tmp_name, target)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+        return digest.hexdigest()
+
+    @observe_storage_call("upload")
+    async def upload_photo(
+        self,
+        file: bytes | BinaryIO,
+        folder: str = "photoshare",
+        *,
+        content_md5: str | None = None,
+    ) -> dict[str, Any]:
+        public_id = f"{folder}/{uuid.uuid4().hex}"
+        target = self.path_for(public_id)
+        try:
+            written_md5 = await asyncio.to_thread(self._write, file, target)
+        except OSError as exc:
+            raise StorageError(f"Local storage write failed: {exc}") from exc
+
+        if content_md5 and written_md5 != content_md5:
+            await self.delete_photo(public_id)
+            raise StorageError("Local storage checksum mismatch")
+        return {"url": self.build_transformed_url(public_id, {}), "public_id": public_id}
+
+    @observe_storage_call("delete")
+    async def delete_photo(self, public_id: str) -> None:
+        """
+        Best-effort delete; missing file is OK.
+        """
+        await asyncio.to_thread(self.path_for(public_id).unlink, missing_ok=True)
+
+    def _sign(self, public_id: str, query: str) -> str:
+        return hmac.new(self._signing_key, f"{public_id}?{query}".encode("utf-8"), hashlib.sha256).hexdigest()[:32]
+
+    def build_transformed_url(self, public_id: str, params: dict[str, Any]) -> str:
+        url = f"{self.url_prefix}/{public_id}"
+        if params:
+            # /media рендерить лише трансформації, видані тут (sig) — не будь-які params з URL
+            query = urlencode(sorted((key, str(value)) for key, value in params.items()))
+            url += f"?{query}&sig={self._sign(public_id, query)}"
+        return url
+
+    def verify_transform(self, public_id: str, params: dict[str, str], sig: str | None) -> bool:
+        if not sig:
+            return False
+        query = urlencode(sorted(params.items()))
+        return hmac.compare_digest(sig, self._sign(public_id, query))
+
+
+def build_storage_backend(settings: Settings) -> StorageBackend:
+    # імпорт тут: cloudinary_service імпортує SDK, якого local/fake не потребують
+    from app.service.cloudinary_service import CloudinaryService, FakeCloudinaryService
+
+    if settings.STORAGE_BACKEND == "local":
+        return LocalStorageService(settings)
+    if settings.STORAGE_BACKEND == "fake":
+        return FakeCloudinaryService(settings)
+    return CloudinaryService(settings)
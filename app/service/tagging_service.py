@@ -1,22 +1,40 @@
 from __future__ import annotations
 
+import time
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import NotFoundError, PermissionDeniedError
+from app.core.lru import LRUCache, unexpired
 from app.models.roles import UserRole
 from app.models.user import User
 from app.repository.photos_repository import PhotoRepository
 from app.repository.tags_repository import TagRepository
 
 
+# (limit, offset) -> (expires_at, items). Per process; запис тегів у цьому процесі скидає кеш,
+# в інших воркерах хмара оновиться не пізніше ніж через TTL.
+_cloud_cache: LRUCache[tuple[int, int], tuple[float, list[dict]]] = LRUCache(maxsize=64)
+
+
+def invalidate_tag_cloud() -> None:
+    _cloud_cache.clear()
+
+
+def tag_cloud_cache_stats() -> dict[str, int]:
+    return _cloud_cache.stats()
+
+
 class TaggingService:
     def __init__(self,
                  session: AsyncSession,
                  tags_repo: TagRepository,
-                 photos_repo: PhotoRepository):
+                 photos_repo: PhotoRepository,
+                 cloud_cache_ttl: float = 0.0):
         self.session = session
         self.tags = tags_repo
         self.photos = photos_repo
+        self.cloud_cache_ttl = cloud_cache_ttl
 
     async def get_photo_tags(self, *, photo_id: int) -> list[str]:
         photo = await self.photos.get_by_id(photo_id)
@@ -33,8 +51,14 @@ class TaggingService:
         if current_user.role != UserRole.admin and photo.user_id != current_user.id:
             raise PermissionDeniedError("Insufficient permissions")
 
-        async with self.session.begin():
-            return await self.tags.set_tags_for_photo(photo_id, tag_names, max_tags=5)
+        try:
+            names = await self.tags.set_tags_for_photo(photo_id, tag_names, max_tags=5)
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+        invalidate_tag_cloud()
+        return names
 
     def _parse_tags_csv(self, tags: str | None) -> list[str] | None:
         if not tags:
@@ -47,7 +71,16 @@ class TaggingService:
         return items[:5]
 
     async def get_tag_cloud(self, *, limit: int = 50, offset: int = 0) -> list[dict]:
+        key = (limit, offset)
+        if self.cloud_cache_ttl > 0:
+            entry = _cloud_cache.get(key, is_valid=unexpired)
+            if entry is not None:
+                return entry[1]
+
         items = await self.tags.list_cloud(limit=limit, offset=offset)
         # Повертаємо UI-friendly структуру, без ORM.
-        return [{"name": name, "count": count} for name, count in items]
+        cloud = [{"name": name, "count": count} for name, count in items]
+        if self.cloud_cache_ttl > 0:
+            _cloud_cache.set(key, (time.monotonic() + self.cloud_cache_ttl, cloud))
+        return cloud
 
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from typing import BinaryIO
+
+from fastapi import UploadFile
+
+from app.core.exceptions import UploadTooLargeError
+
+
+@dataclass(frozen=True)
+class SpooledUpload:
+    """
+    Uploaded file ready to be streamed to storage.
+    file — SpooledTemporaryFile (в пам'яті до ~1MB, далі на диску), позиція на початку.
+    """
+    file: BinaryIO
+    size: int
+    content_md5: str
+    filename: str | None = None
+
+
+async def spool_upload(upload: UploadFile, *, max_bytes: int, chunk_size: int = 64 * 1024) -> SpooledUpload:
+    """
+    Reads the multipart file chunk by chunk: enforces max_bytes and computes md5
+    without ever holding more than one chunk in process memory.
+
+    Starlette вже тримає файл у SpooledTemporaryFile, тому копію не робимо —
+    після перевірки повертаємо той самий file, перемотаний на початок.
+    """
+    digest = hashlib.md5(usedforsecurity=False)
+    size = 0
+    while chunk := await upload.read(chunk_size):
+        size += len(chunk)
+        if size > max_bytes:
+            raise UploadTooLargeError(f"File is larger than {max_bytes} bytes")
+        digest.update(chunk)
+
+    if size == 0:
+        raise ValueError("Empty file")
+
+    await upload.seek(0)
+    return SpooledUpload(file=upload.file, size=size, content_md5=digest.hexdigest(), filename=upload.filename)
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.auth.cache import invalidate_user
 from app.core.exceptions import PermissionDeniedError, ConflictError, NotFoundError
 from app.models.user import User
 from app.models.roles import UserRole
@@ -68,6 +69,7 @@ class UserService:
             )
         if not updated:
             raise NotFoundError("User not found")
+        invalidate_user(current_user.id)
 
         photos_count = 0
         if self.photos is not None:
@@ -84,6 +86,7 @@ class UserService:
 
         if not ok:
             raise NotFoundError("User not found")
+        invalidate_user(target_user_id)
 
         return UserBanResponse(user_id=target_user_id, is_active=False)
 
@@ -95,6 +98,7 @@ class UserService:
 
         if not ok:
             raise NotFoundError("User not found")
+        invalidate_user(target_user_id)
 
         return UserBanResponse(user_id=target_user_id, is_active=True)
 
@@ -107,6 +111,7 @@ class UserService:
                 raise NotFoundError("User not found")
             target.role = role
             await self.session.flush()
+        invalidate_user(target_user_id)
 
     async def list_users(self, *, limit: int = 200, offset: int = 0, current_user: User) -> list[User]:
         self._require_admin(current_user)
@@ -1,13 +1,14 @@
 from __future__ import annotations
 
 from fastapi import APIRouter, Depends, Request
+from app.core.errors import UIRoute
 from fastapi.responses import RedirectResponse
 
 from app.ui_routers.deps import get_templates, require_admin_ui
 from app.dependency.dependencies import user_service
 from app.service.users_service import UserService
 
-router = APIRouter(prefix="/admin", tags=["UI-Admin"])
+router = APIRouter(prefix="/admin", tags=["UI-Admin"], route_class=UIRoute)
 
 @router.get("/users")
 async def ui_admin_users(
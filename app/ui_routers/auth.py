@@ -1,13 +1,14 @@
 from __future__ import annotations
 
 from fastapi import APIRouter, Depends, Form, Request
+from app.core.errors import UIRoute
 from fastapi.responses import RedirectResponse
 from app.auth.service import AuthService
 from app.auth.service import InvalidCredentialsError, InactiveUserError
 from app.dependency.dependencies import auth_service
 from app.ui_routers.deps import get_templates, get_token_from_cookie, COOKIE_NAME
 
-router = APIRouter(prefix="/auth", tags=["UI-Auth"])
+router = APIRouter(prefix="/auth", tags=["UI-Auth"], route_class=UIRoute)
 
 @router.get("/login")
 async def ui_login_form(request: Request):
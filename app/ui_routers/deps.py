@@ -3,12 +3,10 @@ from __future__ import annotations
 from fastapi import Cookie, Depends, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.auth.security import decode_token
+from app.auth.dependencies import user_from_token
 from app.core.settings import Settings
 from fastapi.templating import Jinja2Templates
 from app.dependency.dependencies import get_session, get_settings
-from app.repository.token_repository import TokenBlacklistRepository
-from app.repository.users_repository import UserRepository
 
 
 COOKIE_NAME = "access_token"
@@ -25,24 +23,7 @@ async def get_current_user_ui(
     if not access_token:
         raise HTTPException(status_code=401, detail="Not authenticated")
 
-    try:
-        payload = decode_token(token=access_token, settings=settings)
-    except ValueError:
-        raise HTTPException(status_code=401, detail="Invalid token")
-
-    jti = payload.get("jti")
-    sub = payload.get("sub")
-    if not jti or not sub:
-        raise HTTPException(status_code=401, detail="Invalid token")
-
-    if await TokenBlacklistRepository(session).is_revoked(jti):
-        raise HTTPException(status_code=401, detail="Token revoked")
-
-    user = await UserRepository(session).get_by_id(int(sub))
-    if not user or not user.is_active:
-        raise HTTPException(status_code=401, detail="User inactive or not found")
-
-    return user
+    return await user_from_token(access_token, session, settings)
 
 def get_token_from_cookie(access_token: str | None = Cookie(default=None, alias=COOKIE_NAME)) -> str | None:
     return access_token
@@ -69,20 +50,6 @@ async def get_optional_user_ui(
     if not access_token:
         return None
     try:
-        payload = decode_token(token=access_token, settings=settings)
-    except ValueError:
+        return await user_from_token(access_token, session, settings)
+    except HTTPException:
         return None
-
-    jti = payload.get("jti")
-    sub = payload.get("sub")
-    if not jti or not sub:
-        return None
-
-    if await TokenBlacklistRepository(session).is_revoked(jti):
-        return None
-
-    user = await UserRepository(session).get_by_id(int(sub))
-    if not user or not user.is_active:
-        return None
-
-    return user
\ No newline at end of file
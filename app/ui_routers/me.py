@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 from fastapi import APIRouter, Depends, Request
+from app.core.errors import UIRoute
 
 from app.ui_routers.deps import get_templates, get_current_user_ui
 from app.dependency.dependencies import user_service
 from app.service.users_service import UserService
 
-router = APIRouter(tags=["UI-User"])
+router = APIRouter(tags=["UI-User"], route_class=UIRoute)
 
 @router.get("/me")
 async def ui_me(
@@ -1,17 +1,19 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, Form, Request, HTTPException
+from fastapi import APIRouter, Depends, Form, Request, HTTPException, Response, status
+from app.core.errors import UIRoute
+from app.core.exceptions import NotFoundError, PermissionDeniedError
 from fastapi.responses import RedirectResponse
 
 from app.ui_routers.deps import get_templates, get_current_user_ui
-from app.dependency.dependencies import share_service, cloudinary_service, photo_service
+from app.dependency.dependencies import share_service, photo_service
 from app.service.share_service import ShareService
-from app.service.cloudinary_service import CloudinaryService, build_transform_params
+from app.service.cloudinary_service import build_transform_params
 from app.service.photos_service import PhotoService
 from app.schemas.share_schema import TransformRequest, ShareCreateRequest, \
     TransformPreset  # якщо є; інакше зберемо вручну
 
-router = APIRouter(tags=["UI-PhotoExtras"])
+router = APIRouter(tags=["UI-PhotoExtras"], route_class=UIRoute)
 
 @router.post("/photos/{photo_id}/share")
 async def ui_create_share(
@@ -40,24 +42,51 @@ async def ui_share_qr(
     request: Request,
     photo_id: int,
     uuid: str,
+    current_user=Depends(get_current_user_ui),
     svc: ShareService = Depends(share_service),
 ):
-    png_b64 = await svc.make_public_qr(uuid=uuid)
+    try:
+        await svc.check_owner_link(photo_id=photo_id, uuid=uuid, current_user=current_user)
+    except NotFoundError as exc:
+        raise HTTPException(404, str(exc)) from exc
+    except PermissionDeniedError as exc:
+        raise HTTPException(403, str(exc)) from exc
+
     templates = get_templates(request)
     return templates.TemplateResponse(
         request,
-        "pages/photos/share_qr.html",
-        {"photo_id": photo_id, "uuid": uuid, "png_base64": png_b64},
+        "pages/qr.html",
+        {"photo_id": photo_id, "uuid": uuid},
     )
 
 
+@router.get("/photos/{photo_id}/share/qr.png")
+async def ui_share_qr_png(
+    photo_id: int,
+    uuid: str,
+    current_user=Depends(get_current_user_ui),
+    svc: ShareService = Depends(share_service),
+):
+    # не через /public/{uuid}/qr: перегляди власником не рахуються в статистиці посилання
+    try:
+        qr = await svc.get_owner_qr(photo_id=photo_id, uuid=uuid, current_user=current_user)
+    except NotFoundError as exc:
+        raise HTTPException(404, str(exc)) from exc
+    except PermissionDeniedError as exc:
+        raise HTTPException(403, str(exc)) from exc
+
+    if qr.png is None:
+        return RedirectResponse(url=qr.redirect_url, status_code=status.HTTP_307_TEMPORARY_REDIRECT)
+    return Response(content=qr.png, media_type="image/png", headers={"Cache-Control": "private, max-age=3600"})
+
+
 @router.post("/photos/{photo_id}/transform")
 async def ui_transform_preview(
     request: Request,
     photo_id: int,
     current_user=Depends(get_current_user_ui),
     photos: PhotoService = Depends(photo_service),
-    cloud: CloudinaryService = Depends(cloudinary_service),
+    share: ShareService = Depends(share_service),
 
     preset: str = Form(...),                     # REQUIRED
     width: int | None = Form(default=None),
@@ -84,7 +113,7 @@ async def ui_transform_preview(
     )
 
     params = build_transform_params(body)
-    url = cloud.build_transformed_url(public_id=photo.cloudinary_public_id, params=params)
+    url = (await share.get_transformed(photo, params)).image_url
 
     templates = get_templates(request)
     return templates.TemplateResponse(
@@ -1,17 +1,21 @@
 import uuid
-from fastapi import APIRouter, Depends, File, Form, Request, UploadFile
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, UploadFile
+from app.core.errors import UIRoute
 from fastapi.responses import RedirectResponse
 
+from app.core.exceptions import UploadTooLargeError
+from app.core.settings import Settings
 from app.ui_routers.deps import get_current_user_ui, get_templates
+from app.service.upload_spool import spool_upload
 
 from app.service.photos_service import PhotoService
 from app.service.comment_service import CommentService
 from app.service.rating_service import RatingService
 from app.service.tagging_service import TaggingService
 
-from app.dependency.dependencies import photo_service, comment_service, rating_service, tagging_service
+from app.dependency.dependencies import photo_service, comment_service, rating_service, tagging_service, get_settings
 
-router = APIRouter(tags=["UI-Photo"])
+router = APIRouter(tags=["UI-Photo"], route_class=UIRoute)
 
 def _parse_tags_csv(tags: str | None) -> list[str] | None:
     if not tags:
@@ -32,15 +36,25 @@ async def ui_upload_submit(
     tags: str | None = Form(default=None),
     current_user=Depends(get_current_user_ui),
     photos: PhotoService = Depends(photo_service),
+    settings: Settings = Depends(get_settings),
 ):
-    content = await file.read()
+    try:
+        spooled = await spool_upload(
+            file, max_bytes=settings.MAX_UPLOAD_BYTES, chunk_size=settings.UPLOAD_CHUNK_SIZE,
+        )
+    except UploadTooLargeError as exc:
+        raise HTTPException(status_code=413, detail=str(exc)) from exc
+    except ValueError as exc:
+        # порожній файл — як і в API (routers/photos.py)
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
     unique_url = str(uuid.uuid4())
     await photos.create_photo(
         user_id=current_user.id,
-        file=content,
+        file=spooled.file,
         photo_unique_url=unique_url,
         description=description,
         tags=_parse_tags_csv(tags),
+        content_md5=spooled.content_md5,
     )
     return RedirectResponse(url="/ui/", status_code=303)
 
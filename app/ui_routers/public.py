@@ -1,18 +1,22 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from app.core.errors import UIRoute
+from app.core.exceptions import InvalidCursorError, NotFoundError
+from app.core.pagination import next_photo_cursor
 from app.ui_routers.deps import get_templates, get_optional_user_ui
 
 from app.service.photos_service import PhotoService
 from app.service.tagging_service import TaggingService
-from app.service.rating_service import RatingService
-from app.service.comment_service import CommentService
 from app.service.users_service import UserService
+from app.service.photo_detail_service import PhotoDetailService
 
-from app.dependency.dependencies import photo_service, tagging_service, rating_service, comment_service, user_service  # :contentReference[oaicite:12]{index=12}
+from app.dependency.dependencies import (
+    photo_read_service, tagging_read_service, user_read_service, photo_detail_read_service,
+)
 
 
-router = APIRouter(tags=["UI-Public"])
+router = APIRouter(tags=["UI-Public"], route_class=UIRoute)
 
 @router.get("/")
 async def ui_index(
@@ -21,14 +25,21 @@ async def ui_index(
     tag: str | None = Query(default=None),
     sort: str = Query(default="newest"),
     page: int = Query(default=1, ge=1),
+    cursor: str | None = Query(default=None),
     current_user=Depends(get_optional_user_ui),
-    photos: PhotoService = Depends(photo_service),
-    tagging: TaggingService = Depends(tagging_service),
+    photos: PhotoService = Depends(photo_read_service),
+    tagging: TaggingService = Depends(tagging_read_service),
 ):
     limit = 20
     offset = (page - 1) * limit
 
-    items, total = await photos.search_photos(q=q, tag=tag, sort=sort, limit=limit, offset=offset)
+    # cursor має пріоритет над page: глибокі сторінки без OFFSET
+    try:
+        items, total = await photos.search_photos(
+            q=q, tag=tag, sort=sort, limit=limit, offset=offset, cursor=cursor,
+        )
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
     cloud = await tagging.get_tag_cloud(limit=50, offset=0)
 
     templates = get_templates(request)
@@ -41,6 +52,7 @@ async def ui_index(
             "tag_cloud": cloud,
             "current_user": current_user,
             "filters": {"q": q, "tag": tag, "sort": sort, "page": page},
+            "next_cursor": next_photo_cursor(items, sort=sort, limit=limit),
         },
     )
 
@@ -48,27 +60,24 @@ async def ui_index(
 async def ui_photo_detail(
     request: Request,
     photo_id: int,
-
-    photos: PhotoService = Depends(photo_service),
-    tagging: TaggingService = Depends(tagging_service),
-    rating: RatingService = Depends(rating_service),
-    comments: CommentService = Depends(comment_service),
+    details: PhotoDetailService = Depends(photo_detail_read_service),
 ):
-    photo = await photos.get_photo(photo_id)
-    tags = await tagging.get_photo_tags(photo_id=photo_id)
-    rating_stats = await rating.get_stats(photo_id=photo_id)
-    comment_items = await comments.list_for_photo(photo_id=photo_id, limit=50, offset=0)
+    # фото, теги, рейтинг і коментарі — одним loader-ом, фото читається один раз
+    try:
+        detail = await details.load(photo_id, comments_limit=50)
+    except NotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
     share_uuid = request.query_params.get("share_uuid")
 
     templates = get_templates(request)
     return templates.TemplateResponse(
         request,
-        "pages/photos/detail.html",
+        "pages/photo_detail.html",
         {
-            "photo": photo,
-            "tags": tags,
-            "rating": rating_stats,
-            "comments": comment_items,
+            "photo": detail.photo,
+            "tags": detail.tags,
+            "rating": detail.rating,
+            "comments": detail.comments,
             "share_uuid": share_uuid,
         },
     )
@@ -77,8 +86,8 @@ async def ui_photo_detail(
 async def ui_user_public(
     request: Request,
     username: str,
-    users: UserService = Depends(user_service),
-    photos: PhotoService = Depends(photo_service),
+    users: UserService = Depends(user_read_service),
+    photos: PhotoService = Depends(photo_read_service),
 ):
     profile = await users.get_public_profile_by_username(username)
     user_photos = await photos.list_by_user(profile.id, limit=20, offset=0)
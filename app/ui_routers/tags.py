@@ -1,15 +1,16 @@
 from __future__ import annotations
 
 from fastapi import APIRouter, Depends
-from app.dependency.dependencies import tagging_service
+from app.core.errors import UIRoute
+from app.dependency.dependencies import tagging_read_service
 from app.service.tagging_service import TaggingService
 
-router = APIRouter(tags=["UI-Tags"])
+router = APIRouter(tags=["UI-Tags"], route_class=UIRoute)
 
 @router.get("/tags/cloud")
 async def ui_tag_cloud(
     limit: int = 50,
     offset: int = 0,
-    svc: TaggingService = Depends(tagging_service),
+    svc: TaggingService = Depends(tagging_read_service),
 ):
     return await svc.get_tag_cloud(limit=limit, offset=offset)
\ No newline at end of file
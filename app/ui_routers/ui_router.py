@@ -1,4 +1,5 @@
 from fastapi import APIRouter
+from app.core.errors import UIRoute
 from app.ui_routers.tags import router as ui_tags_router
 from app.ui_routers.public import router as ui_public_router
 from app.ui_routers.auth import router as ui_auth_router
@@ -8,7 +9,7 @@ from app.ui_routers.photo_extras import router as photo_extras_router
 from app.ui_routers.admin import router as ui_admin_router
 
 def build_ui_router() -> APIRouter:
-    ui = APIRouter(prefix="/ui")
+    ui = APIRouter(prefix="/ui", route_class=UIRoute)
 
     # Тут централізовано підключаємо роутери
     ui.include_router(ui_public_router)
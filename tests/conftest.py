@@ -5,8 +5,11 @@ from types import SimpleNamespace
 load_dotenv(".env.test")
 os.environ["ENV"] = "test"
 
+import re
+
 import pytest
 from httpx import AsyncClient, ASGITransport
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import (
     create_async_engine,
     async_sessionmaker,
@@ -15,10 +18,15 @@ from sqlalchemy.ext.asyncio import (
 
 from app.main import app
 from app.models.base import Base
-from app.dependency.dependencies import get_session
+from app.dependency.dependencies import get_read_session, get_session
 from app.service.photos_service import PhotoService
 from app.repository.photos_repository import PhotoRepository
+from app.auth.cache import revoked_filter, user_cache
+from app.service.tagging_service import invalidate_tag_cloud
+from app.service.share_service import public_link_cache
+from app.service.link_hits import link_hits
 from app.auth.dependencies import get_current_user
+from app.database.query_stats import install_query_hooks
 from app.models.user import UserRole
 
 
@@ -30,6 +38,7 @@ async def engine():
         DATABASE_URL,
         echo=False,
     )
+    install_query_hooks(engine.sync_engine)
     yield engine
     await engine.dispose()
 
@@ -97,12 +106,66 @@ async def async_client():
     ) as client:
         yield client
 
+@pytest.fixture
+def query_budget():
+    """
+    query_budget(response, max_queries): перевіряє кількість SQL запиту з його Server-Timing.
+    """
+    def _check(response, max_queries: int) -> int:
+        match = re.search(r'db;dur=[\d.]+;desc="(\d+) queries"', response.headers.get("server-timing", ""))
+        assert match, f"no db Server-Timing in response: {response.headers}"
+        count = int(match.group(1))
+        assert count <= max_queries, f"{count} queries, budget {max_queries}"
+        return count
+
+    return _check
+
+class RecordedSql(list):
+    """
+    (statement, parameters) кожного SQL на тестовому engine; .statements — лише текст SQL.
+    """
+
+    @property
+    def statements(self) -> list[str]:
+        return [statement for statement, _ in self]
+
+
+@pytest.fixture
+def sql_statements(engine):
+    """
+    Records every statement while the test runs. Щоб рахувати лише свій виклик — clear() перед ним.
+    """
+    recorded = RecordedSql()
+
+    def _record(_conn, _cursor, statement, parameters, *_args):
+        recorded.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", _record)
+    yield recorded
+    event.remove(engine.sync_engine, "before_cursor_execute", _record)
+
+@pytest.fixture(autouse=True)
+def reset_process_caches():
+    # кеші per-process, а БД у кожному тесті нова (id користувачів повторюються)
+    user_cache.clear()
+    revoked_filter.reset()
+    invalidate_tag_cloud()
+    public_link_cache.clear()
+    link_hits.drain()
+    yield
+    user_cache.clear()
+    revoked_filter.reset()
+    invalidate_tag_cloud()
+    public_link_cache.clear()
+    link_hits.drain()
+
 @pytest.fixture(autouse=True)
 def override_get_session(db_session):
     async def _override():
         yield db_session
 
     app.dependency_overrides[get_session] = _override
+    app.dependency_overrides[get_read_session] = _override
     yield
     app.dependency_overrides.clear()
 
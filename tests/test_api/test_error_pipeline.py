@@ -0,0 +1,75 @@
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.staticfiles import StaticFiles
+from fastapi.templating import Jinja2Templates
+from httpx import ASGITransport, AsyncClient
+
+from app.core.errors import UIRoute, install_error_pipeline
+
+
+@pytest.mark.asyncio
+async def test_api_not_found_is_compact_json(async_client):
+    response = await async_client.get("/photos/by-unique/missing", headers={"accept": "text/html"})
+
+    assert response.status_code == 404
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == {"detail": "Photo not found"}
+
+
+@pytest.mark.asyncio
+async def test_api_validation_error_stays_json(async_client, override_current_user):
+    response = await async_client.get("/photos/not-a-number")
+
+    assert response.status_code == 422
+    assert response.headers["content-type"] == "application/json"
+
+
+@pytest.mark.asyncio
+async def test_ui_not_found_renders_page(async_client):
+    response = await async_client.get("/ui/photos/999999")
+
+    assert response.status_code == 404
+    assert response.headers["content-type"].startswith("text/html")
+    assert "Page not found." in response.text
+    assert "/static/css/site.css" in response.text
+
+
+@pytest.mark.asyncio
+async def test_unmatched_path_is_negotiated_by_accept(async_client):
+    html = await async_client.get("/no-such-page", headers={"accept": "text/html,application/xhtml+xml"})
+    api = await async_client.get("/no-such-page", headers={"accept": "application/json"})
+
+    assert html.status_code == api.status_code == 404
+    assert html.headers["content-type"].startswith("text/html")
+    assert api.json() == {"detail": "Not Found"}
+
+
+@pytest.fixture
+def failing_app():
+    app = FastAPI()
+    app.mount("/static", StaticFiles(directory="app/web/static"), name="static")
+    install_error_pipeline(app, Jinja2Templates(directory="app/web/templates"))
+
+    ui = APIRouter(prefix="/ui", route_class=UIRoute)
+
+    @ui.get("/boom")
+    async def ui_boom():
+        raise RuntimeError("boom")
+
+    @app.get("/api/boom")
+    async def api_boom():
+        raise RuntimeError("boom")
+
+    app.include_router(ui)
+    return app
+
+
+@pytest.mark.asyncio
+async def test_unhandled_error_is_rendered_by_route_kind(failing_app):
+    async with AsyncClient(transport=ASGITransport(app=failing_app), base_url="http://test") as client:
+        ui = await client.get("/ui/boom")
+        api = await client.get("/api/boom", headers={"accept": "text/html"})
+
+    assert ui.status_code == api.status_code == 500
+    assert "Something went wrong" in ui.text
+    assert api.json() == {"detail": "Internal Server Error"}
@@ -0,0 +1,82 @@
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from PIL import Image
+
+from app.core.settings import Settings
+from app.dependency.dependencies import storage_backend, transform_engine
+from app.main import app
+from app.service.image_transform import LocalTransformEngine
+from app.service.storage import LocalStorageService
+
+JPEG = b"\xff\xd8\xff\xe0" + b"\0" * 100
+
+
+def _png() -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGBA", (300, 300), (0, 0, 255, 128)).save(buf, "PNG")
+    return buf.getvalue()
+
+
+@pytest.fixture
+def local_storage(tmp_path):
+    settings = Settings(
+        STORAGE_BACKEND="local",
+        LOCAL_STORAGE_DIR=str(tmp_path / "media"),
+        TRANSFORM_CACHE_DIR=str(tmp_path / "cache"),
+    )
+    storage = LocalStorageService(settings)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        engine = LocalTransformEngine(storage, settings, executor=pool)
+        app.dependency_overrides[storage_backend] = lambda: storage
+        app.dependency_overrides[transform_engine] = lambda: engine
+        yield storage
+    app.dependency_overrides.pop(storage_backend, None)
+    app.dependency_overrides.pop(transform_engine, None)
+
+
+@pytest.mark.asyncio
+async def test_media_serves_local_original(async_client, local_storage):
+    upload = await local_storage.upload_photo(JPEG)
+
+    response = await async_client.get(upload["url"])
+
+    assert response.status_code == 200
+    assert response.content == JPEG
+    assert response.headers["content-type"] == "image/jpeg"
+    assert "immutable" in response.headers["cache-control"]
+    assert "etag" in response.headers
+
+
+@pytest.mark.asyncio
+async def test_media_missing_file_is_404(async_client, local_storage):
+    response = await async_client.get("/media/photoshare/missing")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_media_renders_transform_from_query(async_client, local_storage):
+    upload = await local_storage.upload_photo(_png())
+    url = local_storage.build_transformed_url(upload["public_id"], {"crop": "thumb", "width": 64, "height": 64})
+
+    response = await async_client.get(url)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/png"
+    with Image.open(io.BytesIO(response.content)) as img:
+        assert img.size == (64, 64)
+
+    bad = local_storage.build_transformed_url(upload["public_id"], {"effect": "cartoonify"})
+    assert (await async_client.get(bad)).status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_media_rejects_unsigned_or_tampered_transforms(async_client, local_storage):
+    upload = await local_storage.upload_photo(_png())
+    signed = local_storage.build_transformed_url(upload["public_id"], {"width": 64})
+
+    unsigned = await async_client.get(f"{upload['url']}?width=65")
+    tampered = await async_client.get(signed.replace("width=64", "width=65"))
+
+    assert unsigned.status_code == tampered.status_code == 403
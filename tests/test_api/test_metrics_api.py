@@ -0,0 +1,28 @@
+import pytest
+
+from app.core.metrics import _Metric
+
+
+@pytest.mark.asyncio
+async def test_metrics_exposes_route_latency_and_caches(async_client):
+    await async_client.get("/photos/by-unique/missing-photo")
+
+    response = await async_client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    # шаблон маршруту, а не сирий path
+    assert 'photoshare_http_request_duration_seconds_count{method="GET",route="/photos/by-unique/{photo_unique_url}"}' in text
+    assert 'photoshare_http_requests_total{method="GET",route="/photos/by-unique/{photo_unique_url}",status="404"}' in text
+    assert "missing-photo" not in text
+    assert "photoshare_http_requests_in_flight 1" in text  # сам /metrics
+    assert 'photoshare_cache_hit_ratio{cache="auth_user"}' in text
+    assert 'photoshare_cache_hits_total{cache="photo_url"}' in text
+    assert 'photoshare_cache_size{cache="tag_cloud"}' in text
+    assert "# TYPE photoshare_db_pool gauge" in text
+
+
+def test_metric_base_is_abstract():
+    with pytest.raises(TypeError):
+        _Metric("photoshare_x", "abstract")
@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models import Photo, PhotoTag, Tag, User
+
+
+async def _seed(db_session, photos_count: int) -> None:
+    base = datetime(2024, 1, 1)
+    db_session.add_all([
+        User(id=1, username="owner", email="owner@example.com", password_hash="x"),
+        Tag(id=1, name="sea"),
+        Tag(id=2, name="beach"),
+    ])
+    db_session.add_all([
+        Photo(
+            id=i, user_id=1, photo_unique_url=f"inc-{i}", cloudinary_public_id=f"p{i}",
+            rating_sum=4 * (i % 2), rating_count=i % 2, avg_rating=4.0 * (i % 2),
+            created_at=base + timedelta(minutes=i), updated_at=base,
+        )
+        for i in range(1, photos_count + 1)
+    ])
+    await db_session.flush()
+    db_session.add_all([PhotoTag(photo_id=i, tag_id=1 + i % 2) for i in range(1, photos_count + 1)])
+    db_session.add(PhotoTag(photo_id=1, tag_id=1))
+    await db_session.commit()
+
+
+@pytest.mark.asyncio
+async def test_list_includes_tags_rating_owner(async_client, db_session):
+    await _seed(db_session, 2)
+
+    response = await async_client.get("/photos/user/1/list", params={"include": "tags,rating,owner"})
+
+    assert response.status_code == 200
+    items = {item["id"]: item for item in response.json()["items"]}
+    assert items[1]["tags"] == ["beach", "sea"]
+    assert items[1]["rating"] == {"avg_rating": 4.0, "ratings_count": 1}
+    assert items[2]["tags"] == ["sea"]
+    assert items[2]["rating"] == {"avg_rating": None, "ratings_count": 0}
+    assert items[1]["owner"] == {"id": 1, "username": "owner"}
+
+
+@pytest.mark.asyncio
+async def test_list_without_include_has_no_extras(async_client, db_session):
+    await _seed(db_session, 1)
+
+    item = (await async_client.get("/photos/user/1/list")).json()["items"][0]
+
+    assert item["tags"] is None
+    assert item["rating"] is None
+    assert item["owner"] is None
+
+
+@pytest.mark.asyncio
+async def test_unknown_include_is_rejected(async_client):
+    response = await async_client.get("/photos/search", params={"include": "tags,likes"})
+
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_search_query_count_does_not_depend_on_page_size(async_client, db_session, sql_statements):
+    await _seed(db_session, 10)
+
+    sql_statements.clear()
+    small_resp = await async_client.get("/photos/search", params={"limit": 2, "include": "tags,rating,owner"})
+    small = len(sql_statements)
+    sql_statements.clear()
+    large_resp = await async_client.get("/photos/search", params={"limit": 10, "include": "tags,rating,owner"})
+    large = len(sql_statements)
+
+    assert len(small_resp.json()["items"]) == 2
+    assert len(large_resp.json()["items"]) == 10
+    assert small == large
@@ -0,0 +1,74 @@
+import hashlib
+import io
+from types import SimpleNamespace
+
+import pytest
+from fastapi import UploadFile
+
+from app.core.exceptions import UploadTooLargeError
+from app.core.settings import Settings
+from app.dependency.dependencies import storage_backend
+from app.main import app
+from app.service.cloudinary_service import FakeCloudinaryService
+from app.service.upload_spool import spool_upload
+from app.ui_routers.deps import get_current_user_ui
+
+
+@pytest.fixture
+def fake_storage():
+    app.dependency_overrides[storage_backend] = lambda: FakeCloudinaryService(Settings())
+    yield
+    app.dependency_overrides.pop(storage_backend, None)
+
+
+@pytest.mark.asyncio
+async def test_upload_streams_file_to_storage(async_client, override_current_user, fake_storage):
+    response = await async_client.post(
+        "/photos",
+        files={"file": ("cat.jpg", b"jpeg-bytes" * 1000, "image/jpeg")},
+        data={"description": "cat", "tags": ""},
+    )
+
+    assert response.status_code == 201
+    data = response.json()
+    assert data["description"] == "cat"
+    assert data["photo_url"].startswith("https://fake.local/")
+
+
+@pytest.mark.asyncio
+async def test_upload_over_limit_is_rejected_before_reading_body(async_client, override_current_user, fake_storage):
+    too_big = Settings().MAX_UPLOAD_BYTES + 1024 * 1024
+
+    response = await async_client.post(
+        "/photos",
+        files={"file": ("big.jpg", b"\0" * too_big, "image/jpeg")},
+    )
+
+    assert response.status_code == 413
+
+
+@pytest.mark.asyncio
+async def test_spool_upload_enforces_limit_and_hashes_incrementally():
+    upload = UploadFile(file=io.BytesIO(b"abc" * 10), filename="x.jpg")
+
+    spooled = await spool_upload(upload, max_bytes=100, chunk_size=7)
+    assert spooled.size == 30
+    assert spooled.content_md5 == hashlib.md5(b"abc" * 10).hexdigest()
+    assert spooled.file.read() == b"abc" * 10
+
+    with pytest.raises(UploadTooLargeError):
+        await spool_upload(UploadFile(file=io.BytesIO(b"x" * 101), filename="x.jpg"), max_bytes=100, chunk_size=7)
+
+
+@pytest.mark.asyncio
+async def test_ui_empty_upload_is_400(async_client, fake_storage):
+    app.dependency_overrides[get_current_user_ui] = lambda: SimpleNamespace(id=999, role="user", is_active=True)
+    try:
+        response = await async_client.post(
+            "/ui/photos/upload",
+            files={"file": ("empty.jpg", b"", "image/jpeg")},
+        )
+    finally:
+        app.dependency_overrides.pop(get_current_user_ui, None)
+
+    assert response.status_code == 400
@@ -0,0 +1,123 @@
+from datetime import datetime
+
+import pytest
+
+from app.core.settings import Settings
+from app.dependency.dependencies import get_settings
+from app.main import app
+from app.models import Photo, PublicLink
+from app.models.transformed_image import TransformedImage
+from app.service.link_hits import flush_link_hits, link_hits
+from app.core import lru
+from app.repository.public_links_repository import PublicLinkTarget
+from app.service.share_service import PublicLinkCache, public_link_cache
+
+
+@pytest.fixture
+async def link(db_session):
+    db_session.add(Photo(
+        id=1, user_id=999, photo_unique_url="pub-1", cloudinary_public_id="photoshare/abc",
+        created_at=datetime(2024, 1, 1), updated_at=datetime(2024, 1, 1),
+    ))
+    await db_session.flush()
+    ti = TransformedImage(photo_id=1, params_hash="0" * 64, image_url="https://cdn.example/w_200/abc")
+    db_session.add(ti)
+    await db_session.flush()
+    db_session.add(PublicLink(uuid="hot", transformed_image_id=ti.id, qr_code_url="https://cdn.example/qr/x"))
+    await db_session.commit()
+    return "hot"
+
+
+@pytest.mark.asyncio
+async def test_public_link_resolves_in_one_query_then_from_cache(async_client, link, query_budget):
+    first = await async_client.get(f"/public/{link}", follow_redirects=False)
+    assert first.status_code == 307
+    assert first.headers["location"] == "https://cdn.example/w_200/abc"
+    assert query_budget(first, 1) == 1
+
+    second = await async_client.get(f"/public/{link}", follow_redirects=False)
+    assert second.status_code == 307
+    assert second.headers["location"] == first.headers["location"]
+    assert query_budget(second, 0) == 0
+
+
+@pytest.mark.asyncio
+async def test_unknown_public_link_is_negatively_cached(async_client, query_budget):
+    first = await async_client.get("/public/nope", follow_redirects=False)
+    second = await async_client.get("/public/nope", follow_redirects=False)
+
+    assert first.status_code == second.status_code == 404
+    assert query_budget(first, 1) == 1
+    assert query_budget(second, 0) == 0
+
+
+@pytest.mark.asyncio
+async def test_public_link_cache_disabled_with_zero_ttl(async_client, link, query_budget):
+    app.dependency_overrides[get_settings] = lambda: Settings(
+        PUBLIC_LINK_CACHE_TTL_SECONDS=0, PUBLIC_LINK_NEGATIVE_TTL_SECONDS=0,
+    )
+    try:
+        await async_client.get(f"/public/{link}", follow_redirects=False)
+        again = await async_client.get(f"/public/{link}", follow_redirects=False)
+    finally:
+        app.dependency_overrides.pop(get_settings, None)
+
+    assert again.status_code == 307
+    assert query_budget(again, 1) == 1
+
+
+@pytest.mark.asyncio
+async def test_deleting_photo_evicts_its_public_links(async_client, link, override_current_user):
+    assert (await async_client.get(f"/public/{link}", follow_redirects=False)).status_code == 307
+    assert public_link_cache.get(link)[0]
+
+    deleted = await async_client.delete("/photos/1")
+    assert deleted.status_code in (200, 204)
+
+    assert public_link_cache.get(link) == (False, None)
+
+
+@pytest.mark.asyncio
+async def test_share_stats_count_buffered_hits_after_flush(
+    async_client, db_session, link, override_current_user, query_budget,
+):
+    await async_client.get(f"/public/{link}", follow_redirects=False)
+    hit = await async_client.get(f"/public/{link}", follow_redirects=False)
+    # hot path нічого не пише: hit із кешу — 0 запитів
+    assert query_budget(hit, 0) == 0
+    assert len(link_hits) == 1
+
+    before = await async_client.get("/photos/1/share/stats")
+    assert before.json()["links"][0]["views"] == 0
+
+    await flush_link_hits(db_session, batch_size=100)
+
+    response = await async_client.get("/photos/1/share/stats")
+    assert response.status_code == 200
+    [stats] = response.json()["links"]
+    assert stats["uuid"] == link
+    assert (stats["views"], stats["qr_views"]) == (2, 0)
+    assert stats["last_hit_at"] is not None
+
+
+@pytest.mark.asyncio
+async def test_share_stats_owner_only(async_client, link, override_current_user):
+    override_current_user.id = 1
+
+    response = await async_client.get("/photos/1/share/stats")
+
+    assert response.status_code == 403
+
+
+def test_expired_public_link_counts_as_miss(monkeypatch):
+    cache = PublicLinkCache()
+    now = 1000.0
+    monkeypatch.setattr(lru.time, "monotonic", lambda: now)
+    cache.set("hot", PublicLinkTarget("https://cdn.example/x", 1), ttl=10)
+
+    assert cache.get("hot") == (True, PublicLinkTarget("https://cdn.example/x", 1))
+    now += 10
+    assert cache.get("hot") == (False, None)
+
+    # протермінований запис — miss, а не hit + промах
+    assert cache.stats() == {"size": 0, "maxsize": 50_000, "hits": 1, "misses": 1}
@@ -0,0 +1,200 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import delete, select
+
+from app.core.settings import Settings
+from app.dependency.dependencies import storage_backend
+from app.main import app
+from app.models import Photo, PublicLink
+from app.models.transformed_image import TransformedImage
+from app.service import qr_service as qr_module
+from app.service import share_service as share_module
+from app.service.link_hits import link_hits
+from app.service.cloudinary_service import FakeCloudinaryService
+from app.service.storage import LocalStorageService
+from app.ui_routers.deps import get_current_user_ui
+
+PNG_MAGIC = b"\x89PNG\r\n\x1a\n"
+
+
+@pytest.fixture(autouse=True)
+def _clear_share_caches():
+    share_module._qr_cache.clear()
+    share_module._transformed_cache.clear()
+    yield
+    share_module._qr_cache.clear()
+    share_module._transformed_cache.clear()
+
+
+@pytest.fixture
+def local_storage(tmp_path):
+    storage = LocalStorageService(Settings(STORAGE_BACKEND="local", LOCAL_STORAGE_DIR=str(tmp_path / "media")))
+    app.dependency_overrides[storage_backend] = lambda: storage
+    yield storage
+    app.dependency_overrides.pop(storage_backend, None)
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    calls = []
+    original = qr_module.render_qr_png
+
+    def _counting(data):
+        calls.append(data)
+        return original(data)
+
+    monkeypatch.setattr(qr_module, "render_qr_png", _counting)
+    return calls
+
+
+@pytest.fixture
+async def photo(db_session):
+    db_session.add(Photo(
+        id=1, user_id=999, photo_unique_url="qr-1", cloudinary_public_id="photoshare/abc",
+        created_at=datetime(2024, 1, 1), updated_at=datetime(2024, 1, 1),
+    ))
+    await db_session.commit()
+
+
+@pytest.mark.asyncio
+async def test_share_stores_qr_once_and_serves_png(
+    async_client, db_session, override_current_user, local_storage, photo, renders,
+):
+    created = await async_client.post("/photos/1/share", json={"transform_params": {}})
+    assert created.status_code == 200
+    uuid = created.json()["uuid"]
+
+    link = (await db_session.execute(select(PublicLink).where(PublicLink.uuid == uuid))).scalar_one()
+    public_id = local_storage.public_id_for(link.qr_code_url)
+    assert public_id is not None and public_id.startswith("qr/")
+    assert local_storage.path_for(public_id).read_bytes().startswith(PNG_MAGIC)
+
+    response = await async_client.get(f"/public/{uuid}/qr")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/png"
+    assert response.headers["etag"] == f'"qr-{uuid}"'
+    assert "no-cache" in response.headers["cache-control"]
+    assert response.content.startswith(PNG_MAGIC)
+
+    # інший воркер (порожній кеш) читає збережений файл, а не рендерить заново
+    share_module._qr_cache.clear()
+    again = await async_client.get(f"/public/{uuid}/qr")
+    assert again.content == response.content
+    assert renders == [f"/public/{uuid}"]
+
+    not_modified = await async_client.get(f"/public/{uuid}/qr", headers={"If-None-Match": f'"qr-{uuid}"'})
+    assert not_modified.status_code == 304
+    # ревалідація — теж показ QR
+    assert link_hits.drain() == {uuid: (0, 3)}
+
+
+@pytest.mark.asyncio
+async def test_remote_storage_qr_redirects_on_cache_miss(async_client, db_session, override_current_user, photo):
+    storage = FakeCloudinaryService(Settings(FAKE_STORAGE_LATENCY_MS=0))
+    app.dependency_overrides[storage_backend] = lambda: storage
+    try:
+        uuid = (await async_client.post("/photos/1/share", json={"transform_params": {}})).json()["uuid"]
+        share_module._qr_cache.clear()
+
+        response = await async_client.get(f"/public/{uuid}/qr", follow_redirects=False)
+    finally:
+        app.dependency_overrides.pop(storage_backend, None)
+
+    assert response.status_code == 307
+    assert response.headers["location"].startswith("https://fake.local/qr/")
+
+
+@pytest.mark.asyncio
+async def test_legacy_link_qr_is_generated_and_stored_on_first_hit(
+    async_client, db_session, local_storage, photo, renders,
+):
+    ti = TransformedImage(photo_id=1, params_hash="0" * 64, image_url="/media/photoshare/abc")
+    db_session.add(ti)
+    await db_session.flush()
+    db_session.add(PublicLink(uuid="legacy", transformed_image_id=ti.id, qr_code_url="/public/legacy/qr"))
+    await db_session.commit()
+
+    first = await async_client.get("/public/legacy/qr")
+    second = await async_client.get("/public/legacy/qr")
+
+    assert first.status_code == second.status_code == 200
+    assert first.content.startswith(PNG_MAGIC)
+    assert renders == ["/public/legacy"]
+    link = (await db_session.execute(select(PublicLink).where(PublicLink.uuid == "legacy"))).scalar_one()
+    assert local_storage.public_id_for(link.qr_code_url).startswith("qr/")
+
+
+@pytest.mark.asyncio
+async def test_unknown_uuid_qr_is_404(async_client):
+    response = await async_client.get("/public/missing/qr")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_deleted_photo_stops_serving_cached_qr(
+    async_client, db_session, override_current_user, local_storage, photo,
+):
+    uuid = (await async_client.post("/photos/1/share", json={"transform_params": {}})).json()["uuid"]
+    assert (await async_client.get(f"/public/{uuid}/qr")).status_code == 200
+    link_hits.drain()
+
+    assert (await async_client.delete("/photos/1")).status_code in (200, 204)
+    # sqlite у тестах без PRAGMA foreign_keys: CASCADE, як у Postgres, робимо вручну
+    await db_session.execute(delete(PublicLink))
+    await db_session.commit()
+
+    response = await async_client.get(f"/public/{uuid}/qr")
+    assert response.status_code == 404
+    assert uuid not in share_module._qr_cache
+    assert len(link_hits) == 0
+
+
+@pytest.fixture
+def ui_user(override_current_user):
+    app.dependency_overrides[get_current_user_ui] = lambda: override_current_user
+    yield override_current_user
+    app.dependency_overrides.pop(get_current_user_ui, None)
+
+
+@pytest.mark.asyncio
+async def test_owner_share_page_serves_qr_without_counting_a_view(async_client, ui_user, local_storage, photo):
+    uuid = (await async_client.post("/photos/1/share", json={"transform_params": {}})).json()["uuid"]
+
+    page = await async_client.get("/ui/photos/1/share/qr", params={"uuid": uuid})
+    assert page.status_code == 200
+    assert f'src="/ui/photos/1/share/qr.png?uuid={uuid}"' in page.text
+
+    image = await async_client.get("/ui/photos/1/share/qr.png", params={"uuid": uuid})
+    assert image.status_code == 200
+    assert image.headers["content-type"] == "image/png"
+    assert "private" in image.headers["cache-control"]
+    assert image.content.startswith(PNG_MAGIC)
+    assert len(link_hits) == 0
+
+
+@pytest.mark.asyncio
+async def test_owner_share_qr_checks_owner_and_link_photo(async_client, db_session, ui_user, local_storage, photo):
+    uuid = (await async_client.post("/photos/1/share", json={"transform_params": {}})).json()["uuid"]
+    db_session.add(Photo(
+        id=2, user_id=999, photo_unique_url="qr-2", cloudinary_public_id="photoshare/def",
+        created_at=datetime(2024, 1, 1), updated_at=datetime(2024, 1, 1),
+    ))
+    await db_session.commit()
+
+    # uuid належить фото 1, не 2
+    for path in ("/ui/photos/2/share/qr", "/ui/photos/2/share/qr.png"):
+        assert (await async_client.get(path, params={"uuid": uuid})).status_code == 404
+
+    ui_user.id = 1
+    for path in ("/ui/photos/1/share/qr", "/ui/photos/1/share/qr.png"):
+        assert (await async_client.get(path, params={"uuid": uuid})).status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_owner_share_qr_requires_login(async_client, override_current_user, local_storage, photo):
+    uuid = (await async_client.post("/photos/1/share", json={"transform_params": {}})).json()["uuid"]
+
+    response = await async_client.get("/ui/photos/1/share/qr.png", params={"uuid": uuid})
+
+    assert response.status_code == 401
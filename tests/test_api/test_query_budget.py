@@ -0,0 +1,44 @@
+import pytest
+
+from app.models import Photo, PhotoTag, Tag, User
+
+
+@pytest.fixture
+async def seeded(db_session):
+    db_session.add_all([
+        User(id=1, username="owner", email="owner@example.com", password_hash="x"),
+        Tag(id=1, name="sea"),
+    ])
+    db_session.add_all([
+        Photo(id=i, user_id=1, photo_unique_url=f"budget-{i}", cloudinary_public_id=f"p{i}")
+        for i in range(1, 21)
+    ])
+    await db_session.flush()
+    db_session.add_all([PhotoTag(photo_id=i, tag_id=1) for i in range(1, 21)])
+    await db_session.commit()
+
+
+@pytest.mark.asyncio
+async def test_search_with_includes_budget(async_client, seeded, query_budget):
+    response = await async_client.get("/photos/search", params={"include": "tags,rating,owner"})
+
+    assert response.status_code == 200
+    # сторінка з total, теги, власники
+    query_budget(response, 3)
+
+
+@pytest.mark.asyncio
+async def test_photo_by_unique_url_budget(async_client, seeded, query_budget):
+    response = await async_client.get("/photos/by-unique/budget-1")
+
+    assert response.status_code == 200
+    query_budget(response, 1)
+
+
+@pytest.mark.asyncio
+async def test_user_list_budget(async_client, seeded, query_budget):
+    response = await async_client.get("/photos/user/1/list", params={"include": "tags"})
+
+    assert response.status_code == 200
+    # сторінка, count, теги
+    query_budget(response, 3)
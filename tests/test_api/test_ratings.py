@@ -1,6 +1,8 @@
 import pytest
 from datetime import datetime, UTC
 
+from app.dependency.dependencies import get_read_session, get_session
+from app.main import app
 from app.models.photo import Photo
 from app.models.rating import Rating
 
@@ -134,4 +136,32 @@ async def test_moderator_can_delete_rating(
 
     response = await async_client.delete("/ratings/1")
 
-    assert response.status_code == 204
\ No newline at end of file
+    assert response.status_code == 204
+
+@pytest.mark.asyncio
+async def test_rating_stats_reads_use_read_session(async_client, db_session):
+    db_session.add(Photo(
+        id=1, user_id=1, photo_unique_url="rating-read", cloudinary_public_id="dummy",
+        avg_rating=4.5, rating_count=2, created_at=datetime.now(UTC), updated_at=datetime.now(UTC),
+    ))
+    await db_session.commit()
+
+    used = []
+
+    async def _read():
+        used.append("read")
+        yield db_session
+
+    async def _primary():
+        used.append("primary")
+        yield db_session
+
+    app.dependency_overrides[get_read_session] = _read
+    app.dependency_overrides[get_session] = _primary
+
+    for path in ("/photos/1/rating", "/ratings/photos/1"):
+        response = await async_client.get(path)
+        assert response.status_code == 200
+        assert response.json()["photo_id"] == 1
+
+    assert used == ["read", "read"]
@@ -0,0 +1,50 @@
+import pytest
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.middleware import ReadYourWritesMiddleware
+from app.database import db
+from app.database.db import get_async_read_session
+
+
+@pytest.fixture
+async def routed_app(tmp_path, monkeypatch):
+    primary = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}")
+    replica = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}")
+    monkeypatch.setattr(db, "_sessionmaker", async_sessionmaker(primary, class_=AsyncSession))
+    monkeypatch.setattr(db, "_read_sessionmaker", async_sessionmaker(replica, class_=AsyncSession))
+
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware, pin_seconds=5)
+
+    def _target(session: AsyncSession) -> str:
+        return "primary" if session.bind is primary else "replica"
+
+    @app.get("/read")
+    async def read(session: AsyncSession = Depends(get_async_read_session)):
+        return {"db": _target(session)}
+
+    @app.post("/write")
+    async def write(session: AsyncSession = Depends(get_async_read_session)):
+        return {"db": _target(session)}
+
+    yield app
+    await primary.dispose()
+    await replica.dispose()
+
+
+@pytest.mark.asyncio
+async def test_reads_go_to_replica_until_own_write(routed_app):
+    async with AsyncClient(transport=ASGITransport(app=routed_app), base_url="http://test") as client:
+        assert (await client.get("/read")).json() == {"db": "replica"}
+
+        write = await client.post("/write")
+        assert write.json() == {"db": "primary"}
+        assert "rw_pin=1" in write.headers["set-cookie"]
+
+        # той самий клієнт (з cookie) після мутації читає з primary
+        assert (await client.get("/read")).json() == {"db": "primary"}
+
+    async with AsyncClient(transport=ASGITransport(app=routed_app), base_url="http://test") as other:
+        assert (await other.get("/read")).json() == {"db": "replica"}
@@ -2,7 +2,7 @@ import pytest
 from datetime import datetime
 
 from app.models.photo import Photo
-from app.mappers.photo_mapper import map_photo_to_read
+from app.mappers.photo_mapper import map_photo_to_read, map_photos_to_read, url_cache_stats
 
 
 class FakeCloudinary:
@@ -70,4 +70,38 @@ def test_map_photo_without_public_id_raises():
     fake_cloudinary = FakeCloudinary()
 
     with pytest.raises(ValueError):
-        map_photo_to_read(photo, fake_cloudinary)
\ No newline at end of file
+        map_photo_to_read(photo, fake_cloudinary)
+
+class CountingCloudinary(FakeCloudinary):
+    def __init__(self):
+        self.calls = 0
+
+    def build_transformed_url(self, public_id: str, params: dict) -> str:
+        self.calls += 1
+        return super().build_transformed_url(public_id, params)
+
+
+def test_map_photos_to_read_builds_each_url_once():
+    photos = [
+        Photo(
+            id=i,
+            user_id=1,
+            photo_unique_url=f"batch-{i}",
+            cloudinary_public_id=f"batch-public-{i % 2}",
+            description=None,
+            created_at=datetime(2024, 1, 1),
+            updated_at=datetime(2024, 1, 1),
+        )
+        for i in range(4)
+    ]
+    cloud = CountingCloudinary()
+
+    first = map_photos_to_read(photos, cloud)
+    second = map_photos_to_read(photos, cloud)
+
+    assert [r.id for r in first] == [0, 1, 2, 3]
+    assert first[2].photo_url == "https://fake.cloud/batch-public-0"
+    assert second == first
+    # 2 унікальні public_id -> 2 виклики, друга сторінка повністю з кешу
+    assert cloud.calls == 2
+    assert url_cache_stats()["hits"] >= 2
@@ -0,0 +1,85 @@
+import pytest
+from fastapi import HTTPException
+
+from app.auth.cache import BloomFilter, user_cache
+from app.auth.dependencies import user_from_token
+from app.auth.service import AuthService
+from app.core.settings import Settings
+from app.repository.token_repository import TokenBlacklistRepository
+from app.repository.users_repository import UserRepository
+from app.service.users_service import UserService
+
+
+@pytest.fixture
+def settings():
+    return Settings()
+
+
+@pytest.fixture
+async def tokens(db_session, settings):
+    auth = AuthService(
+        session=db_session,
+        users=UserRepository(db_session),
+        blacklist=TokenBlacklistRepository(db_session),
+        settings=settings,
+    )
+    admin_token = await auth.register(username="admin", email="admin@example.com", password="password123")
+    user_token = await auth.register(username="user", email="user@example.com", password="password123")
+    await db_session.commit()
+    return auth, admin_token, user_token
+
+
+@pytest.mark.asyncio
+async def test_repeat_auth_hits_no_database(db_session, settings, tokens, sql_statements):
+    _, _, user_token = tokens
+
+    sql_statements.clear()
+    first = await user_from_token(user_token, db_session, settings)
+    queries_after_first = len(sql_statements)
+    db_session.expunge_all()
+    second = await user_from_token(user_token, db_session, settings)
+
+    assert second.id == first.id
+    assert second.username == "user"
+    assert queries_after_first > 0
+    assert len(sql_statements) == queries_after_first
+
+
+@pytest.mark.asyncio
+async def test_logout_revokes_immediately(db_session, settings, tokens):
+    auth, _, user_token = tokens
+    await user_from_token(user_token, db_session, settings)  # фільтр завантажено до logout
+
+    await auth.logout(user_token)
+
+    with pytest.raises(HTTPException) as exc:
+        await user_from_token(user_token, db_session, settings)
+    assert exc.value.detail == "Token revoked"
+
+
+@pytest.mark.asyncio
+async def test_ban_invalidates_cached_user(db_session, settings, tokens):
+    _, admin_token, user_token = tokens
+    user = await user_from_token(user_token, db_session, settings)
+    admin = await user_from_token(admin_token, db_session, settings)
+    assert user_cache.get(user.id) is not None
+    await db_session.commit()
+
+    users = UserService(session=db_session, users_repo=UserRepository(db_session))
+    await users.ban_user(target_user_id=user.id, current_user=admin)
+
+    assert user_cache.get(user.id) is None
+    with pytest.raises(HTTPException) as exc:
+        await user_from_token(user_token, db_session, settings)
+    assert exc.value.status_code == 401
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000)
+    items = [f"jti-{i}" for i in range(1000)]
+    for item in items:
+        bloom.add(item)
+
+    assert all(item in bloom for item in items)
+    false_positives = sum(f"other-{i}" in bloom for i in range(10_000))
+    assert false_positives < 100
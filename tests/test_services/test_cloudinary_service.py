@@ -0,0 +1,85 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.core.exceptions import StorageError
+from app.core.settings import Settings
+from app.dependency import dependencies
+from app.service.cloudinary_service import CloudinaryService, FakeCloudinaryService, close_http_client
+
+
+def _service(handler) -> CloudinaryService:
+    http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return CloudinaryService(Settings(), http=http, slots=asyncio.Semaphore(2))
+
+
+@pytest.mark.asyncio
+async def test_upload_sends_signed_multipart_request():
+    seen = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen["url"] = str(request.url)
+        seen["body"] = request.read()
+        return httpx.Response(200, json={"secure_url": "https://cdn/x.jpg", "public_id": "photoshare/x"})
+
+    result = await _service(handler).upload_photo(b"\x89PNG-bytes")
+
+    assert result == {"url": "https://cdn/x.jpg", "public_id": "photoshare/x"}
+    assert seen["url"].endswith("/v1_1/fakename/image/upload")
+    assert b"signature" in seen["body"]
+    assert b"\x89PNG-bytes" in seen["body"]
+
+
+@pytest.mark.asyncio
+async def test_timeout_is_reported_as_storage_error():
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ReadTimeout("slow", request=request)
+
+    with pytest.raises(StorageError):
+        await _service(handler).upload_photo(b"data")
+
+
+@pytest.mark.asyncio
+async def test_delete_treats_not_found_as_ok():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"result": "not found"})
+
+    await _service(handler).delete_photo("photoshare/missing")
+
+
+@pytest.mark.asyncio
+async def test_fake_backend_roundtrip():
+    fake = FakeCloudinaryService(Settings())
+
+    upload = await fake.upload_photo(b"data")
+    assert FakeCloudinaryService._store[upload["public_id"]] == b"data"
+
+    await fake.delete_photo(upload["public_id"])
+    assert upload["public_id"] not in FakeCloudinaryService._store
+
+
+@pytest.mark.asyncio
+async def test_storage_backend_is_built_once_per_process(monkeypatch):
+    built = []
+    monkeypatch.setattr(dependencies, "build_storage_backend", lambda settings: built.append(settings) or object())
+    dependencies._shared_storage_backend.cache_clear()
+    try:
+        first = dependencies.storage_backend()
+        second = dependencies.storage_backend()
+    finally:
+        dependencies._shared_storage_backend.cache_clear()
+
+    assert first is second
+    assert len(built) == 1
+
+
+@pytest.mark.asyncio
+async def test_shared_service_picks_up_reopened_http_pool():
+    service = CloudinaryService(Settings())
+    before = service.http
+
+    await close_http_client()
+
+    assert service.http is not before
+    await close_http_client()
@@ -0,0 +1,54 @@
+import pytest
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.settings import Settings
+from app.database.db import InstrumentedQueuePool, _engine_options
+
+
+def test_engine_options_come_from_settings():
+    settings = Settings(
+        DB_DRIVER="postgresql+asyncpg",
+        DB_POOL_SIZE=7,
+        DB_MAX_OVERFLOW=3,
+        DB_STATEMENT_CACHE_SIZE=0,
+        DB_STATEMENT_TIMEOUT_MS=5000,
+    )
+
+    options = _engine_options(settings)
+
+    assert options["poolclass"] is InstrumentedQueuePool
+    assert options["pool_size"] == 7
+    assert options["max_overflow"] == 3
+    assert options["connect_args"] == {
+        "statement_cache_size": 0,
+        "server_settings": {"statement_timeout": "5000"},
+    }
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_report_checkouts_and_timeouts(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    try:
+        async with engine.connect() as held:
+            await held.execute(text("SELECT 1"))
+            stats = engine.pool.stats()
+            assert stats["checked_out"] == 1
+
+            with pytest.raises(exc.TimeoutError):
+                async with engine.connect():
+                    pass
+
+        stats = engine.pool.stats()
+        assert stats["checked_out"] == 0
+        assert stats["checkouts"] == 2
+        assert stats["timeouts"] == 1
+        assert stats["wait_max_ms"] >= 50
+    finally:
+        await engine.dispose()
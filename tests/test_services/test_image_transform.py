@@ -0,0 +1,153 @@
+import asyncio
+import io
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+from PIL import Image
+
+from app.core.exceptions import ImageTransformError
+from app.core.settings import Settings
+from app.schemas.share_schema import TransformPreset, TransformRequest
+from app.service import image_transform
+from app.service.cloudinary_service import build_transform_params
+from app.service.image_transform import LocalTransformEngine, canonical_params, prune_cache
+
+
+def _jpeg(size=(400, 200), color=(200, 30, 30)) -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", size, color).save(buf, "JPEG")
+    return buf.getvalue()
+
+
+@pytest.fixture
+def settings(tmp_path):
+    return Settings(
+        STORAGE_BACKEND="local",
+        LOCAL_STORAGE_DIR=str(tmp_path / "media"),
+        TRANSFORM_CACHE_DIR=str(tmp_path / "cache"),
+    )
+
+
+@pytest.fixture
+def transform_engine(settings):
+    from app.service.storage import LocalStorageService
+
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        yield LocalTransformEngine(LocalStorageService(settings), settings, executor=pool)
+
+
+def test_canonical_params_normalizes_query_strings():
+    assert canonical_params({"width": "100", "crop": "fill", "angle": "-90"}) == {
+        "angle": 270, "crop": "fill", "width": 100,
+    }
+    with pytest.raises(ImageTransformError):
+        canonical_params({"width": "5000"})
+    with pytest.raises(ImageTransformError):
+        canonical_params({"effect": "cartoonify"})
+
+
+@pytest.mark.parametrize("preset,expected_size", [
+    (TransformPreset.thumb, (200, 200)),
+    (TransformPreset.fit, (800, 400)),
+    (TransformPreset.crop, (800, 800)),
+    (TransformPreset.grayscale, (400, 200)),
+    (TransformPreset.sepia, (400, 200)),
+    (TransformPreset.blur, (400, 200)),
+    (TransformPreset.rotate, (200, 400)),
+])
+@pytest.mark.asyncio
+async def test_presets_render_locally(transform_engine, preset, expected_size):
+    upload = await transform_engine.storage.upload_photo(_jpeg())
+    params = build_transform_params(TransformRequest(preset=preset))
+
+    path = await transform_engine.render(upload["public_id"], params)
+
+    with Image.open(path) as img:
+        assert img.size == expected_size
+        if preset == TransformPreset.grayscale:
+            r, g, b = img.getpixel((10, 10))
+            assert abs(r - g) < 3 and abs(g - b) < 3
+
+
+@pytest.mark.asyncio
+async def test_render_is_cached_by_content_key(transform_engine):
+    upload = await transform_engine.storage.upload_photo(_jpeg())
+
+    first = await transform_engine.render(upload["public_id"], {"width": 100, "crop": "scale"})
+    mtime = first.stat().st_mtime_ns
+    # ті самі параметри з query string (str) -> той самий файл без повторного рендеру
+    second = await transform_engine.render(upload["public_id"], {"crop": "scale", "width": "100"})
+
+    assert second == first
+    assert second.stat().st_mtime_ns == mtime
+    assert first.is_relative_to(transform_engine.cache_dir)
+
+
+@pytest.fixture
+def thread_engine(settings):
+    from app.service.storage import LocalStorageService
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        yield LocalTransformEngine(LocalStorageService(settings), settings, executor=pool)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_does_not_strand_waiting_requests(thread_engine, monkeypatch):
+    upload = await thread_engine.storage.upload_photo(_jpeg())
+    release = threading.Event()
+    original = image_transform.render_to_file
+
+    def _slow(src, dst, params):
+        release.wait(5)
+        original(src, dst, params)
+
+    monkeypatch.setattr(image_transform, "render_to_file", _slow)
+    params = {"width": 50, "crop": "scale"}
+    leader = asyncio.create_task(thread_engine.render(upload["public_id"], params))
+    await asyncio.sleep(0.05)
+    follower = asyncio.create_task(thread_engine.render(upload["public_id"], params))
+    await asyncio.sleep(0.05)
+
+    leader.cancel()
+    release.set()
+    path = await asyncio.wait_for(follower, timeout=5)
+
+    with Image.open(path) as img:
+        assert img.width == 50
+
+
+@pytest.mark.asyncio
+async def test_waiting_requests_get_transform_error_too(thread_engine, monkeypatch):
+    upload = await thread_engine.storage.upload_photo(_jpeg())
+    release = threading.Event()
+
+    def _broken(src, dst, params):
+        release.wait(5)
+        raise OSError("truncated image")
+
+    monkeypatch.setattr(image_transform, "render_to_file", _broken)
+    params = {"width": 50}
+    leader = asyncio.create_task(thread_engine.render(upload["public_id"], params))
+    await asyncio.sleep(0.05)
+    follower = asyncio.create_task(thread_engine.render(upload["public_id"], params))
+    await asyncio.sleep(0.05)
+    release.set()
+
+    for task in (leader, follower):
+        with pytest.raises(ImageTransformError):
+            await task
+
+
+def test_prune_cache_drops_oldest_renders(tmp_path):
+    for i in range(5):
+        path = tmp_path / "ab" / f"render{i}"
+        path.parent.mkdir(exist_ok=True)
+        path.write_bytes(b"x" * 100)
+        os.utime(path, (1000 + i, 1000 + i))
+
+    assert prune_cache(tmp_path, max_bytes=1000) == 0
+    assert prune_cache(tmp_path, max_bytes=300) == 3
+
+    assert sorted(p.name for p in tmp_path.glob("*/*")) == ["render3", "render4"]
@@ -0,0 +1,112 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select
+
+from app.models import Photo, PublicLink, PublicLinkStats
+from app.models.transformed_image import TransformedImage
+from app.repository.public_links_repository import PublicLinkRepository
+from app.service.link_hits import QR, LinkHitBuffer, flush_link_hits, link_hits, run_link_hits_flusher
+
+
+@pytest.fixture
+async def links(db_session):
+    db_session.add(Photo(
+        id=1, user_id=1, photo_unique_url="hits-1", cloudinary_public_id="p1",
+        created_at=datetime(2024, 1, 1), updated_at=datetime(2024, 1, 1),
+    ))
+    await db_session.flush()
+    ti = TransformedImage(photo_id=1, params_hash="0" * 64, image_url="/media/p1")
+    db_session.add(ti)
+    await db_session.flush()
+    db_session.add_all([
+        PublicLink(uuid=f"u{i}", transformed_image_id=ti.id, qr_code_url=f"/media/qr/{i}") for i in range(3)
+    ])
+    await db_session.commit()
+
+
+async def _stats(db_session) -> dict[str, tuple[int, int]]:
+    res = await db_session.execute(
+        select(PublicLink.uuid, PublicLinkStats.views, PublicLinkStats.qr_views)
+        .join(PublicLinkStats, PublicLinkStats.public_link_id == PublicLink.id)
+    )
+    return {uuid: (views, qr_views) for uuid, views, qr_views in res.all()}
+
+
+def test_buffer_counts_and_caps_distinct_links():
+    buffer = LinkHitBuffer(max_links=2)
+    for _ in range(3):
+        buffer.record("a")
+    buffer.record("a", QR)
+    buffer.record("b")
+    buffer.record("c")
+
+    assert buffer.drain() == {"a": (3, 1), "b": (1, 0)}
+    assert buffer.dropped == 1
+    assert len(buffer) == 0
+
+
+@pytest.mark.asyncio
+async def test_flush_upserts_in_batches_and_accumulates(db_session, links, sql_statements):
+    buffer = LinkHitBuffer()
+    for _ in range(5):
+        buffer.record("u0")
+    buffer.record("u1", QR)
+    buffer.record("gone")
+
+    sql_statements.clear()
+    assert await flush_link_hits(db_session, batch_size=500, buffer=buffer) == 2
+    # SELECT id-ів + один INSERT ... ON CONFLICT на всю пачку
+    assert len(sql_statements) == 2
+
+    buffer.record("u0")
+    buffer.record("u2")
+    assert await flush_link_hits(db_session, batch_size=1, buffer=buffer) == 2
+
+    assert await _stats(db_session) == {"u0": (6, 0), "u1": (0, 1), "u2": (1, 0)}
+    assert len(buffer) == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_returns_hits_to_buffer(db_session, links, monkeypatch):
+    buffer = LinkHitBuffer()
+    buffer.record("u0")
+    buffer.record("u0", QR)
+
+    async def _boom(self, hits, at):
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr(PublicLinkRepository, "add_hits", _boom)
+    with pytest.raises(RuntimeError):
+        await flush_link_hits(db_session, batch_size=10, buffer=buffer)
+
+    assert buffer.drain() == {"u0": (1, 1)}
+
+
+@pytest.mark.asyncio
+async def test_shutdown_during_flush_keeps_hits_for_final_flush(db_session, links, async_session_maker, monkeypatch):
+    link_hits.record("u0")
+    link_hits.record("u1", QR)
+
+    started = asyncio.Event()
+    original = PublicLinkRepository.add_hits
+    calls = []
+
+    async def _stuck_first(self, hits, at):
+        calls.append(hits)
+        if len(calls) == 1:
+            started.set()
+            await asyncio.sleep(3600)
+        return await original(self, hits, at)
+
+    monkeypatch.setattr(PublicLinkRepository, "add_hits", _stuck_first)
+    task = asyncio.create_task(run_link_hits_flusher(async_session_maker, interval_seconds=0, batch_size=10))
+    await started.wait()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    # скасований flush повернув hits у буфер, фінальний flush їх записав
+    assert await _stats(db_session) == {"u0": (1, 0), "u1": (0, 1)}
+    assert len(link_hits) == 0
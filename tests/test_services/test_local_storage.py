@@ -0,0 +1,63 @@
+import hashlib
+import io
+
+import pytest
+
+from app.core.exceptions import NotFoundError, StorageError
+from app.core.settings import Settings
+from app.service.storage import LocalStorageService, map_file, sniff_file
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\0" * 200
+
+
+@pytest.fixture
+def local_storage(tmp_path):
+    settings = Settings(STORAGE_BACKEND="local", LOCAL_STORAGE_DIR=str(tmp_path), UPLOAD_CHUNK_SIZE=16)
+    return LocalStorageService(settings)
+
+
+@pytest.mark.asyncio
+async def test_upload_writes_in_chunks_and_reads_back_mapped(local_storage):
+    upload = await local_storage.upload_photo(io.BytesIO(PNG), content_md5=hashlib.md5(PNG).hexdigest())
+
+    assert upload["public_id"].startswith("photoshare/")
+    assert upload["url"] == f"/media/{upload['public_id']}"
+    path = local_storage.path_for(upload["public_id"])
+    with map_file(path) as mapped:
+        assert mapped[:] == PNG
+    assert local_storage.read_bytes(upload["public_id"]) == PNG
+    assert sniff_file(path) == "image/png"
+
+    await local_storage.delete_photo(upload["public_id"])
+    assert not local_storage.path_for(upload["public_id"]).exists()
+    with pytest.raises(NotFoundError):
+        local_storage.read_bytes(upload["public_id"])
+
+
+@pytest.mark.asyncio
+async def test_upload_checksum_mismatch_leaves_no_file(local_storage, tmp_path):
+    with pytest.raises(StorageError):
+        await local_storage.upload_photo(PNG, content_md5="0" * 32)
+
+    assert [p for p in tmp_path.rglob("*") if p.is_file()] == []
+
+
+def test_public_id_cannot_escape_storage_root(local_storage):
+    with pytest.raises(NotFoundError):
+        local_storage.path_for("../etc/passwd")
+
+
+def test_transformed_url_is_stable(local_storage):
+    url = local_storage.build_transformed_url("photoshare/abc", {"width": 100, "crop": "fill"})
+    assert url.startswith("/media/photoshare/abc?crop=fill&width=100&sig=")
+    assert url == local_storage.build_transformed_url("photoshare/abc", {"crop": "fill", "width": 100})
+
+
+def test_transform_signature_covers_public_id_and_params(local_storage):
+    url = local_storage.build_transformed_url("photoshare/abc", {"width": 100})
+    sig = url.rsplit("sig=", 1)[1]
+
+    assert local_storage.verify_transform("photoshare/abc", {"width": "100"}, sig)
+    assert not local_storage.verify_transform("photoshare/abc", {"width": "1999"}, sig)
+    assert not local_storage.verify_transform("photoshare/other", {"width": "100"}, sig)
+    assert not local_storage.verify_transform("photoshare/abc", {"width": "100"}, None)
@@ -0,0 +1,59 @@
+import pytest
+
+from app.core.metrics import Histogram, MetricsRegistry, observe_storage_call
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    hist = registry.histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+
+    hist.observe(("/a",), 0.05)
+    hist.observe(("/a",), 0.5)
+    hist.observe(("/a",), 3.0)
+
+    lines = registry.render().splitlines()
+    assert "# TYPE latency_seconds histogram" in lines
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="/a",le="1.0"} 2' in lines
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 'latency_seconds_sum{route="/a"} 3.55' in lines
+    assert 'latency_seconds_count{route="/a"} 3' in lines
+
+
+def test_counter_gauge_and_label_escaping():
+    registry = MetricsRegistry()
+    counter = registry.counter("hits_total", "Hits.", ("cache",))
+    gauge = registry.gauge("in_flight", "In flight.")
+    registry.add_collector(lambda: gauge.set((), 7))
+
+    counter.inc(('say "hi"',))
+    counter.inc(('say "hi"',), 2)
+
+    text = registry.render()
+    assert 'hits_total{cache="say \\"hi\\""} 3' in text
+    assert "in_flight 7" in text
+
+
+class _Backend:
+    @observe_storage_call("upload")
+    async def upload_photo(self, fail: bool):
+        if fail:
+            raise RuntimeError("boom")
+        return {"public_id": "x"}
+
+
+@pytest.mark.asyncio
+async def test_storage_calls_are_timed_and_errors_counted():
+    from app.core.metrics import storage_call_duration, storage_call_errors
+
+    labels = ("_Backend", "upload")
+    before_calls = storage_call_duration.count(labels)
+    before_errors = storage_call_errors.value(labels)
+
+    await _Backend().upload_photo(False)
+    with pytest.raises(RuntimeError):
+        await _Backend().upload_photo(True)
+
+    assert storage_call_duration.count(labels) == before_calls + 2
+    assert storage_call_errors.value(labels) == before_errors + 1
+    assert isinstance(storage_call_duration, Histogram)
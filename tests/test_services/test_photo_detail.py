@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.exceptions import NotFoundError
+from app.models import Photo, PhotoTag, Tag, User
+from app.models.comment import Comment
+from app.repository.comment_repository import CommentRepository
+from app.repository.photos_repository import PhotoRepository
+from app.service.photo_detail_service import PhotoDetailService
+
+
+@pytest.fixture
+async def seeded(db_session):
+    base = datetime(2024, 1, 1)
+    db_session.add_all([
+        User(id=1, username="owner", email="owner@example.com", password_hash="x"),
+        User(id=2, username="fan", email="fan@example.com", password_hash="x"),
+        Photo(
+            id=1, user_id=1, photo_unique_url="detail-1", cloudinary_public_id="p",
+            description="sunset", rating_sum=9, rating_count=2, avg_rating=4.5,
+            created_at=base, updated_at=base,
+        ),
+        Tag(id=1, name="sea"),
+        Tag(id=2, name="beach"),
+    ])
+    await db_session.flush()
+    db_session.add_all([PhotoTag(photo_id=1, tag_id=1), PhotoTag(photo_id=1, tag_id=2)])
+    db_session.add_all([
+        Comment(photo_id=1, user_id=2, text=f"comment {i}", created_at=base + timedelta(minutes=i), updated_at=base)
+        for i in range(3)
+    ])
+    await db_session.commit()
+    db_session.expunge_all()
+
+
+@pytest.mark.asyncio
+async def test_detail_loads_everything_in_two_queries(db_session, seeded, sql_statements):
+    service = PhotoDetailService(db_session, PhotoRepository(db_session), CommentRepository(db_session))
+    sql_statements.clear()
+    detail = await service.load(1, comments_limit=2)
+
+    assert len(sql_statements) == 2
+    assert detail.photo.description == "sunset"
+    assert [t.name for t in detail.tags] == ["beach", "sea"]
+    assert detail.rating == {"photo_id": 1, "avg": 4.5, "count": 2}
+    assert [c.text for c in detail.comments] == ["comment 2", "comment 1"]
+    assert detail.comments[0].user.username == "fan"
+
+
+@pytest.mark.asyncio
+async def test_detail_missing_photo(db_session):
+    service = PhotoDetailService(db_session, PhotoRepository(db_session), CommentRepository(db_session))
+    with pytest.raises(NotFoundError):
+        await service.load(404)
+
+
+@pytest.mark.asyncio
+async def test_detail_page_renders(async_client, seeded):
+    response = await async_client.get("/ui/photos/1")
+
+    assert response.status_code == 200
+    assert "sunset" in response.text
+    assert "comment 2" in response.text
@@ -0,0 +1,85 @@
+import pytest
+
+from app.models.photo import Photo
+from app.repository.photos_repository import _tsquery_text
+
+
+async def _seed(db_session) -> None:
+    async with db_session.begin():
+        db_session.add_all([
+            Photo(id=1, user_id=1, photo_unique_url="fts-1", cloudinary_public_id="dummy",
+                  description="Sunset over the sea"),
+            Photo(id=2, user_id=1, photo_unique_url="fts-2", cloudinary_public_id="dummy",
+                  description="Sea sea sea, waves and sea"),
+            Photo(id=3, user_id=1, photo_unique_url="fts-3", cloudinary_public_id="dummy",
+                  description="Mountains at dawn"),
+        ])
+
+
+@pytest.mark.asyncio
+async def test_keyword_search_matches_words(db_session, photo_service_factory):
+    await _seed(db_session)
+    service = photo_service_factory()
+
+    items, total = await service.search_photos(q="sea")
+
+    assert {p.id for p in items} == {1, 2}
+    assert total == 2
+
+
+@pytest.mark.asyncio
+async def test_relevance_sort_ranks_best_match_first(db_session, photo_service_factory):
+    await _seed(db_session)
+    service = photo_service_factory()
+
+    items, _ = await service.search_photos(q="sea", sort="relevance")
+
+    assert [p.id for p in items] == [2, 1]
+
+
+@pytest.mark.asyncio
+async def test_index_follows_update_description(db_session, photo_service_factory):
+    await _seed(db_session)
+    service = photo_service_factory()
+
+    async with db_session.begin():
+        await service.photos.update_description(3, "Foggy sea at dawn")
+
+    items, _ = await service.search_photos(q="sea")
+    assert {p.id for p in items} == {1, 2, 3}
+
+    items, _ = await service.search_photos(q="mountains")
+    assert items == []
+
+
+@pytest.mark.asyncio
+async def test_search_query_syntax_is_not_interpreted(db_session, photo_service_factory):
+    await _seed(db_session)
+    service = photo_service_factory()
+
+    items, total = await service.search_photos(q='sea" OR "dawn')
+
+    assert items == []
+    assert total == 0
+
+
+@pytest.mark.asyncio
+async def test_search_matches_word_prefixes(db_session, photo_service_factory):
+    await _seed(db_session)
+    service = photo_service_factory()
+
+    items, total = await service.search_photos(q="sun")
+    assert [p.id for p in items] == [1]
+    assert total == 1
+
+    items, _ = await service.search_photos(q="wav se")
+    assert [p.id for p in items] == [2]
+
+    # префікс слова, а не будь-який підрядок
+    items, _ = await service.search_photos(q="set")
+    assert items == []
+
+
+def test_postgres_tsquery_is_prefix_and_escaped():
+    assert _tsquery_text("sun  it's") == "'sun':* & 'it''s':*"
+    assert _tsquery_text("a\\b") == "'a\\\\b':*"
@@ -0,0 +1,107 @@
+import pytest
+from datetime import datetime, timedelta
+
+from app.core.exceptions import InvalidCursorError
+from app.core.pagination import next_photo_cursor
+from app.models.photo import Photo
+from app.repository.photos_repository import PhotoRepository
+from app.repository.ratings_repository import RatingRepository
+from app.service.rating_service import RatingService
+
+
+async def _seed_photos(db_session, count: int) -> None:
+    base = datetime(2024, 1, 1)
+    async with db_session.begin():
+        for i in range(count):
+            db_session.add(Photo(
+                id=i + 1,
+                user_id=1,
+                photo_unique_url=f"page-{i}",
+                cloudinary_public_id="dummy",
+                description=f"photo {i}",
+                # пари з однаковим created_at — перевіряємо tie-break по id
+                created_at=base + timedelta(minutes=i // 2),
+                updated_at=base,
+            ))
+
+
+@pytest.mark.asyncio
+async def test_search_cursor_walks_all_pages_without_duplicates(db_session, photo_service_factory):
+    await _seed_photos(db_session, 7)
+    service = photo_service_factory()
+
+    items, total = await service.search_photos(sort="newest", limit=3)
+    seen: list[int] = [p.id for p in items]
+    cursor = next_photo_cursor(items, sort="newest", limit=3)
+    while cursor is not None:
+        items, page_total = await service.search_photos(sort="newest", limit=3, cursor=cursor)
+        # total рахується тільки на першій сторінці
+        assert page_total is None
+        seen.extend(p.id for p in items)
+        cursor = next_photo_cursor(items, sort="newest", limit=3)
+
+    assert total == 7
+    assert seen == [7, 6, 5, 4, 3, 2, 1]
+
+
+@pytest.mark.asyncio
+async def test_search_cursor_top_sort_follows_avg_rating(db_session, photo_service_factory):
+    await _seed_photos(db_session, 4)
+    ratings = RatingService(db_session, RatingRepository(db_session), PhotoRepository(db_session))
+    await ratings.add_rating(photo_id=1, user_id=10, value=5)
+    await ratings.add_rating(photo_id=2, user_id=10, value=3)
+    await ratings.add_rating(photo_id=3, user_id=10, value=5)
+    service = photo_service_factory()
+
+    first, _ = await service.search_photos(sort="top", limit=2)
+    cursor = next_photo_cursor(first, sort="top", limit=2)
+    second, _ = await service.search_photos(sort="top", limit=2, cursor=cursor)
+
+    assert [p.id for p in first] == [3, 1]
+    assert [p.id for p in second] == [2, 4]
+
+
+@pytest.mark.asyncio
+async def test_list_by_user_cursor(db_session, photo_service_factory):
+    await _seed_photos(db_session, 5)
+    service = photo_service_factory()
+
+    first = await service.list_by_user(1, limit=2)
+    cursor = next_photo_cursor(first, sort="newest", limit=2)
+    second = await service.list_by_user(1, limit=2, cursor=cursor)
+
+    assert [p.id for p in first] == [5, 4]
+    assert [p.id for p in second] == [3, 2]
+
+
+@pytest.mark.asyncio
+async def test_cursor_for_other_sort_is_rejected(db_session, photo_service_factory):
+    await _seed_photos(db_session, 3)
+    service = photo_service_factory()
+
+    items, _ = await service.search_photos(sort="newest", limit=2)
+    cursor = next_photo_cursor(items, sort="newest", limit=2)
+
+    with pytest.raises(InvalidCursorError):
+        await service.search_photos(sort="oldest", limit=2, cursor=cursor)
+
+    with pytest.raises(InvalidCursorError):
+        await service.search_photos(sort="newest", limit=2, cursor="not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_search_total_comes_with_page_and_past_the_end(db_session, photo_service_factory):
+    await _seed_photos(db_session, 5)
+    service = photo_service_factory()
+
+    items, total = await service.search_photos(limit=2, offset=2)
+    assert [p.id for p in items] == [3, 2]
+    assert total == 5
+
+    items, total = await service.search_photos(limit=2, offset=10)
+    assert items == []
+    assert total == 5
+
+    items, total = await service.search_photos(date_from=datetime(2024, 1, 1, 0, 2), limit=10)
+    assert {p.id for p in items} == {5}
+    assert total == 1
@@ -0,0 +1,111 @@
+"""
+Query-plan regression: hot repository queries must not fall back to full table scans.
+SQLite EXPLAIN QUERY PLAN: "SCAN photos" = full scan, "SCAN/SEARCH photos USING ... INDEX" = index.
+"""
+import re
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models import Photo, PhotoTag, Tag, User
+from app.models.comment import Comment
+from app.models.rating import Rating
+from app.models.transformed_image import TransformedImage
+from app.repository.comment_repository import CommentRepository
+from app.repository.photos_repository import PhotoRepository
+from app.repository.public_links_repository import PublicLinkRepository
+from app.repository.ratings_repository import RatingRepository
+from app.repository.tags_repository import TagRepository
+from app.repository.transformed_images_repository import TransformedImageRepository
+
+
+_FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+# unique constraints (uix_rating_photo_user, PK photo_tags) SQLite показує як sqlite_autoindex_*,
+# тому для них перевіряємо лише "SEARCH <table> USING"
+
+
+@pytest.fixture
+async def seeded(db_session):
+    base = datetime(2024, 1, 1)
+    db_session.add_all([
+        User(id=i, username=f"user{i}", email=f"user{i}@example.com", password_hash="x")
+        for i in range(1, 6)
+    ])
+    db_session.add_all([Tag(id=i, name=f"tag{i}") for i in range(1, 6)])
+    db_session.add_all([
+        Photo(
+            id=i, user_id=1 + i % 5, photo_unique_url=f"plan-{i}", cloudinary_public_id=f"p{i}",
+            description=f"photo {i}", created_at=base + timedelta(minutes=i), updated_at=base,
+        )
+        for i in range(1, 201)
+    ])
+    await db_session.flush()
+    db_session.add_all([PhotoTag(photo_id=i, tag_id=1 + i % 5) for i in range(1, 201)])
+    db_session.add_all([
+        Comment(photo_id=1 + i % 20, user_id=1 + i % 5, text=f"c{i}", created_at=base, updated_at=base)
+        for i in range(200)
+    ])
+    db_session.add_all([Rating(photo_id=1 + i % 40, user_id=1 + i // 40, value=1 + i % 5) for i in range(200)])
+    db_session.add_all([
+        TransformedImage(photo_id=1 + i % 20, params_hash=f"{i:064d}", image_url=f"/media/p{i}")
+        for i in range(100)
+    ])
+    await db_session.commit()
+
+
+async def _plans(db_session, sql_statements, call) -> list[list[str]]:
+    """
+    Runs call(), then EXPLAIN QUERY PLAN for every SELECT it executed.
+    """
+    sql_statements.clear()
+    await call()
+    statements = list(sql_statements)
+
+    conn = await db_session.connection()
+    plans = []
+    for statement, parameters in statements:
+        if not statement.lstrip().upper().startswith("SELECT"):
+            continue
+        res = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", tuple(parameters))
+        plans.append([row[3] for row in res.all()])
+    assert plans, "no SELECT executed"
+    return plans
+
+
+def _full_scans(plan: list[str]) -> list[str]:
+    return [line for line in plan if _FULL_SCAN.match(line)]
+
+
+@pytest.mark.parametrize(
+    ("name", "call", "index"),
+    [
+        ("list_by_user", lambda s: PhotoRepository(s).list_by_user(2, limit=10), "ix_photos_user_id_created_at"),
+        ("count_by_user", lambda s: PhotoRepository(s).count_by_user(2), "ix_photos_user_id_created_at"),
+        ("search newest", lambda s: PhotoRepository(s).search(sort="newest", limit=10), "ix_photos_created_at_id"),
+        ("search oldest", lambda s: PhotoRepository(s).search(sort="oldest", limit=10), "ix_photos_created_at_id"),
+        ("search top", lambda s: PhotoRepository(s).search(sort="top", limit=10), "ix_photos_avg_rating_created_at"),
+        ("search by tag", lambda s: PhotoRepository(s).search(tag="tag3", limit=10), "ix_photo_tags_tag_id_photo_id"),
+        ("comments for photo", lambda s: CommentRepository(s).list_for_photo(3), "ix_comments_photo_id_created_at"),
+        ("comments for user", lambda s: CommentRepository(s).list_for_user(3), "ix_comments_user_id_created_at"),
+        ("rating stats", lambda s: RatingRepository(s).get_rating_stats(3), "SEARCH ratings USING"),
+        ("tags for photos", lambda s: TagRepository(s).list_tag_names_for_photos([1, 2, 3]), "SEARCH photo_tags USING"),
+        ("tag cloud", lambda s: TagRepository(s).list_cloud(limit=10), "ix_tags_usage_count_name"),
+        (
+            "transformations for photo",
+            lambda s: TransformedImageRepository(s).list_for_photo(3),
+            "ix_transformed_images_photo_id_created_at",
+        ),
+        (
+            "share stats for photo",
+            lambda s: PublicLinkRepository(s).list_stats_for_photo(3),
+            "ix_public_links_transformed_image_id",
+        ),
+    ],
+)
+@pytest.mark.asyncio
+async def test_repository_query_uses_index(db_session, seeded, sql_statements, name, call, index):
+    plans = await _plans(db_session, sql_statements, lambda: call(db_session))
+
+    for plan in plans:
+        assert not _full_scans(plan), f"{name}: {plan}"
+    assert any(index in line for plan in plans for line in plan), f"{name}: {plans}"
@@ -0,0 +1,66 @@
+import logging
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.database.query_stats import install_query_hooks, track_queries
+
+
+@pytest.fixture
+async def slow_engine():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    # поріг 0.000001ms — кожен запит "повільний"
+    install_query_hooks(engine.sync_engine, slow_query_ms=0.000001)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_counts_statements_inside_tracked_scope_only(slow_engine):
+    async with slow_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+        with track_queries() as stats:
+            await conn.execute(text("SELECT 1"))
+            await conn.execute(text("SELECT 2"))
+
+    assert stats.count == 2
+    assert stats.db_ms > 0
+    assert stats.server_timing().endswith('desc="2 queries"')
+
+
+@pytest.mark.asyncio
+async def test_slow_query_is_logged_with_parameters(slow_engine, caplog):
+    caplog.set_level(logging.WARNING, logger="photoshare.db")
+
+    async with slow_engine.connect() as conn:
+        with track_queries() as stats:
+            await conn.execute(text("SELECT :value"), {"value": 42})
+
+    assert stats.slow == 1
+    record = caplog.records[-1]
+    assert record.statement == "SELECT ?"
+    assert record.parameters == (42,)
+
+
+@pytest.mark.asyncio
+async def test_failed_statement_does_not_break_timing(slow_engine):
+    async with slow_engine.connect() as conn:
+        with pytest.raises(Exception):
+            await conn.execute(text("SELECT * FROM missing_table"))
+        with track_queries() as stats:
+            await conn.execute(text("SELECT 1"))
+        assert conn.info.get("query_started") == []
+
+    assert stats.count == 1
+
+
+@pytest.mark.asyncio
+async def test_install_is_idempotent(slow_engine):
+    install_query_hooks(slow_engine.sync_engine)
+
+    async with slow_engine.connect() as conn:
+        with track_queries() as stats:
+            await conn.execute(text("SELECT 1"))
+
+    assert stats.count == 1
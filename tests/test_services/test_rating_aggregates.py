@@ -0,0 +1,57 @@
+import pytest
+from types import SimpleNamespace
+
+from app.models.photo import Photo
+from app.repository.photos_repository import PhotoRepository
+from app.repository.ratings_repository import RatingRepository
+from app.service.rating_service import RatingService
+
+
+@pytest.fixture
+def rating_service(db_session):
+    return RatingService(
+        session=db_session,
+        ratings_repo=RatingRepository(db_session),
+        photos_repo=PhotoRepository(db_session),
+    )
+
+
+async def _photo_aggregates(db_session, photo_id: int) -> tuple[int, int, float]:
+    photo = await db_session.get(Photo, photo_id)
+    await db_session.refresh(photo)
+    return photo.rating_sum, photo.rating_count, photo.avg_rating
+
+
+@pytest.mark.asyncio
+async def test_rating_writes_keep_photo_aggregates_in_sync(db_session, rating_service):
+    async with db_session.begin():
+        db_session.add(Photo(id=1, user_id=1, photo_unique_url="agg", cloudinary_public_id="dummy"))
+
+    assert await _photo_aggregates(db_session, 1) == (0, 0, 0.0)
+
+    await rating_service.add_rating(photo_id=1, user_id=2, value=5)
+    second = await rating_service.add_rating(photo_id=1, user_id=3, value=2)
+    assert await _photo_aggregates(db_session, 1) == (7, 2, 3.5)
+
+    # set_rating перезаписує існуючу оцінку: count не змінюється
+    await rating_service.set_rating(photo_id=1, value=4, current_user=SimpleNamespace(id=3))
+    assert await _photo_aggregates(db_session, 1) == (9, 2, 4.5)
+
+    await rating_service.delete_rating(rating_id=second.id, actor_role="admin")
+    assert await _photo_aggregates(db_session, 1) == (5, 1, 5.0)
+
+
+@pytest.mark.asyncio
+async def test_min_rating_filter_uses_aggregates(db_session, rating_service, photo_service_factory):
+    async with db_session.begin():
+        db_session.add_all([
+            Photo(id=1, user_id=1, photo_unique_url="a", cloudinary_public_id="dummy"),
+            Photo(id=2, user_id=1, photo_unique_url="b", cloudinary_public_id="dummy"),
+        ])
+    await rating_service.add_rating(photo_id=1, user_id=2, value=4)
+    await rating_service.add_rating(photo_id=2, user_id=2, value=2)
+
+    items, total = await photo_service_factory().search_photos(min_rating=3)
+
+    assert [p.id for p in items] == [1]
+    assert total == 1
@@ -0,0 +1,101 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import func, select
+
+from app.core.exceptions import NotFoundError
+from app.core.settings import Settings
+from app.models import Photo, PublicLink
+from app.models.transformed_image import TransformedImage
+from app.repository.photos_repository import PhotoRepository
+from app.repository.public_links_repository import PublicLinkRepository
+from app.repository.transformed_images_repository import TransformedImageRepository
+from app.service import share_service as share_module
+from app.service.cloudinary_service import FakeCloudinaryService
+from app.service.qr_service import QrService
+from app.service.share_service import ShareService
+
+
+@pytest.fixture(autouse=True)
+def _clear_transform_cache():
+    share_module._transformed_cache.clear()
+    yield
+    share_module._transformed_cache.clear()
+
+
+@pytest.fixture
+async def share(db_session):
+    db_session.add(Photo(
+        id=1,
+        user_id=1,
+        photo_unique_url="share-1",
+        cloudinary_public_id="photoshare/abc",
+        description="photo",
+        created_at=datetime(2024, 1, 1),
+        updated_at=datetime(2024, 1, 1),
+    ))
+    await db_session.commit()
+    return ShareService(
+        session=db_session,
+        photos_repo=PhotoRepository(db_session),
+        transformed_repo=TransformedImageRepository(db_session),
+        cloudinary=FakeCloudinaryService(Settings()),
+        public_links_repo=PublicLinkRepository(db_session),
+        qr_maker=QrService(),
+    )
+
+
+async def _count(db_session, model) -> int:
+    return (await db_session.execute(select(func.count()).select_from(model))).scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_repeat_shares_reuse_one_transformed_image(db_session, share):
+    first = await share.create_share_link(1, {"width": 200, "crop": "fill"}, current_user=None)
+    second = await share.create_share_link(1, {"crop": "fill", "width": 200}, current_user=None)
+
+    assert first != second
+    assert await _count(db_session, TransformedImage) == 1
+    links = (await db_session.execute(select(PublicLink))).scalars().all()
+    assert len({link.transformed_image_id for link in links}) == 1
+
+
+@pytest.mark.asyncio
+async def test_preview_is_served_from_lru_after_first_lookup(db_session, share):
+    photo = await share.photos.get_by_id(1)
+
+    first = await share.get_transformed(photo, {"effect": "sepia"})
+    hits = share_module._transformed_cache.hits
+    second = await share.get_transformed(photo, {"effect": "sepia"})
+
+    assert second == first
+    assert share_module._transformed_cache.hits == hits + 1
+
+    # LRU порожній (інший процес/рестарт) -> рядок знаходиться в БД, новий не створюється
+    share_module._transformed_cache.clear()
+    third = await share.get_transformed(photo, {"effect": "sepia"})
+    assert third == first
+    assert await _count(db_session, TransformedImage) == 1
+
+
+@pytest.mark.asyncio
+async def test_photo_delete_evicts_its_cached_transforms(share):
+    photo = await share.photos.get_by_id(1)
+    await share.get_transformed(photo, {"effect": "sepia"})
+    share_module._transformed_cache.set((2, "other"), share_module.CachedTransform(9, "/x"))
+
+    share_module.invalidate_public_links(1)
+
+    assert [key for key, _ in share_module._transformed_cache.items()] == [(2, "other")]
+
+
+@pytest.mark.asyncio
+async def test_get_or_create_reports_vanished_row_as_not_found(db_session, monkeypatch):
+    repo = TransformedImageRepository(db_session)
+
+    async def _gone(photo_id, params_hash):
+        return None
+
+    monkeypatch.setattr(repo, "get_by_params", _gone)
+    with pytest.raises(NotFoundError):
+        await repo.get_or_create(photo_id=1, params_hash="0" * 64, image_url="/x")
@@ -0,0 +1,72 @@
+import pytest
+from sqlalchemy import select
+
+from app.models import Photo, Tag, User
+from app.repository.photos_repository import PhotoRepository
+from app.repository.tags_repository import TagRepository
+from app.service.tagging_service import TaggingService
+
+
+@pytest.fixture
+async def seeded(db_session):
+    db_session.add(User(id=1, username="owner", email="owner@example.com", password_hash="x"))
+    db_session.add_all([
+        Photo(id=i, user_id=1, photo_unique_url=f"cloud-{i}", cloudinary_public_id=f"p{i}")
+        for i in (1, 2)
+    ])
+    await db_session.commit()
+
+
+async def _usage(db_session) -> dict[str, int]:
+    res = await db_session.execute(select(Tag.name, Tag.usage_count))
+    return dict(res.all())
+
+
+@pytest.mark.asyncio
+async def test_usage_count_follows_tag_edits(db_session, seeded):
+    repo = TagRepository(db_session)
+
+    await repo.set_tags_for_photo(1, ["sea", "beach"])
+    await repo.set_tags_for_photo(2, ["Sea"])
+    assert await _usage(db_session) == {"sea": 2, "beach": 1}
+
+    # лише різниця: beach -1, sky +1, sea без змін
+    await repo.set_tags_for_photo(1, ["sea", "sky"])
+    assert await _usage(db_session) == {"sea": 2, "beach": 0, "sky": 1}
+
+    await repo.release_tags_of_photo(2)
+    assert await _usage(db_session) == {"sea": 1, "beach": 0, "sky": 1}
+
+
+@pytest.mark.asyncio
+async def test_list_cloud_reads_usage_count(db_session, seeded):
+    repo = TagRepository(db_session)
+    await repo.set_tags_for_photo(1, ["sea", "beach"])
+    await repo.set_tags_for_photo(2, ["sea"])
+    await repo.set_tags_for_photo(1, ["sea"])
+
+    assert await repo.list_cloud(limit=10) == [("sea", 2)]
+
+
+@pytest.mark.asyncio
+async def test_tag_cloud_is_cached_until_tags_change(db_session, seeded):
+    repo = TagRepository(db_session)
+    service = TaggingService(
+        session=db_session, tags_repo=repo, photos_repo=PhotoRepository(db_session), cloud_cache_ttl=60,
+    )
+    await repo.set_tags_for_photo(1, ["sea"])
+    await db_session.commit()
+
+    assert await service.get_tag_cloud(limit=10) == [{"name": "sea", "count": 1}]
+
+    # прямий запис у репозиторій кеш не скидає
+    await repo.set_tags_for_photo(2, ["sea"])
+    assert await service.get_tag_cloud(limit=10) == [{"name": "sea", "count": 1}]
+
+    # запис через сервіс — скидає
+    owner = await db_session.get(User, 1)
+    await service.set_photo_tags(photo_id=2, tag_names=["sea", "sky"], current_user=owner)
+    assert await service.get_tag_cloud(limit=10) == [
+        {"name": "sea", "count": 2},
+        {"name": "sky", "count": 1},
+    ]
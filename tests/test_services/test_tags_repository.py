@@ -0,0 +1,60 @@
+import pytest
+from sqlalchemy import select
+
+from app.models import Photo, PhotoTag, Tag, User
+from app.repository.tags_repository import TagRepository
+
+
+@pytest.fixture
+async def photos(db_session):
+    db_session.add(User(id=1, username="owner", email="owner@example.com", password_hash="x"))
+    db_session.add_all([
+        Photo(id=i, user_id=1, photo_unique_url=f"bulk-{i}", cloudinary_public_id=f"p{i}")
+        for i in range(1, 301)
+    ])
+    await db_session.commit()
+
+
+@pytest.mark.asyncio
+async def test_edit_touches_only_changed_links(db_session, photos, sql_statements):
+    repo = TagRepository(db_session)
+    await repo.set_tags_for_photo(1, ["a", "b", "c", "d", "e"])
+    sql_statements.clear()
+
+    attached = await repo.set_tags_for_photo(1, ["A", "b", "c", "d", "f"])
+
+    assert attached == ["a", "b", "c", "d", "f"]
+    # select tags, insert "f", delete "e" link, insert "f" link, update usage_count
+    assert len(sql_statements) == 5
+    res = await db_session.execute(select(Tag.name, Tag.usage_count).order_by(Tag.name))
+    assert res.all() == [("a", 1), ("b", 1), ("c", 1), ("d", 1), ("e", 0), ("f", 1)]
+
+
+@pytest.mark.asyncio
+async def test_unchanged_edit_writes_nothing(db_session, photos, sql_statements):
+    repo = TagRepository(db_session)
+    await repo.set_tags_for_photo(1, ["sea", "sky"])
+    sql_statements.clear()
+
+    await repo.set_tags_for_photo(1, ["sky", "sea"])
+
+    assert not any(s.lstrip().upper().startswith("UPDATE") for s in sql_statements.statements)
+    res = await db_session.execute(select(Tag.usage_count).order_by(Tag.name))
+    assert res.scalars().all() == [1, 1]
+
+
+@pytest.mark.asyncio
+async def test_bulk_tagging_is_set_based(db_session, photos, sql_statements):
+    repo = TagRepository(db_session)
+    sql_statements.clear()
+
+    result = await repo.set_tags_for_photos(
+        {i: ["sea", f"tag{i % 3}"] for i in range(1, 301)},
+    )
+
+    assert result[7] == ["sea", "tag1"]
+    assert len(sql_statements) <= 5
+    links = await db_session.execute(select(PhotoTag.photo_id).where(PhotoTag.photo_id <= 300))
+    assert len(links.all()) == 600
+    res = await db_session.execute(select(Tag.name, Tag.usage_count).order_by(Tag.name))
+    assert res.all() == [("sea", 300), ("tag0", 100), ("tag1", 100), ("tag2", 100)]
@@ -0,0 +1,27 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select
+
+from app.auth.sweeper import sweep_expired_tokens, sweeper_stats
+from app.models.token_blacklist import TokenBlacklist
+
+
+@pytest.mark.asyncio
+async def test_sweeper_deletes_only_expired_rows_in_batches(db_session):
+    now = datetime.now(timezone.utc)
+    for i in range(5):
+        db_session.add(TokenBlacklist(jti=f"old-{i}", user_id=1, expires_at=now - timedelta(hours=i + 1)))
+    for i in range(2):
+        db_session.add(TokenBlacklist(jti=f"live-{i}", user_id=1, expires_at=now + timedelta(hours=1)))
+    await db_session.commit()
+    runs_before = sweeper_stats.runs
+
+    deleted = await sweep_expired_tokens(db_session, batch_size=2)
+
+    assert deleted == 5
+    remaining = (await db_session.execute(select(TokenBlacklist.jti))).scalars().all()
+    assert sorted(remaining) == ["live-0", "live-1"]
+    assert sweeper_stats.runs == runs_before + 1
+    assert sweeper_stats.last_deleted == 5
+    assert sweeper_stats.table_rows == 2